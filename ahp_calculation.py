@@ -1,76 +1,120 @@
 # ahp_calculator.py
 import numpy as np
 import logging
+import ahp_metrics
+from ahp_core import WEIGHT_METHODS, derive_weights, eigenvector_weights, random_index, validate_matrices
+from ahp_repair import suggest_repair
+from applicant_store import ApplicantStore
+from ahp_model import (
+    DEFAULT_MAIN_WEIGHTS,
+    DEFAULT_MATRICES,
+    DEFAULT_RANDOM_INDEX,
+    ELIGIBILITY_THRESHOLD,
+    ScoringModel,
+    check_finite,
+    content_hash,
+    load_artifact,
+    save_artifact
+)
+
+# Sub-criterion name prefix for each main category's pairwise matrix
+SUB_CRITERIA_PREFIXES = {'U1': 'U1A', 'U2': 'U2B', 'U3': 'U3C', 'U4': 'U4D'}
 
 class AHPCalculator:
-    def __init__(self):
-        # Random Index values for n = 1 to 10
-        self.RI = {1: 0, 2: 0, 3: 0.58, 4: 0.90, 5: 1.12, 
-                   6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
-        
+    @ahp_metrics.instrument('construct')
+    def __init__(self, matrices=None, main_weights=None, artifact_path=None, method='approximate',
+                 audit_sink=None):
+        """Build a calculator from the U1-U4 pairwise matrices
+
+        `matrices` and `main_weights` override the default judgments, and
+        `method` selects how weights are derived from each matrix, one of
+        `ahp_core.WEIGHT_METHODS`: 'approximate' (column-normalise-and-average),
+        'geometric_mean', 'llsm' or 'eigenvector'. When
+        `artifact_path` is given, weights and consistency results are loaded
+        from that artifact and only recomputed (and the artifact rewritten)
+        when the matrices no longer match its content hash. Eligibility
+        decisions are recorded to `audit_sink` (an `ahp_audit.AuditSink`)
+        when one is given.
+
+        Raises ValueError for an unknown weight method, and for a matrix of
+        an unknown category, that is not square or that fails
+        `ahp_core.validate_matrices`.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.audit_sink = audit_sink
+        if method not in WEIGHT_METHODS:
+            raise ValueError(f"Unknown weight method '{method}', expected one of {WEIGHT_METHODS}")
+        self.method = method
+
+        # Random Index values for n = 1 to 50, the same table as ahp_core's
+        self.RI = dict(DEFAULT_RANDOM_INDEX)
+
         # Initialize pairwise comparison matrices
-        self.U1_matrix = np.array([
-            [1, 3, 5, 7, 2, 4, 6],  # Example priorities for A1 vs others
-            [1/3, 1, 3, 5, 2, 3, 4],
-            [1/5, 1/3, 1, 3, 1, 2, 3],
-            [1/7, 1/5, 1/3, 1, 1/2, 1, 2],
-            [1/2, 1/2, 1, 2, 1, 2, 3],
-            [1/4, 1/3, 1/2, 1, 1/2, 1, 2],
-            [1/6, 1/4, 1/3, 1/2, 1/3, 1/2, 1]
-        ])
-
-        self.U2_matrix = np.array([
-            [1, 4, 7, 5],  # Example priorities for B1 vs others
-            [1/4, 1, 3, 2],
-            [1/7, 1/3, 1, 1/2],
-            [1/5, 1/2, 2, 1]
-        ])
-
-        self.U3_matrix = np.array([
-            [1, 3, 5, 7, 4, 6, 8],  # Example priorities for C1 vs others
-            [1/3, 1, 3, 5, 3, 4, 6],
-            [1/5, 1/3, 1, 3, 2, 3, 4],
-            [1/7, 1/5, 1/3, 1, 1/2, 2, 3],
-            [1/4, 1/3, 1/2, 2, 1, 3, 4],
-            [1/6, 1/4, 1/3, 1/2, 1/3, 1, 2],
-            [1/8, 1/6, 1/4, 1/3, 1/4, 1/2, 1]
-        ])
-
-        self.U4_matrix = np.array([
-            [1, 2, 4],  # Example priorities for D1 vs others
-            [1/2, 1, 3],
-            [1/4, 1/3, 1]
-        ])
+        for category, matrix in DEFAULT_MATRICES.items():
+            setattr(self, f'{category}_matrix', np.array(matrix, dtype=float))
 
-        
+        for category, matrix in (matrices or {}).items():
+            setattr(self, f'{category}_matrix', self._validated_matrix(category, matrix))
         
         # Main criteria weights
-        self.main_weights = {
-            'U1': 0.0954,
-            'U2': 0.1601,
-            'U3': 0.2772,
-            'U4': 0.4673
-        }
+        self.main_weights = dict(main_weights or DEFAULT_MAIN_WEIGHTS)
 
-        # Validate consistency of all matrices
-        self.consistency_results = self._check_all_matrices()
+        self.content_hash = content_hash(self.matrices, self.main_weights, self.RI, self.method)
+        self.model_version = self.content_hash[:12]
 
-        # Calculate weights only if matrices are consistent
-        self.weights = self._calculate_all_weights()
+        artifact = load_artifact(artifact_path, self.content_hash) if artifact_path else None
+        if artifact is not None:
+            self.consistency_results = artifact['consistency_results']
+            self.weights = artifact['weights']
+            self.model = artifact['model']
+            self.logger.debug("Loaded AHP model %s from %s", self.model_version, artifact_path)
+        else:
+            # Validate consistency of all matrices
+            self.consistency_results = self._check_all_matrices()
 
-        # Print weights keys during initialization for debugging
-        print("Weights keys:", list(self.weights.keys()) if self.weights is not None else "Weights is None")
+            # Calculate weights only if matrices are consistent
+            self.weights = self._calculate_all_weights()
 
-         # Configure logging
-        logging.basicConfig(level=logging.DEBUG)
-        self.logger = logging.getLogger(__name__)
+            # Compile the weights into a flat global weight vector for scoring
+            self.model = (ScoringModel.from_weights(self.weights, self.main_weights)
+                          if self.weights is not None else None)
+
+            if artifact_path:
+                try:
+                    save_artifact(artifact_path, self.matrices, self.main_weights, self.RI,
+                                  self.weights, self.consistency_results, self.method)
+                    self.logger.debug("Saved AHP model %s to %s", self.model_version, artifact_path)
+                except OSError as e:
+                    self.logger.warning("Could not save AHP model to %s: %s", artifact_path, e)
+
+        if self.weights is None:
+            for category, result in self.consistency_results.items():
+                if not result['is_consistent']:
+                    ahp_metrics.INCONSISTENT_MATRICES.inc(category)
 
-        # Validate and log consistency of matrices
-        self.consistency_results = self._check_all_matrices()
         self.logger.debug("Consistency Results: %s", self.consistency_results)
-        print("Consistency Results:", self.consistency_results)
-        print("Are all matrices consistent?", 
-          all(result['is_consistent'] for result in self.consistency_results.values()))
+
+    @staticmethod
+    def _validated_matrix(category, matrix):
+        """Check a replacement matrix for one of the SUB_CRITERIA_PREFIXES categories"""
+        if category not in SUB_CRITERIA_PREFIXES:
+            raise ValueError(f"Unknown category '{category}', expected one of {list(SUB_CRITERIA_PREFIXES)}")
+        matrix = np.array(matrix, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] or not len(matrix):
+            raise ValueError(f"Matrix for {category} must be square, got shape {matrix.shape}")
+        problems = [check for check, mask in validate_matrices(matrix).items() if mask.any()]
+        if problems:
+            raise ValueError(f"Matrix for {category} has invalid judgments: {', '.join(problems)}")
+        return matrix
+
+    @property
+    def matrices(self):
+        """Pairwise comparison matrix for each main category"""
+        return {category: getattr(self, f'{category}_matrix') for category in SUB_CRITERIA_PREFIXES}
+
+    def random_index(self, n):
+        """Random Index from `ahp_core.RANDOM_INDEX`, whose last value covers larger sizes"""
+        return self.RI[n] if n in self.RI else random_index(n)
 
     def calculate_consistency(self, matrix, weights):
         """Calculate Consistency Ratio (CR) for a given matrix"""
@@ -86,7 +130,7 @@ class AHPCalculator:
         CI = (lambda_max - n) / (n - 1)
         
         # Get Random Index (RI)
-        RI = self.RI.get(n, 1.49)  # Use 1.49 for n > 10
+        RI = self.random_index(n)
         
         # Calculate Consistency Ratio (CR)
         CR = CI / RI if RI != 0 else 0
@@ -99,26 +143,13 @@ class AHPCalculator:
             'is_consistent': CR < 0.1
         }
 
+    @ahp_metrics.instrument('consistency_check')
     def _check_all_matrices(self):
         """Check consistency for all matrices"""
         results = {}
-        
-        # Check U1 matrix
-        u1_weights = self.normalize_matrix(self.U1_matrix)
-        results['U1'] = self.calculate_consistency(self.U1_matrix, u1_weights)
-        
-        # Check U2 matrix
-        u2_weights = self.normalize_matrix(self.U2_matrix)
-        results['U2'] = self.calculate_consistency(self.U2_matrix, u2_weights)
-        
-        # Check U3 matrix
-        u3_weights = self.normalize_matrix(self.U3_matrix)
-        results['U3'] = self.calculate_consistency(self.U3_matrix, u3_weights)
-        
-        # Check U4 matrix
-        u4_weights = self.normalize_matrix(self.U4_matrix)
-        results['U4'] = self.calculate_consistency(self.U4_matrix, u4_weights)
-        
+        for category, matrix in self.matrices.items():
+            weights = self.normalize_matrix(matrix)
+            results[category] = self.calculate_consistency(matrix, weights)
         return results
 
 
@@ -127,8 +158,13 @@ class AHPCalculator:
         col_sums = matrix.sum(axis=0)
         norm_matrix = matrix / col_sums
         weights = norm_matrix.mean(axis=1)
+        if self.method == 'eigenvector':
+            weights, _ = eigenvector_weights(matrix, initial_weights=weights)
+        elif self.method != 'approximate':
+            weights = derive_weights(matrix, self.method)
         return weights
 
+    @ahp_metrics.instrument('weight_derivation', failed=lambda weights: weights is None)
     def _calculate_all_weights(self):
         """Calculate normalized weights for all criteria if matrices are consistent"""
         weights = {}
@@ -140,29 +176,29 @@ class AHPCalculator:
         if not all_consistent:
             return None
             
-        # U1 weights
-        u1_weights = self.normalize_matrix(self.U1_matrix)
-        for i, w in enumerate(u1_weights):
-            weights[f'U1A{i+1}'] = w
-            
-        # U2 weights
-        u2_weights = self.normalize_matrix(self.U2_matrix)
-        for i, w in enumerate(u2_weights):
-            weights[f'U2B{i+1}'] = w
-            
-        # U3 weights
-        u3_weights = self.normalize_matrix(self.U3_matrix)
-        for i, w in enumerate(u3_weights):
-            weights[f'U3C{i+1}'] = w
-            
-        # U4 weights
-        u4_weights = self.normalize_matrix(self.U4_matrix)
-        u4_options = ['U4D1', 'U4D2', 'U4D3']
-        for i, w in enumerate(u4_weights):
-            weights[u4_options[i]] = w
+        for category, matrix in self.matrices.items():
+            prefix = SUB_CRITERIA_PREFIXES[category]
+            for i, w in enumerate(self.normalize_matrix(matrix)):
+                weights[f'{prefix}{i+1}'] = w
         
         return weights
 
+    def suggest_repairs(self, max_edits=None):
+        """Propose Saaty-scale judgment changes for every inconsistent matrix
+
+        Returns a dict mapping each inconsistent category to the result of
+        `ahp_repair.suggest_repair`, computed with this calculator's weight
+        method and Random Index values. Applying the edits to the matrices
+        and rebuilding the calculator gives consistent weights.
+        """
+        repairs = {}
+        for category, result in self.consistency_results.items():
+            if not result['is_consistent']:
+                matrix = self.matrices[category]
+                repairs[category] = suggest_repair(matrix, method=self.method,
+                                                   ri=self.random_index(len(matrix)), max_edits=max_edits)
+        return repairs
+
     def get_consistency_summary(self):
         """Get a summary of consistency check results"""
         summary = []
@@ -171,6 +207,7 @@ class AHPCalculator:
             summary.append(f"{category} Matrix: {status} (CR = {result['CR']:.3f})")
         return summary
 
+    @ahp_metrics.instrument('calculate_score', failed=lambda score: score is None)
     def calculate_score(self, scores):
         """Calculate final credit score if matrices are consistent"""
         try:
@@ -178,34 +215,29 @@ class AHPCalculator:
                 self.logger.error("Weights are None")
                 return None
             
-            # Validate input scores
-            missing_keys = set(scores.keys()) - set(self.weights.keys())
-            if missing_keys:
-                self.logger.error(f"Missing keys in weights: {missing_keys}")
+            try:
+                return self.model.score(scores)
+            except KeyError as e:
+                self.logger.error(f"Missing keys in weights: {e}")
+                return None
+            except ValueError as e:
+                self.logger.error(str(e))
                 return None
-
-            total_score = 0
-            max_possible_score = 0
-            
-            for criterion, score in scores.items():
-                try:
-                    main_category = criterion[:2]
-                    weight = self.weights[criterion] * self.main_weights[main_category]
-                    total_score += score * weight
-                    max_possible_score += 5 * weight
-                except KeyError as e:
-                    self.logger.error(f"Key error for criterion {criterion}: {e}")
-                    return None
-            
-            percentage_score = (total_score / max_possible_score) * 100
-            return percentage_score
         
         except Exception as e:
             self.logger.error(f"Unexpected error in calculate_score: {e}")
             return None
         
+    @ahp_metrics.instrument('check_eligibility', failed=lambda result: result['score'] is None)
     def check_eligibility(self, scores):
         """Check if farmer is eligible for loan"""
+        result = self._eligibility(scores)
+        if self.audit_sink is not None:
+            self.audit_sink.record(scores, result['score'], result['eligible'],
+                                   ELIGIBILITY_THRESHOLD, self.content_hash)
+        return result
+
+    def _eligibility(self, scores):
         if self.weights is None:
             consistency_summary = self.get_consistency_summary()
             return {
@@ -224,10 +256,89 @@ class AHPCalculator:
                 'consistency_summary': self.get_consistency_summary()
             }
         
-        is_eligible = final_score >= 70
+        is_eligible = final_score >= ELIGIBILITY_THRESHOLD
         return {
             'score': final_score,
             'eligible': is_eligible,
             'message': 'Eligible for loan' if is_eligible else 'Not eligible for loan',
             'consistency_summary': self.get_consistency_summary()
+        }
+
+    @ahp_metrics.instrument('score_batch', failed=lambda scores: scores is None)
+    def score_batch(self, scores, criteria=None):
+        """Calculate final credit scores for many applicants at once
+
+        `scores` is an (N x k) array with one row per applicant and one column
+        per criterion in `criteria`, a DataFrame whose columns are criterion
+        names, or an `ApplicantStore`. When `criteria` is omitted for an array, its columns must follow
+        the order of `self.weights`. Returns an array of percentage scores,
+        matching `calculate_score` row by row.
+        """
+        if self.weights is None:
+            self.logger.error("Weights are None")
+            return None
+
+        if criteria is None and hasattr(scores, 'columns'):
+            criteria = list(scores.columns)
+        try:
+            if isinstance(scores, ApplicantStore):
+                weights, scale = self.model.columns(scores.criteria)
+                final_scores = check_finite(scores.weighted_sum(weights) * scale)
+            else:
+                final_scores = self.model.score_batch(scores, criteria)
+            ahp_metrics.APPLICANTS_SCORED.inc(amount=len(final_scores))
+            return final_scores
+        except KeyError as e:
+            self.logger.error(f"Missing keys in weights: {e}")
+        except ValueError as e:
+            self.logger.error(str(e))
+        return None
+
+    @ahp_metrics.instrument('check_eligibility_batch', failed=lambda result: result['score'] is None)
+    def check_eligibility_batch(self, scores, criteria=None):
+        """Check loan eligibility for many applicants at once
+
+        As in `check_eligibility`, a failed calculation gives score None and
+        eligible False, together with the reason in `message`.
+        """
+        result = self._eligibility_batch(scores, criteria)
+        if self.audit_sink is not None and result['score'] is not None:
+            self.audit_sink.record_batch(*self._audit_inputs(scores, criteria), result['score'],
+                                         result['eligible'], ELIGIBILITY_THRESHOLD, self.content_hash)
+        return result
+
+    def _audit_inputs(self, scores, criteria):
+        """Column names and (N x k) values of batch inputs, for the audit log"""
+        if isinstance(scores, ApplicantStore):
+            if scores.questionnaire is not None:
+                return scores.questionnaire.question_ids, scores.codes()
+            return scores.criteria, scores.score_matrix()
+        if hasattr(scores, 'columns'):
+            return list(scores.columns), scores.to_numpy()
+        return criteria or self.model.criteria, scores
+
+    def _eligibility_batch(self, scores, criteria=None):
+        if self.weights is None:
+            return {
+                'score': None,
+                'eligible': False,
+                'message': 'Cannot calculate score: Inconsistent matrices',
+                'consistency_summary': self.get_consistency_summary()
+            }
+
+        final_scores = self.score_batch(scores, criteria)
+        if final_scores is None:
+            return {
+                'score': None,
+                'eligible': False,
+                'message': 'Score calculation failed',
+                'consistency_summary': self.get_consistency_summary()
+            }
+
+        is_eligible = final_scores >= ELIGIBILITY_THRESHOLD
+        return {
+            'score': final_scores,
+            'eligible': is_eligible,
+            'message': f'{int(is_eligible.sum())} of {len(is_eligible)} applicants eligible for loan',
+            'consistency_summary': self.get_consistency_summary()
         }
\ No newline at end of file
@@ -10,12 +10,66 @@ The module includes functions for:
 - Consistency checking
 - Score calculations
 - Weight computations
+
+Normalization, consistency checking and matrix validation also come in
+batched form, operating on a (B, n, n) stack of matrices at once through NumPy
+broadcasting.
+
+Weights are derived with one of `WEIGHT_METHODS`, each implemented once for a
+single (n, n) matrix and a (B, n, n) stack alike:
+- 'approximate': Saaty's column-normalise-and-average approximation
+- 'geometric_mean': normalized geometric mean of each row
+- 'llsm': logarithmic least squares; tolerates missing (NaN) judgments and
+  equals 'geometric_mean' on complete matrices
+- 'eigenvector': the principal eigenvector, found by power iteration
 """
 
 import numpy as np
-from typing import Any, Tuple, List, Dict, Union
+from typing import Any, Callable, Tuple, List, Dict, Union
+
+# Seed and sample count of the Monte Carlo part of RANDOM_INDEX
+RANDOM_INDEX_SEED = 0
+RANDOM_INDEX_SAMPLES = 20_000
+
+# Random Index values indexed by matrix size n: Saaty's published values for
+# n = 0 to 10, then estimates for n = 11 to 50 precomputed with
+# `python ahp_random_index.py --min-n 11 --max-n 50` (RANDOM_INDEX_SEED and
+# RANDOM_INDEX_SAMPLES)
+RANDOM_INDEX = np.array([
+    0.0, 0.0, 0.0, 0.58, 0.90, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49,
+    1.5131, 1.5358, 1.5552, 1.5697, 1.5853, 1.5957, 1.6056, 1.6136, 1.6220, 1.6290,
+    1.6351, 1.6402, 1.6461, 1.6512, 1.6557, 1.6592, 1.6633, 1.6656, 1.6697, 1.6725,
+    1.6752, 1.6779, 1.6804, 1.6819, 1.6848, 1.6864, 1.6886, 1.6901, 1.6920, 1.6930,
+    1.6947, 1.6968, 1.6980, 1.6992, 1.7005, 1.7019, 1.7028, 1.7037, 1.7050, 1.7058,
+])
+
+# Saaty's fundamental scale of pairwise judgments, 1/9 ... 1 ... 9
+SAATY_SCALE = np.concatenate([1 / np.arange(9, 1, -1), np.arange(1, 10)]).astype(float)
+
+def random_index(n: int) -> float:
+    """
+    Look up Saaty's Random Index for an n x n matrix.
+    
+    Args:
+        n (int): Matrix size
+        
+    Returns:
+        float: Random Index from `RANDOM_INDEX`. Beyond the table the last
+        value is returned: the index has all but levelled off by then, and
+        the slight underestimate only makes the Consistency Ratio stricter.
+        `ahp_random_index.simulated_random_index` gives exact estimates.
 
-def normalize_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError(f"No Random Index for n = {n}")
+    return float(RANDOM_INDEX[min(n, len(RANDOM_INDEX) - 1)])
+
+def normalize_matrix(
+    matrix: np.ndarray,
+    method: str = 'approximate'
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Normalize a pairwise comparison matrix and calculate criteria weights.
     
@@ -24,21 +78,173 @@ def normalize_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     2. Divides each element by its column sum (normalization)
     3. Calculates the average of each row to get criteria weights
     
+    With any other method the weights in step 3 are replaced by those of
+    `derive_weights`.
+    
     Args:
         matrix (np.ndarray): Square matrix of pairwise comparisons
+        method (str): One of `WEIGHT_METHODS`
         
     Returns:
         Tuple[np.ndarray, np.ndarray]: 
             - Normalized matrix
             - Array of weights for each criterion
     """
-    # Calculate column sums and normalize
-    column_sums = matrix.sum(axis=0)
-    normalized_matrix = matrix / column_sums
+    normalized_matrices, weights = normalize_matrix_batch(np.asarray(matrix)[np.newaxis], method)
+    return normalized_matrices[0], weights[0]
+
+def eigenvector_weights(
+    matrix: np.ndarray,
+    tol: float = 1e-10,
+    max_iter: int = 1000,
+    initial_weights: np.ndarray = None,
+    warm_start: bool = True
+) -> Tuple[np.ndarray, Union[int, np.ndarray]]:
+    """
+    Calculate principal eigenvector weights by power iteration.
+    
+    Repeatedly multiplies the weight vector by the matrix and rescales it to
+    sum to one, until no weight changes by more than `tol`. Works on a single
+    (n, n) matrix or a (B, n, n) stack; in a stack every matrix stops
+    iterating as soon as it has converged.
+    
+    Args:
+        matrix (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        tol (float): Convergence tolerance on the largest weight change
+        max_iter (int): Maximum number of iterations
+        initial_weights (np.ndarray, optional): (n,) or (B, n) starting weights
+        warm_start (bool): Without `initial_weights`, start from the
+            column-average approximation rather than uniform weights
+        
+    Returns:
+        Tuple[np.ndarray, Union[int, np.ndarray]]:
+            - (n,) or (B, n) weights summing to one
+            - Iterations used, per matrix for a stack
+    """
+    matrices = np.asarray(matrix, dtype=float)
+    single = matrices.ndim == 2
+    if single:
+        matrices = matrices[np.newaxis]
+    n_matrices, n = matrices.shape[:2]
+    
+    if initial_weights is not None:
+        weights = np.array(initial_weights, dtype=float).reshape(n_matrices, n)
+    elif warm_start:
+        weights = (matrices / matrices.sum(axis=1, keepdims=True)).mean(axis=2)
+    else:
+        weights = np.full((n_matrices, n), 1.0 / n)
+    weights /= weights.sum(axis=1, keepdims=True)
+    
+    iterations = np.zeros(n_matrices, dtype=int)
+    active = np.arange(n_matrices)
+    for _ in range(max_iter):
+        current = weights[active]
+        updated = np.einsum('bij,bj->bi', matrices[active], current)
+        updated /= updated.sum(axis=1, keepdims=True)
+        weights[active] = updated
+        iterations[active] += 1
+        active = active[np.abs(updated - current).max(axis=1) > tol]
+        if active.size == 0:
+            break
+    
+    if single:
+        return weights[0], int(iterations[0])
+    return weights, iterations
+
+def approximate_weights(matrix: np.ndarray) -> np.ndarray:
+    """
+    Average the rows of the column-normalized matrix.
+    
+    Args:
+        matrix (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        
+    Returns:
+        np.ndarray: (n,) or (B, n) weights summing to one
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    return (matrix / matrix.sum(axis=-2, keepdims=True)).mean(axis=-1)
+
+def geometric_mean_weights(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normalize the geometric mean of each row.
+    
+    Args:
+        matrix (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        
+    Returns:
+        np.ndarray: (n,) or (B, n) weights summing to one
+    """
+    log_means = np.log(np.asarray(matrix, dtype=float)).mean(axis=-1)
+    # Shifting by the largest log mean keeps exp() in range for extreme judgments
+    weights = np.exp(log_means - log_means.max(axis=-1, keepdims=True))
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+def llsm_weights(matrix: np.ndarray) -> np.ndarray:
+    """
+    Calculate logarithmic least squares weights.
+    
+    Minimises the sum of (log w_i - log w_j - log a_ij)^2 over the known
+    judgments a_ij; NaN or non-positive entries are treated as missing. The
+    normal equations L v = r, with L the Laplacian of the comparison graph,
+    are solved for the whole stack at once. On a complete matrix the result
+    equals `geometric_mean_weights`. Every criterion must be connected to
+    the others through known judgments.
+    
+    Args:
+        matrix (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        
+    Returns:
+        np.ndarray: (n,) or (B, n) weights summing to one
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        known = (matrix > 0) & ~np.eye(n, dtype=bool)
+        log_judgments = np.where(known, np.log(np.where(known, matrix, 1.0)), 0.0)
+    known = known.astype(float)
+    
+    # Gradient of the residual sum: rows hold a_ij terms, columns a_ji terms
+    links = known + np.swapaxes(known, -1, -2)
+    laplacian = -links
+    diagonal = np.arange(n)
+    laplacian[..., diagonal, diagonal] += links.sum(axis=-1)
+    rhs = log_judgments.sum(axis=-1) - log_judgments.sum(axis=-2)
+    
+    # Adding the all-ones matrix pins sum(v) = 0 and makes the system regular
+    log_weights = np.linalg.solve(laplacian + 1.0, rhs[..., np.newaxis])[..., 0]
+    weights = np.exp(log_weights - log_weights.max(axis=-1, keepdims=True))
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+# Weight derivation methods by name, each mapping an (n, n) matrix or a
+# (B, n, n) stack to (n,) or (B, n) weights
+WEIGHT_FUNCTIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'approximate': approximate_weights,
+    'geometric_mean': geometric_mean_weights,
+    'llsm': llsm_weights,
+    'eigenvector': lambda matrix: eigenvector_weights(matrix)[0],
+}
+
+# Weight derivation methods accepted by normalize_matrix and normalize_matrix_batch
+WEIGHT_METHODS = tuple(WEIGHT_FUNCTIONS)
+
+def derive_weights(matrix: np.ndarray, method: str = 'approximate') -> np.ndarray:
+    """
+    Derive criteria weights with one of `WEIGHT_METHODS`.
     
-    # Calculate weights as row averages
-    weights = normalized_matrix.mean(axis=1)
-    return normalized_matrix, weights
+    Args:
+        matrix (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        method (str): One of `WEIGHT_METHODS`
+        
+    Returns:
+        np.ndarray: (n,) or (B, n) weights summing to one
+        
+    Raises:
+        ValueError: If the method is unknown
+    """
+    weight_function = WEIGHT_FUNCTIONS.get(method)
+    if weight_function is None:
+        raise ValueError(f"Unknown weight method '{method}', expected one of {WEIGHT_METHODS}")
+    return weight_function(matrix)
 
 def consistency_check(
     matrix: np.ndarray, 
@@ -71,18 +277,153 @@ def consistency_check(
     # Calculate Consistency Index (CI)
     CI = (lambda_max - n) / (n - 1)
     
-    # Random Index values for different matrix sizes (from Saaty's research)
-    RI_values = {
-        1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12,
-        6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45
-    }
-    RI = RI_values.get(n, 1.45)  # Default to 1.45 for n > 9
+    RI = random_index(n)
     
     # Calculate Consistency Ratio (CR)
     CR = CI / RI if RI else 0
     
     return lambda_max, CI, CR
 
+def normalize_matrix_batch(
+    matrices: np.ndarray,
+    method: str = 'approximate'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalize a stack of pairwise comparison matrices and calculate their weights.
+    
+    Batched form of `normalize_matrix`: every matrix is normalized by its own
+    column sums in a single broadcast operation, and the weights of the
+    whole stack are derived in one call of the method's weight function.
+    
+    Args:
+        matrices (np.ndarray): (B, n, n) stack of pairwise comparison matrices
+        method (str): One of `WEIGHT_METHODS`
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - (B, n, n) normalized matrices
+            - (B, n) weights for each matrix
+    """
+    if method not in WEIGHT_METHODS:
+        raise ValueError(f"Unknown weight method '{method}', expected one of {WEIGHT_METHODS}")
+    
+    matrices = np.asarray(matrices, dtype=float)
+    normalized_matrices = matrices / matrices.sum(axis=1, keepdims=True)
+    if method == 'approximate':
+        weights = normalized_matrices.mean(axis=2)
+    elif method == 'eigenvector':
+        weights, _ = eigenvector_weights(matrices, initial_weights=normalized_matrices.mean(axis=2))
+    else:
+        weights = WEIGHT_FUNCTIONS[method](matrices)
+    return normalized_matrices, weights
+
+def consistency_check_batch(
+    matrices: np.ndarray,
+    weights: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate consistency metrics for a stack of pairwise comparison matrices.
+    
+    Batched form of `consistency_check`, vectorized over the stack.
+    
+    Args:
+        matrices (np.ndarray): (B, n, n) stack of pairwise comparison matrices
+        weights (np.ndarray): (B, n) weights for each matrix
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - (B,) λmax per matrix
+            - (B,) Consistency Index per matrix
+            - (B,) Consistency Ratio per matrix
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n = matrices.shape[-1]
+    
+    # λmax from the weighted sum vectors of every matrix at once
+    weighted_sum_vectors = np.einsum('bij,bj->bi', matrices, weights)
+    lambda_max = (weighted_sum_vectors / weights).mean(axis=1)
+    
+    CI = (lambda_max - n) / (n - 1)
+    RI = random_index(n)
+    CR = CI / RI if RI else np.zeros_like(CI)
+    
+    return lambda_max, CI, CR
+
+def complete_reciprocals(matrices: np.ndarray) -> np.ndarray:
+    """
+    Fill in missing judgments from their reciprocals.
+    
+    Every NaN entry a_ij becomes 1 / a_ji and a NaN diagonal becomes one, so
+    only the upper (or lower) triangle of a matrix needs to be entered.
+    
+    Args:
+        matrices (np.ndarray): (n, n) matrix or (B, n, n) stack, NaN where missing
+        
+    Returns:
+        np.ndarray: Completed copy; entries missing on both sides stay NaN
+    """
+    matrices = np.array(matrices, dtype=float)
+    n = matrices.shape[-1]
+    diagonal = np.arange(n)
+    matrices[..., diagonal, diagonal] = np.nan_to_num(matrices[..., diagonal, diagonal], nan=1.0)
+    missing = np.isnan(matrices)
+    with np.errstate(divide='ignore'):
+        reciprocals = 1 / np.swapaxes(matrices, -1, -2)
+    matrices[missing] = reciprocals[missing]
+    return matrices
+
+def validate_matrices(matrices: np.ndarray, rtol: float = 1e-6) -> Dict[str, np.ndarray]:
+    """
+    Find the invalid cells of pairwise comparison matrices in one pass.
+    
+    Args:
+        matrices (np.ndarray): (n, n) matrix or (B, n, n) stack of pairwise comparisons
+        rtol (float): Relative tolerance for the scale bounds, the unit
+            diagonal and reciprocity
+        
+    Returns:
+        Dict[str, np.ndarray]: Boolean mask, shaped like `matrices`, of the
+            cells failing each check:
+            - missing: NaN
+            - not_positive: zero or negative
+            - out_of_scale: outside Saaty's scale, 1/9 to 9
+            - diagonal: diagonal entry other than one
+            - not_reciprocal: a_ij * a_ji is not one (both cells are marked)
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+    missing = np.isnan(matrices)
+    with np.errstate(invalid='ignore'):
+        not_positive = matrices <= 0
+        out_of_scale = ~not_positive & ((matrices < SAATY_SCALE[0] * (1 - rtol))
+                                        | (matrices > SAATY_SCALE[-1] * (1 + rtol)))
+        diagonal = np.eye(n, dtype=bool) & ~np.isclose(matrices, 1, rtol=rtol, atol=0)
+        products = matrices * np.swapaxes(matrices, -1, -2)
+        not_reciprocal = ~np.isclose(products, 1, rtol=rtol, atol=0) & ~np.isnan(products)
+    return {
+        'missing': missing,
+        'not_positive': not_positive,
+        'out_of_scale': out_of_scale,
+        'diagonal': diagonal,
+        'not_reciprocal': not_reciprocal,
+    }
+
+def nearest_scale_index(values: np.ndarray) -> np.ndarray:
+    """
+    Find the closest point on Saaty's scale for each judgment.
+    
+    Distances are measured on a log scale, so 1/3 and 3 are equally far from 1.
+    
+    Args:
+        values (np.ndarray): Positive pairwise judgments of any shape
+        
+    Returns:
+        np.ndarray: Index into `SAATY_SCALE` for every value
+    """
+    log_values = np.log(np.asarray(values, dtype=float))[..., np.newaxis]
+    return np.abs(log_values - np.log(SAATY_SCALE)).argmin(axis=-1)
+
 def calculate_final_score(
     criteria: List[str], 
     weights: np.ndarray, 
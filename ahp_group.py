@@ -0,0 +1,179 @@
+"""
+Group AHP: combining the pairwise judgments of many experts
+
+Each criteria group (U1-U4) receives one pairwise comparison matrix per expert,
+stacked into a (K, n, n) array. The experts' judgments are combined with the
+element-wise (weighted) geometric mean, which keeps the consensus matrix
+reciprocal, and the consistency of every expert and of the consensus is
+checked in one batched pass. The consensus matrices then feed straight into
+an `AHPCalculator`.
+"""
+
+import numpy as np
+from typing import Any, Dict, Optional, Union
+
+from ahp_calculation import AHPCalculator
+from ahp_core import consistency_check_batch, normalize_matrix_batch
+
+# Expert weights: None (equal), an array with one weight per expert, or
+# 'consistency' to weight each expert by how consistent their judgments are
+ExpertWeights = Union[None, str, np.ndarray]
+
+
+def aggregate_judgments(
+    matrices: np.ndarray,
+    expert_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Combine K experts' pairwise comparison matrices into one.
+
+    Computes the element-wise weighted geometric mean
+    prod_k a_ij^(k) ^ w_k with the weights normalised to sum to one.
+
+    Args:
+        matrices (np.ndarray): (K, n, n) stack of pairwise comparison matrices
+        expert_weights (np.ndarray, optional): (K,) non-negative weight per
+            expert; equal weights if omitted
+
+    Returns:
+        np.ndarray: (n, n) consensus matrix
+    """
+    log_matrices = np.log(np.asarray(matrices, dtype=float))
+    if expert_weights is None:
+        return np.exp(log_matrices.mean(axis=0))
+
+    expert_weights = np.asarray(expert_weights, dtype=float)
+    if expert_weights.shape != log_matrices.shape[:1]:
+        raise ValueError(
+            f"Expected {log_matrices.shape[0]} expert weights, got shape {expert_weights.shape}"
+        )
+    if (expert_weights < 0).any() or expert_weights.sum() <= 0:
+        raise ValueError("Expert weights must be non-negative and not all zero")
+    return np.exp(np.tensordot(expert_weights / expert_weights.sum(), log_matrices, axes=1))
+
+
+def consistency_weights(expert_CR: np.ndarray, threshold: float = 0.1) -> np.ndarray:
+    """
+    Derive expert weights from consistency ratios.
+
+    Experts at or above `threshold` get zero weight; the rest are weighted by
+    how far below the threshold they are, so more consistent experts count more.
+
+    Args:
+        expert_CR (np.ndarray): (K,) consistency ratio per expert
+        threshold (float): Consistency ratio treated as unacceptable
+
+    Returns:
+        np.ndarray: (K,) expert weights summing to one
+
+    Raises:
+        ValueError: If no expert is below the threshold
+    """
+    weights = np.clip(threshold - np.asarray(expert_CR, dtype=float), 0, None)
+    if weights.sum() <= 0:
+        raise ValueError("No expert's judgments are consistent")
+    return weights / weights.sum()
+
+
+def aggregate_group(
+    matrices: np.ndarray,
+    expert_weights: ExpertWeights = None,
+    method: str = 'approximate'
+) -> Dict[str, Any]:
+    """
+    Aggregate one criteria group and check every expert's consistency.
+
+    The experts' matrices and the consensus matrix are checked together in
+    one batched pass; with 'consistency' weighting the consensus needs the
+    experts' CRs first and is checked in a second pass of size one.
+
+    Args:
+        matrices (np.ndarray): (K, n, n) stack of the experts' matrices
+        expert_weights (ExpertWeights): None for equal weights, a (K,) array,
+            or 'consistency' to use `consistency_weights`
+        method (str): Weight derivation method for the consistency checks
+
+    Returns:
+        Dict[str, Any]:
+            - consensus: (n, n) aggregated matrix
+            - expert_weights: (K,) weights used for aggregation
+            - expert_CR: (K,) consistency ratio per expert
+            - expert_is_consistent: (K,) CR < 0.1 per expert
+            - weights: (n,) priority weights of the consensus matrix
+            - lambda_max, CI, CR, is_consistent: consistency of the consensus
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError(f"Expected a (K, n, n) stack of matrices, got shape {matrices.shape}")
+
+    if isinstance(expert_weights, str):
+        if expert_weights != 'consistency':
+            raise ValueError(f"Unknown expert weighting '{expert_weights}'")
+        # The weights depend on the experts' CRs, so the experts go first
+        _, expert_priorities = normalize_matrix_batch(matrices, method)
+        _, _, expert_CR = consistency_check_batch(matrices, expert_priorities)
+        expert_weights = consistency_weights(expert_CR)
+        consensus = aggregate_judgments(matrices, expert_weights)
+        _, weights = normalize_matrix_batch(consensus[np.newaxis], method)
+        lambda_max, CI, CR = consistency_check_batch(consensus[np.newaxis], weights)
+        weights, lambda_max, CI, CR = weights[0], lambda_max[0], CI[0], CR[0]
+    else:
+        if expert_weights is None:
+            expert_weights = np.full(len(matrices), 1.0 / len(matrices))
+        consensus = aggregate_judgments(matrices, expert_weights)
+        # Check the experts and the consensus together in one batched pass
+        stacked = np.concatenate([matrices, consensus[np.newaxis]])
+        _, priorities = normalize_matrix_batch(stacked, method)
+        lambda_max, CI, CR = consistency_check_batch(stacked, priorities)
+        expert_CR = CR[:-1]
+        weights, lambda_max, CI, CR = priorities[-1], lambda_max[-1], CI[-1], CR[-1]
+
+    return {
+        'consensus': consensus,
+        'expert_weights': np.asarray(expert_weights, dtype=float),
+        'expert_CR': expert_CR,
+        'expert_is_consistent': expert_CR < 0.1,
+        'weights': weights,
+        'lambda_max': float(lambda_max),
+        'CI': float(CI),
+        'CR': float(CR),
+        'is_consistent': bool(CR < 0.1),
+    }
+
+
+def build_group_calculator(
+    expert_matrices: Dict[str, np.ndarray],
+    expert_weights: Union[ExpertWeights, Dict[str, ExpertWeights]] = None,
+    method: str = 'approximate',
+    **calculator_kwargs
+) -> AHPCalculator:
+    """
+    Build an `AHPCalculator` from many experts' judgments.
+
+    Args:
+        expert_matrices (Dict[str, np.ndarray]): (K, n, n) stack per main
+            category, e.g. {'U1': ..., 'U4': ...}; categories left out keep
+            the calculator's default matrices
+        expert_weights: Expert weighting shared by all categories, or a dict
+            with one weighting per category
+        method (str): Weight derivation method
+        **calculator_kwargs: Passed on to `AHPCalculator`, e.g. `main_weights`
+            or `artifact_path`
+
+    Returns:
+        AHPCalculator: Calculator over the consensus matrices, with the
+        per-category aggregation results in its `group_results` attribute
+    """
+    group_results = {}
+    for category, matrices in expert_matrices.items():
+        weighting = (expert_weights.get(category) if isinstance(expert_weights, dict)
+                     else expert_weights)
+        group_results[category] = aggregate_group(matrices, weighting, method)
+
+    calculator = AHPCalculator(
+        matrices={category: result['consensus'] for category, result in group_results.items()},
+        method=method,
+        **calculator_kwargs
+    )
+    calculator.group_results = group_results
+    return calculator
@@ -0,0 +1,214 @@
+"""
+Criteria hierarchies of any depth
+
+`AHPCalculator` covers one fixed two-level tree (U1-U4, then their
+sub-criteria). A `Hierarchy` takes any tree of `Criterion` nodes instead,
+e.g. "Ability to repay" split into income, assets and crop yield, each with
+sub-criteria of its own. Every inner node carries either a pairwise
+comparison matrix of its children or fixed child weights.
+
+Compiling the tree validates every matrix, derives the local weights and
+consistency of all matrices of the same size in one batched pass, and
+multiplies the local weights down each path into one global weight per leaf.
+The result is an ordinary `ScoringModel`, so scoring an applicant is a dot
+product over the leaves no matter how deep the tree is.
+
+Usage:
+    hierarchy = Hierarchy(Criterion('Credit score', children=(...), matrix=...))
+    hierarchy.model.score({'Income': 4, 'Assets': 3, ...})
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ahp_core import (
+    WEIGHT_METHODS,
+    consistency_check_batch,
+    normalize_matrix_batch,
+    random_index,
+    validate_matrices
+)
+from ahp_model import ScoringModel
+
+# Consistency Ratio below which a matrix is accepted
+CR_THRESHOLD = 0.1
+
+
+class Criterion(NamedTuple):
+    """
+    One node of a criteria hierarchy; a leaf when it has no children.
+
+    An inner node needs either `matrix`, the (k, k) pairwise comparisons of
+    its k children, or `weights`, k fixed child weights used as given, but
+    not both.
+    """
+    name: str
+    children: Tuple["Criterion", ...] = ()
+    matrix: Optional[Any] = None
+    weights: Optional[Tuple[float, ...]] = None
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Criterion":
+        """
+        Build a tree from nested dicts, e.g. parsed from JSON.
+
+        Args:
+            spec (Dict[str, Any]): 'name' and optionally 'children' (a list of
+                such dicts), 'matrix' and 'weights'
+
+        Returns:
+            Criterion: Root of the tree
+        """
+        return cls(
+            name=spec['name'],
+            children=tuple(cls.from_dict(child) for child in spec.get('children', ())),
+            matrix=spec.get('matrix'),
+            weights=None if spec.get('weights') is None else tuple(spec['weights'])
+        )
+
+
+def _validate_matrix(node: Criterion) -> np.ndarray:
+    """Check that a node's matrix is a k x k matrix passing `ahp_core.validate_matrices`"""
+    k = len(node.children)
+    matrix = np.asarray(node.matrix, dtype=float)
+    if matrix.shape != (k, k):
+        raise ValueError(f"Criterion '{node.name}' has {k} children but a {matrix.shape} matrix")
+    problems = [check for check, mask in validate_matrices(matrix).items() if mask.any()]
+    if problems:
+        raise ValueError(f"Criterion '{node.name}' has invalid judgments: {', '.join(problems)}")
+    return matrix
+
+
+class Hierarchy:
+    """
+    A criteria tree compiled into a flat leaf weight vector.
+
+    Attributes:
+        root (Criterion): Root of the tree
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        leaves (Tuple[str, ...]): Leaf criteria in depth-first order
+        global_weights (np.ndarray): Global weight of each leaf
+        local_weights (Dict[str, np.ndarray]): Child weights per inner node
+        consistency_results (Dict[str, Dict[str, Any]]): λmax, CI, RI, CR and
+            is_consistent per node with a matrix, as in `AHPCalculator`
+        is_consistent (bool): Whether every matrix has CR < `CR_THRESHOLD`
+        model (Optional[ScoringModel]): Leaf model, None if any matrix is inconsistent
+    """
+
+    def __init__(self, root: Criterion, method: str = 'approximate'):
+        if method not in WEIGHT_METHODS:
+            raise ValueError(f"Unknown weight method '{method}', expected one of {WEIGHT_METHODS}")
+        self.root = root
+        self.method = method
+
+        # Pre-order walk: every node comes after its parent
+        nodes: List[Criterion] = []
+        parents: List[int] = []
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            parents.append(parent)
+            nodes.append(node)
+            stack.extend((child, len(nodes) - 1) for child in reversed(node.children))
+
+        names = [node.name for node in nodes]
+        if len(set(names)) != len(names):
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            raise ValueError(f"Criterion names must be unique, got duplicates {duplicates}")
+
+        self.local_weights = {}
+        self.consistency_results = {}
+        matrices_by_size: Dict[int, List[Tuple[str, np.ndarray]]] = {}
+        for node in nodes:
+            if not node.children:
+                if node.matrix is not None or node.weights is not None:
+                    raise ValueError(f"Leaf criterion '{node.name}' cannot have a matrix or weights")
+            elif node.matrix is not None and node.weights is not None:
+                raise ValueError(f"Criterion '{node.name}' needs a matrix or weights, not both")
+            elif node.matrix is not None:
+                matrix = _validate_matrix(node)
+                matrices_by_size.setdefault(len(matrix), []).append((node.name, matrix))
+            elif node.weights is not None:
+                weights = np.asarray(node.weights, dtype=float)
+                if weights.shape != (len(node.children),) or (weights < 0).any():
+                    raise ValueError(
+                        f"Criterion '{node.name}' needs {len(node.children)} non-negative weights"
+                    )
+                self.local_weights[node.name] = weights
+            else:
+                raise ValueError(f"Criterion '{node.name}' needs a matrix or weights for its children")
+
+        # All matrices of one size are normalized and checked in one batch
+        for n, entries in matrices_by_size.items():
+            stack = np.stack([matrix for _, matrix in entries])
+            _, weights = normalize_matrix_batch(stack, method)
+            lambda_max, CI, CR = consistency_check_batch(stack, weights)
+            RI = random_index(n)
+            for index, (name, _) in enumerate(entries):
+                self.local_weights[name] = weights[index]
+                self.consistency_results[name] = {
+                    'lambda_max': float(lambda_max[index]),
+                    'CI': float(CI[index]),
+                    'RI': RI,
+                    'CR': float(CR[index]),
+                    'is_consistent': bool(CR[index] < CR_THRESHOLD)
+                }
+
+        # Multiply the local weights down every path
+        global_weights = np.ones(len(nodes))
+        child_index = {}
+        for index, (node, parent) in enumerate(zip(nodes, parents)):
+            if parent >= 0:
+                position = child_index[parent] = child_index.get(parent, -1) + 1
+                global_weights[index] = global_weights[parent] * self.local_weights[nodes[parent].name][position]
+
+        leaves = [index for index, node in enumerate(nodes) if not node.children]
+        self.leaves = tuple(names[index] for index in leaves)
+        self.global_weights = global_weights[leaves]
+        self.global_weights.flags.writeable = False
+        self.is_consistent = all(result['is_consistent'] for result in self.consistency_results.values())
+        self.model = ScoringModel(self.leaves, self.global_weights) if self.is_consistent else None
+
+    @classmethod
+    def from_calculator(cls, calculator) -> "Hierarchy":
+        """
+        The two-level tree of an `AHPCalculator`: fixed main weights for
+        U1-U4 over their pairwise sub-criteria matrices.
+        """
+        from ahp_calculation import SUB_CRITERIA_PREFIXES
+        categories = []
+        for category, matrix in calculator.matrices.items():
+            prefix = SUB_CRITERIA_PREFIXES[category]
+            children = tuple(Criterion(f'{prefix}{i+1}') for i in range(len(matrix)))
+            categories.append(Criterion(category, children, matrix=matrix))
+        root = Criterion('Credit score', tuple(categories),
+                         weights=tuple(calculator.main_weights[c.name] for c in categories))
+        return cls(root, calculator.method)
+
+    @property
+    def depth(self) -> int:
+        """Number of levels below the root"""
+        levels, depth = [self.root], 0
+        while True:
+            levels = [child for node in levels for child in node.children]
+            if not levels:
+                return depth
+            depth += 1
+
+    def leaf_weights(self) -> Dict[str, float]:
+        """Global weight of every leaf keyed by name"""
+        return dict(zip(self.leaves, self.global_weights.tolist()))
+
+    def _require_model(self) -> ScoringModel:
+        if self.model is None:
+            raise RuntimeError("Cannot calculate score: Inconsistent matrices")
+        return self.model
+
+    def score(self, scores: Dict[str, float]) -> float:
+        """Percentage score of one applicant from leaf scores keyed by name"""
+        return self._require_model().score(scores)
+
+    def score_batch(self, scores: np.ndarray, criteria: Optional[Sequence[str]] = None) -> np.ndarray:
+        """(N,) percentage scores from (N x k) leaf scores; see `ScoringModel.score_batch`"""
+        return self._require_model().score_batch(scores, criteria)
@@ -0,0 +1,243 @@
+"""
+Low-overhead instrumentation for the AHP scoring hot paths
+
+`AHPCalculator` stages (construction, consistency checks, weight derivation,
+single and batch scoring) are wrapped with `instrument`, which records a call
+counter, a failure counter and a latency histogram per stage. Collection is
+off by default and the wrappers then cost a single flag check; switch it on
+with `enable()` or by setting the `AHP_METRICS=1` environment variable.
+
+Metrics are kept per process and exported in the Prometheus text format,
+either written to a file (e.g. for node_exporter's textfile collector) with
+`write_textfile` or served over HTTP with `serve`.
+"""
+
+import functools
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets, from 1 us to 10 s
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_enabled = os.environ.get('AHP_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+_lock = threading.Lock()
+
+
+def enable():
+    """Start collecting metrics"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop collecting metrics; recorded values are kept"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = (f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return '{' + ','.join(pairs) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        if not _enabled:
+            return
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def reset(self):
+        with _lock:
+            self._values.clear()
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with _lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}"
+
+
+class Histogram:
+    """Latency histogram with fixed buckets and optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        if not _enabled:
+            return
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def reset(self):
+        with _lock:
+            self._series.clear()
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with _lock:
+            series = sorted((labels, (list(counts), total, count))
+                            for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                yield (f"{self.name}_bucket"
+                       f"{_format_labels((*self.labelnames, 'le'), (*labels, le))} {cumulative}")
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total:.9g}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+STAGE_CALLS = Counter('ahp_stage_calls_total', "Calls per instrumented stage", ('stage',))
+STAGE_FAILURES = Counter('ahp_stage_failures_total',
+                         "Calls per stage that raised or produced no result", ('stage',))
+STAGE_LATENCY = Histogram('ahp_stage_latency_seconds', "Wall-clock latency per stage", ('stage',))
+INCONSISTENT_MATRICES = Counter('ahp_inconsistent_matrices_total',
+                                "Pairwise matrices rejected with CR >= 0.1", ('category',))
+APPLICANTS_SCORED = Counter('ahp_applicants_scored_total', "Applicants scored by the batch paths")
+AUDIT_DROPPED = Counter('ahp_audit_dropped_total', "Decisions an AuditSink discarded because its queue was full")
+
+METRICS = [STAGE_CALLS, STAGE_FAILURES, STAGE_LATENCY, INCONSISTENT_MATRICES, APPLICANTS_SCORED, AUDIT_DROPPED]
+
+
+def instrument(stage: str, failed: Optional[Callable] = None):
+    """
+    Decorator recording calls, failures and latency of a stage.
+
+    Args:
+        stage (str): Value of the `stage` label
+        failed (Callable, optional): Predicate on the return value marking a
+            call as failed; exceptions always count as failures
+
+    Returns:
+        Callable: Decorator; the wrapped function only checks a flag while
+            collection is disabled
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                _record(stage, perf_counter() - started, True)
+                raise
+            _record(stage, perf_counter() - started, failed is not None and failed(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def _record(stage: str, elapsed: float, failed: bool):
+    STAGE_CALLS.inc(stage)
+    STAGE_LATENCY.observe(elapsed, stage)
+    if failed:
+        STAGE_FAILURES.inc(stage)
+
+
+def reset():
+    """Clear every recorded value"""
+    for metric in METRICS:
+        metric.reset()
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = [line for metric in METRICS for line in metric.render()]
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path: str):
+    """Atomically write the current metrics to `path`"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+
+def serve(port: int = 9464, host: str = '127.0.0.1'):
+    """
+    Serve `/metrics` from a daemon thread.
+
+    Args:
+        port (int): Port to listen on; 0 picks a free one
+        host (str): Interface to bind, local only by default
+
+    Returns:
+        ThreadingHTTPServer: Running server; call `shutdown()` to stop it
+    """
+    # http.server is slow to import, so it is only loaded when serving
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='ahp-metrics', daemon=True).start()
+    return server
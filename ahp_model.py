@@ -0,0 +1,424 @@
+"""
+Compiled scoring model for AHP credit scoring
+
+An `AHPCalculator` derives local weights for every sub-criterion and scales
+them by the weight of their main category. `ScoringModel` does that work once:
+it holds a flat, read-only vector of global weights in a fixed criterion order
+together with the normaliser for the maximum possible score, so scoring an
+applicant is a single dot product.
+
+The module also persists a calculator's pairwise matrices, derived weights
+and consistency results to a versioned `.npz` artifact keyed by a content
+hash, so the weights are only recomputed when the matrices change.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import zipfile
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from ahp_core import RANDOM_INDEX, RANDOM_INDEX_SAMPLES, RANDOM_INDEX_SEED
+
+# Highest score a single sub-criterion can receive
+MAX_SUB_SCORE = 5
+
+# Minimum percentage score required for loan eligibility
+ELIGIBILITY_THRESHOLD = 70
+
+# Layout version of the artifact file; bump when its keys change
+ARTIFACT_VERSION = 1
+
+# Artifact used by the Streamlit apps and batch tools unless told otherwise
+DEFAULT_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ahp_model.npz')
+
+# Order of the consistency metrics stored per matrix in an artifact
+CONSISTENCY_FIELDS = ('lambda_max', 'CI', 'RI', 'CR')
+
+# Pairwise comparison matrices of the U1-U4 sub-criteria, used by
+# `AHPCalculator` unless it is given others
+DEFAULT_MATRICES = {
+    'U1': (
+        (1, 3, 5, 7, 2, 4, 6),  # Example priorities for A1 vs others
+        (1/3, 1, 3, 5, 2, 3, 4),
+        (1/5, 1/3, 1, 3, 1, 2, 3),
+        (1/7, 1/5, 1/3, 1, 1/2, 1, 2),
+        (1/2, 1/2, 1, 2, 1, 2, 3),
+        (1/4, 1/3, 1/2, 1, 1/2, 1, 2),
+        (1/6, 1/4, 1/3, 1/2, 1/3, 1/2, 1)
+    ),
+    'U2': (
+        (1, 4, 7, 5),  # Example priorities for B1 vs others
+        (1/4, 1, 3, 2),
+        (1/7, 1/3, 1, 1/2),
+        (1/5, 1/2, 2, 1)
+    ),
+    'U3': (
+        (1, 3, 5, 7, 4, 6, 8),  # Example priorities for C1 vs others
+        (1/3, 1, 3, 5, 3, 4, 6),
+        (1/5, 1/3, 1, 3, 2, 3, 4),
+        (1/7, 1/5, 1/3, 1, 1/2, 2, 3),
+        (1/4, 1/3, 1/2, 2, 1, 3, 4),
+        (1/6, 1/4, 1/3, 1/2, 1/3, 1, 2),
+        (1/8, 1/6, 1/4, 1/3, 1/4, 1/2, 1)
+    ),
+    'U4': (
+        (1, 2, 4),  # Example priorities for D1 vs others
+        (1/2, 1, 3),
+        (1/4, 1/3, 1)
+    ),
+}
+
+# Main criteria weights used by `AHPCalculator` unless it is given others
+DEFAULT_MAIN_WEIGHTS = {
+    'U1': 0.0954,
+    'U2': 0.1601,
+    'U3': 0.2772,
+    'U4': 0.4673
+}
+
+# Column layouts whose weights and scale a ScoringModel keeps cached
+COLUMN_CACHE_SIZE = 1024
+
+# Random Index per matrix size n = 1 to 50, as hashed into artifacts
+DEFAULT_RANDOM_INDEX = {n: value for n, value in enumerate(RANDOM_INDEX.tolist()) if n >= 1}
+
+
+class ScoringModel:
+    """
+    Immutable vector form of a set of AHP weights.
+
+    Attributes:
+        criteria (Tuple[str, ...]): Criterion names in weight-vector order
+        global_weights (np.ndarray): Read-only float64 global weight per criterion
+        max_possible_score (float): Weighted score of an applicant scoring
+            `MAX_SUB_SCORE` on every criterion
+    """
+
+    __slots__ = ('criteria', 'global_weights', 'max_possible_score', '_index', '_columns', '_columns_lock')
+
+    def __init__(self, criteria: Sequence[str], global_weights: Iterable[float]):
+        criteria = tuple(criteria)
+        global_weights = np.array(global_weights, dtype=np.float64)
+        if global_weights.shape != (len(criteria),):
+            raise ValueError(
+                f"Expected {len(criteria)} global weights, got shape {global_weights.shape}"
+            )
+        global_weights.flags.writeable = False
+
+        object.__setattr__(self, 'criteria', criteria)
+        object.__setattr__(self, 'global_weights', global_weights)
+        object.__setattr__(self, 'max_possible_score', MAX_SUB_SCORE * float(global_weights.sum()))
+        object.__setattr__(self, '_index', {name: i for i, name in enumerate(criteria)})
+        object.__setattr__(self, '_columns', OrderedDict())
+        object.__setattr__(self, '_columns_lock', threading.Lock())
+
+    @classmethod
+    def from_weights(
+        cls,
+        weights: Dict[str, float],
+        main_weights: Dict[str, float]
+    ) -> "ScoringModel":
+        """
+        Compile local sub-criterion weights and main category weights.
+
+        Args:
+            weights (Dict[str, float]): Local weight per sub-criterion, keyed
+                'U1A1' ... 'U4D3'; the first two characters name the main category
+            main_weights (Dict[str, float]): Weight per main category
+
+        Returns:
+            ScoringModel: Model with criteria in the order of `weights`
+        """
+        criteria = list(weights)
+        return cls(criteria, [weights[c] * main_weights[c[:2]] for c in criteria])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScoringModel is immutable")
+
+    def __len__(self) -> int:
+        return len(self.criteria)
+
+    def columns(self, criteria: Sequence[str]) -> Tuple[np.ndarray, float]:
+        """
+        Get the weight vector and percentage scale for a column layout.
+
+        Applicants may be scored on a subset of the criteria, in which case the
+        maximum possible score only covers that subset. The result is cached
+        per column order, so repeated calls cost one dictionary lookup; the
+        `COLUMN_CACHE_SIZE` most recently used layouts are kept.
+
+        Args:
+            criteria (Sequence[str]): Criterion name of each score column
+
+        Returns:
+            Tuple[np.ndarray, float]:
+                - Read-only global weights in column order
+                - Factor turning a weighted score into a percentage
+
+        Raises:
+            KeyError: If a criterion is not part of the model
+            ValueError: If the layout has no columns or its weights sum to zero
+        """
+        key = tuple(criteria)
+        cached = self._columns.get(key)
+        if cached is not None:
+            try:
+                self._columns.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread since the lookup
+                pass
+        else:
+            missing_keys = set(key) - self._index.keys()
+            if missing_keys:
+                raise KeyError(missing_keys)
+            if key == self.criteria:
+                weights = self.global_weights
+                max_possible_score = self.max_possible_score
+            else:
+                weights = self.global_weights[[self._index[c] for c in key]]
+                weights.flags.writeable = False
+                max_possible_score = MAX_SUB_SCORE * float(weights.sum())
+            if not key:
+                raise ValueError("No criteria to score")
+            if max_possible_score <= 0:
+                raise ValueError(f"Criteria {list(key)} carry no weight")
+            cached = (weights, 100 / max_possible_score)
+            with self._columns_lock:
+                self._columns[key] = cached
+                while len(self._columns) > COLUMN_CACHE_SIZE:
+                    self._columns.popitem(last=False)
+        return cached
+
+    def score(self, scores: Dict[str, float]) -> float:
+        """
+        Calculate the percentage score of one applicant.
+
+        Args:
+            scores (Dict[str, float]): Sub-criterion scores keyed by criterion name
+
+        Returns:
+            float: Percentage of the maximum possible score
+
+        Raises:
+            ValueError: If a score is missing (None), NaN or infinite
+        """
+        weights, scale = self.columns(scores.keys())
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(weights))
+        # A NaN or infinite input always makes the weighted sum non-finite
+        score = float(values @ weights) * scale
+        if not math.isfinite(score):
+            raise ValueError("Scores must be finite numbers")
+        return score
+
+    def score_batch(self, scores: np.ndarray, criteria: Sequence[str] = None) -> np.ndarray:
+        """
+        Calculate percentage scores for many applicants.
+
+        Args:
+            scores (np.ndarray): (N x k) scores, one column per criterion
+            criteria (Sequence[str], optional): Criterion name of each column;
+                defaults to the model's own criterion order
+
+        Returns:
+            np.ndarray: (N,) percentage scores
+
+        Raises:
+            ValueError: If the shape does not match the criteria or a score
+                is missing (None), NaN or infinite
+        """
+        weights, scale = self.columns(self.criteria if criteria is None else criteria)
+        matrix = np.asarray(scores, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(weights):
+            raise ValueError(
+                f"Expected an (N x {len(weights)}) score array, got shape {matrix.shape}"
+            )
+        return check_finite((matrix @ weights) * scale)
+
+
+def check_finite(scores: np.ndarray) -> np.ndarray:
+    """
+    Reject weighted scores that came from missing or non-finite inputs.
+
+    A NaN or infinite sub-criterion score always makes its applicant's
+    weighted sum non-finite, so checking the (N,) result is enough.
+
+    Raises:
+        ValueError: If any score is NaN or infinite
+    """
+    finite = np.isfinite(scores)
+    if not finite.all():
+        raise ValueError(f"Scores must be finite numbers; {int((~finite).sum())} of "
+                         f"{len(scores)} applicants have missing, NaN or infinite scores")
+    return scores
+
+
+def content_hash(
+    matrices: Dict[str, np.ndarray],
+    main_weights: Dict[str, float],
+    random_index: Dict[int, float],
+    method: str = 'approximate'
+) -> str:
+    """
+    Hash everything the derived weights and consistency results depend on.
+
+    Besides the Random Index values, the seed and sample count of their
+    Monte Carlo estimates are hashed, so regenerating the table with other
+    simulation parameters invalidates existing artifacts.
+
+    Args:
+        matrices (Dict[str, np.ndarray]): Pairwise comparison matrix per main category
+        main_weights (Dict[str, float]): Weight per main category
+        random_index (Dict[int, float]): Random Index per matrix size
+        method (str): Weight derivation method
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(f"ahp-artifact-v{ARTIFACT_VERSION}".encode())
+    for name, matrix in matrices.items():
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        digest.update(f"{name}{matrix.shape}".encode())
+        digest.update(matrix.tobytes())
+    digest.update(repr(sorted(main_weights.items())).encode())
+    digest.update(repr(sorted(random_index.items())).encode())
+    digest.update(f"ri-seed{RANDOM_INDEX_SEED}-samples{RANDOM_INDEX_SAMPLES}".encode())
+    digest.update(method.encode())
+    return digest.hexdigest()
+
+
+def default_content_hash(method: str = 'approximate') -> str:
+    """
+    Content hash of an `AHPCalculator` built with the default matrices and
+    main weights, computed without importing the calculator.
+
+    Args:
+        method (str): Weight derivation method
+
+    Returns:
+        str: Hex SHA-256 digest, as `AHPCalculator.content_hash`
+    """
+    matrices = {category: np.array(matrix, dtype=float) for category, matrix in DEFAULT_MATRICES.items()}
+    return content_hash(matrices, DEFAULT_MAIN_WEIGHTS, DEFAULT_RANDOM_INDEX, method)
+
+
+def save_artifact(
+    path: str,
+    matrices: Dict[str, np.ndarray],
+    main_weights: Dict[str, float],
+    random_index: Dict[int, float],
+    weights: Optional[Dict[str, float]],
+    consistency_results: Dict[str, Dict[str, Any]],
+    method: str = 'approximate'
+) -> str:
+    """
+    Write a calculator's matrices, weights and consistency results to `path`.
+
+    The file is written uncompressed and swapped into place atomically, so
+    concurrent readers never see a partial artifact.
+
+    Args:
+        path (str): Destination `.npz` file
+        matrices (Dict[str, np.ndarray]): Pairwise comparison matrix per main category
+        main_weights (Dict[str, float]): Weight per main category
+        random_index (Dict[int, float]): Random Index per matrix size
+        weights (Optional[Dict[str, float]]): Local sub-criterion weights, or
+            None if the matrices are inconsistent
+        consistency_results (Dict[str, Dict[str, Any]]): Consistency check per matrix
+        method (str): Weight derivation method the weights came from
+
+    Returns:
+        str: Content hash stored in the artifact
+    """
+    groups = list(matrices)
+    arrays = {
+        'version': np.array(ARTIFACT_VERSION),
+        'content_hash': np.array(content_hash(matrices, main_weights, random_index, method)),
+        'groups': np.array(groups),
+        'main_weights': np.array([main_weights[g] for g in groups], dtype=np.float64),
+        'consistency': np.array(
+            [[consistency_results[g][field] for field in CONSISTENCY_FIELDS] for g in groups],
+            dtype=np.float64
+        ),
+    }
+    for group in groups:
+        arrays[f'matrix_{group}'] = np.asarray(matrices[group], dtype=np.float64)
+    if weights is not None:
+        model = ScoringModel.from_weights(weights, main_weights)
+        arrays['criteria'] = np.array(model.criteria)
+        arrays['weights'] = np.array(list(weights.values()), dtype=np.float64)
+        arrays['global_weights'] = model.global_weights
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return str(arrays['content_hash'])
+
+
+def load_artifact(path: str, expected_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load an artifact written by `save_artifact`.
+
+    Args:
+        path (str): Artifact `.npz` file
+        expected_hash (str, optional): Content hash of the current inputs; a
+            stale artifact with a different hash is treated as missing
+
+    Returns:
+        Optional[Dict[str, Any]]: None if the file is missing, stale, corrupt
+        or of another layout version; otherwise a dict with
+            - content_hash: Hash of the inputs the artifact was built from
+            - matrices: Pairwise comparison matrix per main category
+            - main_weights: Weight per main category
+            - consistency_results: Consistency check per matrix
+            - weights: Local sub-criterion weights, or None
+            - model: Compiled `ScoringModel`, or None
+    """
+    try:
+        data = np.load(path, allow_pickle=False)
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+    if not isinstance(data, np.lib.npyio.NpzFile):
+        return None
+
+    # A truncated or corrupt artifact counts as missing, so it gets rebuilt
+    try:
+        with data:
+            return _read_artifact(data, expected_hash)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def _read_artifact(data, expected_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Contents of an open artifact, see `load_artifact`"""
+    if int(data['version']) != ARTIFACT_VERSION:
+        return None
+    stored_hash = str(data['content_hash'])
+    if expected_hash is not None and stored_hash != expected_hash:
+        return None
+
+    groups = [str(g) for g in data['groups']]
+    consistency_results = {}
+    for group, row in zip(groups, data['consistency']):
+        result = {field: float(value) for field, value in zip(CONSISTENCY_FIELDS, row)}
+        result['is_consistent'] = result['CR'] < 0.1
+        consistency_results[group] = result
+
+    weights = model = None
+    if 'criteria' in data:
+        criteria = [str(c) for c in data['criteria']]
+        weights = dict(zip(criteria, data['weights'].tolist()))
+        model = ScoringModel(criteria, data['global_weights'])
+
+    return {
+        'content_hash': stored_hash,
+        'matrices': {g: data[f'matrix_{g}'] for g in groups},
+        'main_weights': dict(zip(groups, data['main_weights'].tolist())),
+        'consistency_results': consistency_results,
+        'weights': weights,
+        'model': model,
+    }
@@ -0,0 +1,209 @@
+"""
+Monte Carlo Random Index tables
+
+Saaty's Random Index (RI) is the mean Consistency Index of random reciprocal
+matrices, and the published tables stop at n = 9 or 10. `ahp_core.RANDOM_INDEX`
+extends them to n = 50 with estimates precomputed by this module, so
+consistency checks never simulate. For larger n, or other seeds and sample
+counts, the estimate is an explicit step: `simulated_random_index` estimates
+RI for any n by drawing `samples` random reciprocal matrices with
+judgments uniform on `SAATY_SCALE` and averaging their λmax, found for a whole
+chunk of matrices at once by batched power iteration.
+
+Every n is simulated with its own seeded random streams, one per chunk, so an
+estimate only depends on the seed and sample count, not on which other sizes
+were computed alongside it or on how many processes computed them. Estimates
+are cached on disk per seed and sample count (one .npz file holding every n
+computed so far, in the user cache directory) and in memory, so each n is
+simulated only once.
+`random_index_table` fills a range of sizes in parallel across processes,
+and running this module precomputes a table.
+
+Usage:
+    python ahp_random_index.py --max-n 50 --samples 100000 --workers 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ahp_core import RANDOM_INDEX_SAMPLES, RANDOM_INDEX_SEED, SAATY_SCALE, eigenvector_weights
+
+# Defaults match the estimates precomputed in ahp_core.RANDOM_INDEX
+DEFAULT_SAMPLES = RANDOM_INDEX_SAMPLES
+DEFAULT_SEED = RANDOM_INDEX_SEED
+
+# Directory of the cached tables; override with AHP_RANDOM_INDEX_DIR
+DEFAULT_CACHE_DIR = os.environ.get(
+    'AHP_RANDOM_INDEX_DIR',
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'ahp_random_index')
+)
+
+# Matrix entries simulated per chunk, bounding memory to about 32 MB
+CHUNK_ELEMENTS = 1 << 22
+
+logger = logging.getLogger(__name__)
+
+# Random Index by n per (cache directory, seed, samples), filled on first use
+_tables: Dict[Tuple[str, int, int], Dict[int, float]] = {}
+
+
+def _cache_path(cache_dir: str, seed: int, samples: int) -> str:
+    return os.path.join(cache_dir, f"random_index-seed{seed}-samples{samples}.npz")
+
+
+def _read_table(path: str) -> Dict[int, float]:
+    try:
+        with np.load(path) as data:
+            return dict(zip(data['n'].tolist(), data['random_index'].tolist()))
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+def _table(cache_dir: str, seed: int, samples: int) -> Dict[int, float]:
+    """In-memory table for a seed and sample count, loaded from disk on first use"""
+    key = (cache_dir, seed, samples)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = _read_table(_cache_path(cache_dir, seed, samples))
+    return table
+
+
+def _save_table(cache_dir: str, seed: int, samples: int, table: Dict[int, float]):
+    """Merge `table` into the cached file, written atomically"""
+    path = _cache_path(cache_dir, seed, samples)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        merged = {**_read_table(path), **table}
+        sizes = sorted(merged)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, n=np.array(sizes), random_index=np.array([merged[n] for n in sizes]))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache Random Index table in %s: %s", cache_dir, e)
+
+
+def _chunk_sizes(n: int, samples: int) -> List[int]:
+    per_chunk = max(1, CHUNK_ELEMENTS // (n * n))
+    return [min(per_chunk, samples - start) for start in range(0, samples, per_chunk)]
+
+
+def _lambda_max_sum(n: int, size: int, seed: int, chunk: int) -> float:
+    """Sum of λmax over one chunk of random n x n reciprocal matrices"""
+    rng = np.random.default_rng([seed, n, chunk])
+    rows, cols = np.triu_indices(n, 1)
+    values = SAATY_SCALE[rng.integers(len(SAATY_SCALE), size=(size, len(rows)))]
+    matrices = np.ones((size, n, n))
+    matrices[:, rows, cols] = values
+    matrices[:, cols, rows] = 1 / values
+    weights, _ = eigenvector_weights(matrices, tol=1e-12)
+    return float((np.einsum('bij,bj->bi', matrices, weights) / weights).mean(axis=1).sum())
+
+
+def _simulate(sizes: Sequence[int], samples: int, seed: int, workers: int) -> Dict[int, float]:
+    """Estimate the Random Index of every size in `sizes` (all n >= 3)"""
+    # Largest matrices first, so the slowest chunks do not end up last
+    tasks = [(n, size, seed, chunk)
+             for n in sorted(sizes, reverse=True)
+             for chunk, size in enumerate(_chunk_sizes(n, samples))]
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            sums = list(pool.map(_lambda_max_sum, *zip(*tasks)))
+    else:
+        sums = [_lambda_max_sum(*task) for task in tasks]
+
+    totals = dict.fromkeys(sizes, 0.0)
+    for (n, *_), total in zip(tasks, sums):
+        totals[n] += total
+    return {n: (totals[n] / samples - n) / (n - 1) for n in sizes}
+
+
+def random_index_table(
+    sizes: Iterable[int] = range(3, 51),
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> Dict[int, float]:
+    """
+    Estimate the Random Index for several matrix sizes.
+
+    Sizes missing from the cache are simulated together, split into chunks
+    of at most `CHUNK_ELEMENTS` entries that are spread across processes.
+
+    Args:
+        sizes (Iterable[int]): Matrix sizes n
+        samples (int): Random matrices per size
+        seed (int): Seed of the random streams
+        workers (int, optional): Worker processes; all CPUs by default
+        cache_dir (str): Directory of the cached tables
+
+    Returns:
+        Dict[int, float]: Random Index by n, 0 for n < 3
+    """
+    sizes = list(sizes)
+    table = _table(cache_dir, seed, samples)
+    missing = sorted({n for n in sizes if n >= 3 and n not in table})
+    if missing:
+        simulated = _simulate(missing, samples, seed, workers or os.cpu_count() or 1)
+        table.update(simulated)
+        _save_table(cache_dir, seed, samples, simulated)
+    return {n: table.get(n, 0.0) for n in sizes}
+
+
+def simulated_random_index(
+    n: int,
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> float:
+    """
+    Estimate the Random Index of an n x n matrix.
+
+    A size that is not cached yet is simulated in this process; the first
+    lookup of n = 50 takes a few seconds, later ones are dictionary lookups.
+
+    Args:
+        n (int): Matrix size
+        samples (int): Random matrices to simulate
+        seed (int): Seed of the random streams
+        cache_dir (str): Directory of the cached tables
+
+    Returns:
+        float: Random Index, 0 for n < 3
+    """
+    if n < 3:
+        return 0.0
+    table = _table(cache_dir, seed, samples)
+    if n not in table:
+        random_index_table([n], samples, seed, workers=1, cache_dir=cache_dir)
+    return table[n]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Precompute a Monte Carlo Random Index table.")
+    parser.add_argument("--min-n", type=int, default=3, help="smallest matrix size (default 3)")
+    parser.add_argument("--max-n", type=int, default=50, help="largest matrix size (default 50)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help=f"random matrices per size (default {DEFAULT_SAMPLES})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="directory of the cached tables")
+    args = parser.parse_args(argv)
+
+    table = random_index_table(range(args.min_n, args.max_n + 1), args.samples, args.seed,
+                               args.workers, args.cache_dir)
+    for n, value in table.items():
+        print(f"{n:>4} {value:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
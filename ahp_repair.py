@@ -0,0 +1,252 @@
+"""
+Automatic repair suggestions for inconsistent pairwise comparison matrices
+
+When a matrix fails CR < 0.1, `suggest_repair` proposes a small set of
+judgment changes on Saaty's scale that bring it under the threshold. Each
+step scores every possible single edit, i.e. every upper-triangle judgment
+a_ij replaced by every value of `SAATY_SCALE` (with a_ji = 1/a_ij), and
+greedily applies the best one until the matrix is consistent.
+
+Edits are evaluated in one vectorized pass rather than by re-running
+`consistency_check` per candidate:
+- 'approximate' weights: an edit only changes columns i and j, so the new
+  column sums, weights and the two changed rows of A @ w are updated in O(n)
+  per candidate, leaving one batched matrix-vector product for λmax
+- any other method: the approximate-weight λmax above ranks all candidates,
+  and the `EXACT_SHORTLIST` best are solved exactly as one stack with the
+  method's batched weight function; eigenvector weights are warm-started
+  from the current principal eigenvector
+
+`inconsistency_contributions` shows which judgments contribute most to the
+inconsistency in the first place.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ahp_core import (
+    SAATY_SCALE,
+    WEIGHT_METHODS,
+    derive_weights,
+    eigenvector_weights,
+    nearest_scale_index,
+    normalize_matrix,
+    random_index
+)
+
+# Consistency Ratio below which a matrix is accepted
+CR_THRESHOLD = 0.1
+
+# Candidate edits solved exactly per step with methods other than 'approximate'
+EXACT_SHORTLIST = 64
+
+
+def inconsistency_contributions(matrix: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Contribution of every judgment to λmax - n.
+
+    For principal eigenvector weights, λmax - n = (1/n) Σ_{i<j} (e_ij + e_ji - 2)
+    with e_ij = a_ij w_j / w_i. The returned (i, j) term is zero for a judgment
+    that agrees with the weights and grows with the disagreement.
+
+    Args:
+        matrix (np.ndarray): (n, n) pairwise comparison matrix
+        weights (np.ndarray, optional): (n,) weights; the principal
+            eigenvector when omitted
+
+    Returns:
+        np.ndarray: (n, n) symmetric contributions, zero on the diagonal
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if weights is None:
+        weights, _ = eigenvector_weights(matrix)
+    deviation = matrix * weights[np.newaxis, :] / weights[:, np.newaxis]
+    return (deviation + deviation.T - 2) / len(matrix)
+
+
+def _candidate_edits(matrix: np.ndarray, frozen: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row, column and new value of every single upper-triangle edit"""
+    rows, cols = np.triu_indices(len(matrix), 1)
+    keep = ~frozen[rows, cols]
+    rows, cols = rows[keep], cols[keep]
+    current = nearest_scale_index(matrix[rows, cols])
+    n_values = len(SAATY_SCALE)
+    rows = np.repeat(rows, n_values)
+    cols = np.repeat(cols, n_values)
+    values = np.tile(np.arange(n_values), len(current))
+    changed = values != np.repeat(current, n_values)
+    return rows[changed], cols[changed], SAATY_SCALE[values[changed]]
+
+
+def _edited_lambda_approximate(
+    matrix: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray
+) -> np.ndarray:
+    """λmax of every edited matrix under column-normalise-and-average weights"""
+    n = len(matrix)
+    col_sums = matrix.sum(axis=0)
+    weights = (matrix / col_sums).mean(axis=1)
+
+    # a_ij sits in column j, its reciprocal a_ji in column i
+    delta_ij = values - matrix[rows, cols]
+    delta_ji = 1 / values - matrix[cols, rows]
+    new_sum_j = col_sums[cols] + delta_ij
+    new_sum_i = col_sums[rows] + delta_ji
+
+    candidates = np.arange(len(values))
+    new_weights = (weights
+                   + (matrix[:, rows].T * (1 / new_sum_i - 1 / col_sums[rows])[:, np.newaxis]
+                      + matrix[:, cols].T * (1 / new_sum_j - 1 / col_sums[cols])[:, np.newaxis]) / n)
+    new_weights[candidates, rows] += delta_ij / new_sum_j / n
+    new_weights[candidates, cols] += delta_ji / new_sum_i / n
+
+    weighted_sums = new_weights @ matrix.T
+    weighted_sums[candidates, rows] += delta_ij * new_weights[candidates, cols]
+    weighted_sums[candidates, cols] += delta_ji * new_weights[candidates, rows]
+    return (weighted_sums / new_weights).mean(axis=1)
+
+
+def _edited_lambda_exact(
+    matrix: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray,
+    method: str
+) -> np.ndarray:
+    """λmax of every edited matrix, solving the weights of the whole stack"""
+    candidates = np.arange(len(values))
+    stack = np.repeat(matrix[np.newaxis], len(values), axis=0)
+    stack[candidates, rows, cols] = values
+    stack[candidates, cols, rows] = 1 / values
+    if method == 'eigenvector':
+        weights, _ = eigenvector_weights(matrix)
+        new_weights, _ = eigenvector_weights(stack, tol=1e-9, initial_weights=np.tile(weights, (len(values), 1)))
+    else:
+        new_weights = derive_weights(stack, method)
+    return (np.einsum('bij,bj->bi', stack, new_weights) / new_weights).mean(axis=1)
+
+
+def evaluate_edits(
+    matrix: np.ndarray,
+    method: str = 'approximate',
+    ri: Optional[float] = None,
+    frozen: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Consistency Ratio after every single Saaty-scale edit.
+
+    With methods other than 'approximate' only the `EXACT_SHORTLIST` most
+    promising edits are returned.
+
+    Args:
+        matrix (np.ndarray): (n, n) pairwise comparison matrix
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        ri (float, optional): Random Index; `random_index(n)` when omitted
+        frozen (np.ndarray, optional): (n, n) boolean mask of judgments not to edit
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            - Row i of each edit (always above the diagonal)
+            - Column j of each edit
+            - New value of a_ij
+            - Consistency Ratio of the edited matrix
+    """
+    if method not in WEIGHT_METHODS:
+        raise ValueError(f"Unknown weight method '{method}', expected one of {WEIGHT_METHODS}")
+    matrix = np.asarray(matrix, dtype=float)
+    n = len(matrix)
+    ri = random_index(n) if ri is None else ri
+    if frozen is None:
+        frozen = np.zeros((n, n), dtype=bool)
+
+    rows, cols, values = _candidate_edits(matrix, frozen)
+    lambda_max = _edited_lambda_approximate(matrix, rows, cols, values)
+    if method != 'approximate':
+        shortlist = np.argsort(lambda_max)[:EXACT_SHORTLIST]
+        rows, cols, values = rows[shortlist], cols[shortlist], values[shortlist]
+        lambda_max = _edited_lambda_exact(matrix, rows, cols, values, method)
+    CI = (lambda_max - n) / (n - 1)
+    CR = CI / ri if ri else np.zeros_like(CI)
+    return rows, cols, values, CR
+
+
+def consistency_ratio(matrix: np.ndarray, method: str = 'approximate', ri: Optional[float] = None) -> float:
+    """Consistency Ratio of one matrix, as computed by `AHPCalculator`"""
+    matrix = np.asarray(matrix, dtype=float)
+    n = len(matrix)
+    ri = random_index(n) if ri is None else ri
+    _, weights = normalize_matrix(matrix, method)
+    CI = ((matrix @ weights / weights).mean() - n) / (n - 1)
+    return float(CI / ri) if ri else 0.0
+
+
+def suggest_repair(
+    matrix: np.ndarray,
+    threshold: float = CR_THRESHOLD,
+    method: str = 'approximate',
+    ri: Optional[float] = None,
+    max_edits: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Propose Saaty-scale judgment changes that make a matrix consistent.
+
+    Greedy search: while CR >= `threshold`, apply the single edit with the
+    lowest resulting CR. When several edits reach the threshold in the same
+    step, the one moving the judgment fewest scale steps is chosen, to stay
+    close to the expert's intent. Each judgment is edited at most once.
+
+    Args:
+        matrix (np.ndarray): (n, n) pairwise comparison matrix
+        threshold (float): Consistency Ratio to get below
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        ri (float, optional): Random Index; `random_index(n)` when omitted
+        max_edits (int, optional): Most edits to propose; n(n-1)/2 by default
+
+    Returns:
+        Dict[str, Any]:
+            - matrix: Repaired matrix
+            - edits: List of {row, column, old, new, CR} in the order applied,
+              with CR the ratio after that edit
+            - CR_before: Consistency Ratio of the input
+            - CR: Consistency Ratio after all edits
+            - is_consistent: Whether CR < threshold
+    """
+    matrix = np.array(matrix, dtype=float)
+    n = len(matrix)
+    max_edits = n * (n - 1) // 2 if max_edits is None else max_edits
+    CR = CR_before = consistency_ratio(matrix, method, ri)
+    frozen = np.zeros((n, n), dtype=bool)
+    edits = []
+
+    while CR >= threshold and len(edits) < max_edits:
+        rows, cols, values, candidate_CR = evaluate_edits(matrix, method, ri, frozen)
+        if len(values) == 0:
+            break
+        passing = np.flatnonzero(candidate_CR < threshold)
+        if len(passing):
+            steps = np.abs(nearest_scale_index(values[passing])
+                           - nearest_scale_index(matrix[rows[passing], cols[passing]]))
+            best = passing[np.lexsort((candidate_CR[passing], steps))[0]]
+        else:
+            best = int(np.argmin(candidate_CR))
+            if candidate_CR[best] >= CR:
+                break
+
+        i, j, value = int(rows[best]), int(cols[best]), float(values[best])
+        edits.append({'row': i, 'column': j, 'old': float(matrix[i, j]), 'new': value,
+                      'CR': float(candidate_CR[best])})
+        matrix[i, j], matrix[j, i] = value, 1 / value
+        frozen[i, j] = frozen[j, i] = True
+        CR = consistency_ratio(matrix, method, ri)
+        edits[-1]['CR'] = CR
+
+    return {
+        'matrix': matrix,
+        'edits': edits,
+        'CR_before': CR_before,
+        'CR': CR,
+        'is_consistent': CR < threshold,
+    }
@@ -0,0 +1,165 @@
+"""
+Headless single-applicant scoring with a fast cold start
+
+For short-lived batch jobs and serverless-style workers that score a handful
+of applicants per process. Only `ahp_model` (NumPy) is imported up front: the
+compiled `ScoringModel` is read straight from the model artifact, once its
+content hash matches the default matrices, and `AHPCalculator` (to rebuild a
+missing or stale artifact) and the questionnaire (for answer labels) are
+imported on first use. Importing this module has no side effects; the model
+is loaded and cached on the first call.
+
+Input is a JSON object with either "scores" (sub-criterion scores keyed by
+criterion) or "answers" (option labels keyed by question id), given with
+--scores / --answers or as one object per line on stdin. Each decision is
+printed as one JSON line.
+
+Usage:
+    python ahp_score.py --scores '{"U1A1": 3, "U1A2": 4, ...}'
+    python ahp_score.py --answers '{"u1_q1": "...", ...}'
+    python ahp_score.py < applicants.jsonl > decisions.jsonl
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from ahp_model import (
+    DEFAULT_ARTIFACT_PATH,
+    ELIGIBILITY_THRESHOLD,
+    ScoringModel,
+    default_content_hash,
+    load_artifact
+)
+
+# Model and version per artifact path, filled on first use
+_models: Dict[str, Tuple[ScoringModel, str]] = {}
+
+
+def load_model(artifact_path: str = DEFAULT_ARTIFACT_PATH) -> Tuple[ScoringModel, str]:
+    """
+    Load the compiled scoring model, rebuilding the artifact if it is
+    missing or was not built from the default matrices.
+
+    Args:
+        artifact_path (str): Model artifact file
+
+    Returns:
+        Tuple[ScoringModel, str]:
+            - Compiled model
+            - Model version (first 12 hex digits of its content hash)
+
+    Raises:
+        RuntimeError: If the model's matrices are inconsistent
+    """
+    cached = _models.get(artifact_path)
+    if cached is not None:
+        return cached
+
+    artifact = load_artifact(artifact_path, default_content_hash())
+    if artifact is not None:
+        model, version = artifact['model'], artifact['content_hash'][:12]
+    else:
+        from ahp_calculation import AHPCalculator
+        calculator = AHPCalculator(artifact_path=artifact_path)
+        model, version = calculator.model, calculator.model_version
+    if model is None:
+        raise RuntimeError("Cannot calculate score: Inconsistent matrices")
+
+    _models[artifact_path] = model, version
+    return model, version
+
+
+def check_eligibility(
+    scores: Dict[str, float],
+    artifact_path: str = DEFAULT_ARTIFACT_PATH,
+    threshold: float = ELIGIBILITY_THRESHOLD
+) -> Dict[str, Any]:
+    """
+    Score one applicant, like `AHPCalculator.check_eligibility`.
+
+    Args:
+        scores (Dict[str, float]): Sub-criterion scores keyed by criterion name
+        artifact_path (str): Model artifact file
+        threshold (float): Eligibility cutoff in percent
+
+    Returns:
+        Dict[str, Any]: score, eligible, message and model_version
+
+    Raises:
+        KeyError: If a criterion is not part of the model
+        ValueError: If a score is missing (None), NaN or infinite
+    """
+    model, version = load_model(artifact_path)
+    score = model.score(scores)
+    eligible = score >= threshold
+    return {
+        'score': score,
+        'eligible': eligible,
+        'message': 'Eligible for loan' if eligible else 'Not eligible for loan',
+        'model_version': version,
+    }
+
+
+def check_answers(
+    answers: Dict[str, str],
+    artifact_path: str = DEFAULT_ARTIFACT_PATH,
+    threshold: float = ELIGIBILITY_THRESHOLD
+) -> Dict[str, Any]:
+    """Score one applicant from the option labels of the app_frontend questionnaire"""
+    from questionnaire import FRONTEND_QUESTIONNAIRE
+    return check_eligibility(FRONTEND_QUESTIONNAIRE.score_dict(answers), artifact_path, threshold)
+
+
+def decide(request: Dict[str, Any], artifact_path: str, threshold: float) -> Dict[str, Any]:
+    """Score one request object holding either "scores" or "answers\""""
+    if not isinstance(request, dict):
+        raise ValueError("Expected a JSON object")
+    for key, check in (('scores', check_eligibility), ('answers', check_answers)):
+        if key in request:
+            if not isinstance(request[key], dict):
+                raise ValueError(f"Expected '{key}' to be a JSON object")
+            return check(request[key], artifact_path, threshold)
+    raise ValueError("Expected a 'scores' or 'answers' object")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Score applicants with the compiled AHP model.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scores", help="JSON object of sub-criterion scores")
+    source.add_argument("--answers", help="JSON object of questionnaire answers")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH, help="model artifact file")
+    parser.add_argument("--threshold", type=float, default=ELIGIBILITY_THRESHOLD,
+                        help=f"eligibility cutoff in percent (default {ELIGIBILITY_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    if args.scores is not None:
+        requests = [{'scores': args.scores}]
+    elif args.answers is not None:
+        requests = [{'answers': args.answers}]
+    else:
+        requests = (line for line in sys.stdin if line.strip())
+
+    status = 0
+    for request in requests:
+        try:
+            if isinstance(request, str):
+                request = json.loads(request)
+            else:
+                request = {key: json.loads(value) for key, value in request.items()}
+            decision = decide(request, args.artifact, args.threshold)
+        except KeyError as e:
+            decision, status = {'error': f"Unknown criteria {e}"}, 1
+        except (TypeError, ValueError) as e:
+            decision, status = {'error': str(e)}, 1
+        except RuntimeError as e:
+            print(json.dumps({'error': str(e)}))
+            return 1
+        print(json.dumps(decision))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Monte Carlo sensitivity analysis for AHP weights and loan eligibility
+
+Before a judgment in the U1-U4 matrices or the eligibility cutoff is changed,
+this engine measures how stable the current decisions are. Each sample moves
+every pairwise judgment of a calculator by a random number of steps along
+Saaty's scale. Samples where any matrix fails the CR < 0.1 check are dropped,
+and the rest are compiled into global weight vectors. A reference portfolio is
+re-scored under every accepted sample, and the engine counts how often each
+applicant's eligibility flips.
+
+Samples are drawn in fixed-size blocks, each seeded from its own child of one
+`np.random.SeedSequence`. Results are therefore identical for a given seed
+and block size however many worker processes share the blocks. The last block
+is drawn in full and cut to the requested sample count, so sample i is the
+same whatever `n_samples` is.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ahp_calculation import ELIGIBILITY_THRESHOLD, AHPCalculator
+from ahp_core import (
+    SAATY_SCALE,
+    consistency_check_batch,
+    nearest_scale_index,
+    normalize_matrix_batch
+)
+from ahp_model import MAX_SUB_SCORE
+
+DEFAULT_BLOCK_SIZE = 1000
+
+# Applicants scored at a time, bounding the (samples x applicants) score block
+APPLICANT_CHUNK = 8192
+
+# Block runner created once by each worker process
+_worker_runner = None
+
+
+def perturb_matrix(
+    matrix: np.ndarray,
+    n_samples: int,
+    rng: np.random.Generator,
+    max_step: int = 1
+) -> np.ndarray:
+    """
+    Draw random variations of a pairwise comparison matrix.
+
+    Every judgment above the diagonal is snapped to Saaty's scale and moved
+    by a uniform random number of steps in [-max_step, max_step], staying
+    within 1/9 ... 9. The lower triangle is filled in reciprocally.
+
+    Args:
+        matrix (np.ndarray): (n, n) pairwise comparison matrix
+        n_samples (int): Number of variations to draw
+        rng (np.random.Generator): Random number generator
+        max_step (int): Largest move along the scale, in steps
+
+    Returns:
+        np.ndarray: (n_samples, n, n) perturbed reciprocal matrices
+    """
+    n = len(matrix)
+    upper = np.triu_indices(n, 1)
+    base_index = nearest_scale_index(np.asarray(matrix)[upper])
+    steps = rng.integers(-max_step, max_step + 1, size=(n_samples, len(base_index)))
+    values = SAATY_SCALE[np.clip(base_index + steps, 0, len(SAATY_SCALE) - 1)]
+
+    samples = np.ones((n_samples, n, n))
+    samples[:, upper[0], upper[1]] = values
+    samples[:, upper[1], upper[0]] = 1 / values
+    return samples
+
+
+class _BlockRunner:
+    """Draws and evaluates one block of samples; shared by all execution modes"""
+
+    def __init__(self, matrices, main_weights, method, seed, n_samples, block_size, max_step,
+                 portfolio, columns, base_eligible, threshold):
+        self.matrices = matrices
+        self.main_weights = main_weights
+        self.method = method
+        self.seed = seed
+        self.n_samples = n_samples
+        self.block_size = block_size
+        self.max_step = max_step
+        self.portfolio = portfolio
+        self.columns = columns
+        self.base_eligible = base_eligible
+        self.threshold = threshold
+
+    def global_weights(self, block_index: int) -> np.ndarray:
+        """Global weight vectors of the accepted samples in one block"""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(block_index,)))
+        accepted = np.ones(self.block_size, dtype=bool)
+        group_weights = []
+        for category, matrix in self.matrices.items():
+            samples = perturb_matrix(matrix, self.block_size, rng, self.max_step)
+            _, weights = normalize_matrix_batch(samples, self.method)
+            _, _, CR = consistency_check_batch(samples, weights)
+            accepted &= CR < 0.1
+            group_weights.append(weights * self.main_weights[category])
+        # Drop the samples of the last block beyond n_samples
+        accepted[self.n_samples - block_index * self.block_size:] = False
+        return np.concatenate(group_weights, axis=1)[accepted]
+
+    def __call__(self, block_index: int):
+        weights = self.global_weights(block_index)
+        flips = np.zeros(len(self.portfolio), dtype=np.int64)
+        if len(weights):
+            selected = weights[:, self.columns]
+            # Fold the percentage normaliser of every sample into its weights
+            selected *= (100 / (MAX_SUB_SCORE * selected.sum(axis=1)))[:, np.newaxis]
+            for start in range(0, len(self.portfolio), APPLICANT_CHUNK):
+                stop = start + APPLICANT_CHUNK
+                eligible = (self.portfolio[start:stop] @ selected.T) >= self.threshold
+                flips[start:stop] = (eligible != self.base_eligible[start:stop, np.newaxis]).sum(axis=1)
+        return len(weights), flips, weights.sum(axis=0), np.square(weights).sum(axis=0)
+
+
+def _init_worker(*args):
+    global _worker_runner
+    _worker_runner = _BlockRunner(*args)
+
+
+def _run_block(block_index: int):
+    return _worker_runner(block_index)
+
+
+def run_sensitivity(
+    calculator: AHPCalculator,
+    portfolio: np.ndarray,
+    criteria: Optional[Sequence[str]] = None,
+    n_samples: int = 10_000,
+    seed: int = 0,
+    max_step: int = 1,
+    threshold: float = ELIGIBILITY_THRESHOLD,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: int = 1
+) -> Dict[str, Any]:
+    """
+    Measure how stable eligibility decisions are under perturbed judgments.
+
+    Args:
+        calculator (AHPCalculator): Calculator whose matrices are perturbed
+        portfolio (np.ndarray): (A x k) sub-criterion scores of the reference
+            applicants, one column per criterion in `criteria`
+        criteria (Sequence[str], optional): Criterion of each portfolio
+            column; defaults to all of the calculator's criteria
+        n_samples (int): Perturbed samples to draw, before the CR filter
+        seed (int): Random seed
+        max_step (int): Largest move of a judgment along Saaty's scale
+        threshold (float): Eligibility cutoff in percent
+        block_size (int): Samples drawn and scored at a time
+        workers (int): Worker processes sharing the blocks; 1 runs in-process
+
+    Returns:
+        Dict[str, Any]:
+            - n_samples: Samples drawn, as requested
+            - n_accepted: Samples passing CR < 0.1 in every matrix
+            - criteria: All criteria, in the order of the weight statistics
+            - weight_mean, weight_std: Global weight statistics over accepted samples
+            - base_score, base_eligible: (A,) decisions under the current weights
+            - flip_count: (A,) accepted samples that change each applicant's eligibility
+            - flip_rate: (A,) flip_count / n_accepted
+
+    Raises:
+        ValueError: If the matrices are inconsistent, or `n_samples` or
+            `block_size` is below 1
+    """
+    if n_samples < 1 or block_size < 1:
+        raise ValueError(f"n_samples and block_size must be at least 1, got {n_samples} and {block_size}")
+    if calculator.model is None:
+        raise ValueError("Cannot run sensitivity analysis: Inconsistent matrices")
+    model = calculator.model
+    criteria = model.criteria if criteria is None else tuple(criteria)
+    portfolio = np.asarray(portfolio, dtype=float)
+    base_score = model.score_batch(portfolio, criteria)
+    base_eligible = base_score >= threshold
+
+    columns = [model.criteria.index(c) for c in criteria]
+    runner_args = (calculator.matrices, calculator.main_weights, calculator.method, seed,
+                   n_samples, block_size, max_step, portfolio, columns, base_eligible, threshold)
+
+    n_blocks = -(-n_samples // block_size)
+    n_accepted = 0
+    flip_count = np.zeros(len(portfolio), dtype=np.int64)
+    weight_sum = np.zeros(len(model))
+    weight_square_sum = np.zeros(len(model))
+
+    def accumulate(blocks):
+        nonlocal n_accepted
+        # Blocks arrive in index order, so the float sums are reproducible
+        for accepted, flips, block_weight_sum, block_weight_square_sum in blocks:
+            n_accepted += accepted
+            flip_count[:] += flips
+            weight_sum[:] += block_weight_sum
+            weight_square_sum[:] += block_weight_square_sum
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=runner_args) as executor:
+            accumulate(executor.map(_run_block, range(n_blocks)))
+    else:
+        runner = _BlockRunner(*runner_args)
+        accumulate(runner(i) for i in range(n_blocks))
+
+    weight_mean = weight_sum / max(n_accepted, 1)
+    weight_var = np.clip(weight_square_sum / max(n_accepted, 1) - weight_mean ** 2, 0, None)
+
+    return {
+        'n_samples': n_samples,
+        'n_accepted': int(n_accepted),
+        'criteria': model.criteria,
+        'weight_mean': weight_mean,
+        'weight_std': np.sqrt(weight_var),
+        'base_score': base_score,
+        'base_eligible': base_eligible,
+        'flip_count': flip_count,
+        'flip_rate': flip_count / max(n_accepted, 1),
+    }
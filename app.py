@@ -3,24 +3,69 @@ Streamlit interface for AHP-based Credit Scoring System
 
 This script provides a web interface for the Analytic Hierarchy Process (AHP)
 implementation using Streamlit. It allows users to:
-1. Input main criteria and sub-criteria
-2. Perform pairwise comparisons
+1. Input main criteria and sub-criteria, split into further levels as needed
+2. Perform pairwise comparisons, one question per pair, in an editable grid or
+   from an uploaded CSV/JSON file of matrices
 3. Input scores for each criterion
 4. Calculate final credit scores and determine loan qualification
 
 The interface handles user input validation and provides immediate feedback
-on the consistency of pairwise comparisons.
+on the consistency of pairwise comparisons. Grid and uploaded matrices are
+validated in one vectorized pass, with invalid cells highlighted. Matrix
+analyses are cached by the content hash of each matrix, so a rerun only
+recomputes the matrices that actually changed.
 """
 
+import hashlib
+import io
+import json
+from typing import Optional, Tuple
 import streamlit as st
 import numpy as np
 import pandas as pd
 from ahp_core import (
+    WEIGHT_METHODS,
+    complete_reciprocals,
+    validate_matrices,
     normalize_matrix, 
     consistency_check, 
     calculate_final_score,
     calculate_standardized_score
 )
+from ahp_repair import suggest_repair
+
+# Matrix analyses kept across reruns; the least recently used are evicted first
+ANALYSIS_CACHE_SIZE = 256
+
+# Ways of entering pairwise comparisons
+ENTRY_MODES = ("One question per pair", "Editable grid", "Upload CSV/JSON")
+
+# Background of cells failing validation
+INVALID_CELL_STYLE = 'background-color: #f8d7da'
+
+# Description of each check of `validate_matrices`
+VALIDATION_MESSAGES = {
+    'missing': "missing",
+    'not_positive': "not positive",
+    'out_of_scale': "outside Saaty's scale (1/9 to 9)",
+    'diagonal': "on the diagonal but not 1",
+    'not_reciprocal': "not reciprocal (a_ij × a_ji ≠ 1)",
+}
+
+def matrix_content_hash(matrix: np.ndarray) -> str:
+    """
+    Hash the shape and values of a matrix.
+    
+    Args:
+        matrix (np.ndarray): Pairwise comparison matrix
+        
+    Returns:
+        str: Hex digest identifying the matrix contents
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=float)
+    digest = hashlib.blake2b(str(matrix.shape).encode(), digest_size=16)
+    digest.update(matrix.tobytes())
+    return digest.hexdigest()
 
 def create_criteria_matrix(criteria_names: list, prefix: str) -> np.ndarray:
     """
@@ -51,10 +96,211 @@ def create_criteria_matrix(criteria_names: list, prefix: str) -> np.ndarray:
     
     return matrix
 
+@st.cache_data(show_spinner=False)
+def parse_matrix_file(data: bytes, file_name: str) -> dict:
+    """
+    Read pairwise comparison matrices from an uploaded file.
+    
+    JSON files map each matrix key to a list of rows. CSV files hold one
+    judgment per line with the columns matrix, row, column and value (0-based
+    indices). Matrix keys are the widget prefixes: "main" for the main
+    criteria and "sub_<criterion>" (then "sub_<criterion>_<sub-criterion>"
+    and so on) below it. Judgments left out or null are filled in from their
+    reciprocals.
+    
+    Args:
+        data (bytes): File contents
+        file_name (str): File name, whose extension selects the format
+        
+    Returns:
+        dict: (n, n) matrix per key, NaN where a judgment is missing
+        
+    Raises:
+        ValueError: If the file cannot be parsed
+    """
+    if file_name.lower().endswith('.json'):
+        raw = json.loads(data)
+        if not isinstance(raw, dict):
+            raise ValueError("Expected a JSON object mapping matrix keys to rows")
+        matrices = {str(key): np.array(rows, dtype=float) for key, rows in raw.items()}
+    else:
+        table = pd.read_csv(io.BytesIO(data))
+        missing_columns = {'matrix', 'row', 'column', 'value'} - set(table.columns)
+        if missing_columns:
+            raise ValueError(f"Missing CSV columns {sorted(missing_columns)}")
+        matrices = {}
+        for key, judgments in table.groupby('matrix', sort=False):
+            rows = judgments['row'].to_numpy(dtype=int)
+            cols = judgments['column'].to_numpy(dtype=int)
+            if (rows < 0).any() or (cols < 0).any():
+                raise ValueError(f"Matrix '{key}' has negative row or column indices")
+            n = int(max(rows.max(), cols.max())) + 1
+            matrix = np.full((n, n), np.nan)
+            matrix[rows, cols] = judgments['value'].to_numpy(dtype=float)
+            matrices[str(key)] = matrix
+    
+    for key, matrix in matrices.items():
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Matrix '{key}' is not square")
+    return {key: complete_reciprocals(matrix) for key, matrix in matrices.items()}
+
+def edit_criteria_matrix(criteria_names: list, prefix: str) -> np.ndarray:
+    """
+    Enter a pairwise comparison matrix in one editable grid.
+    
+    The grid starts with ones above the diagonal and empty cells below it;
+    empty cells are filled in from their reciprocals.
+    
+    Args:
+        criteria_names (list): List of criterion names
+        prefix (str): Prefix for Streamlit widget keys
+        
+    Returns:
+        np.ndarray: Entered matrix with reciprocals filled in
+    """
+    n = len(criteria_names)
+    initial = np.where(np.tri(n, k=-1, dtype=bool), np.nan, 1.0)
+    edited = st.data_editor(
+        pd.DataFrame(initial, index=criteria_names, columns=criteria_names),
+        key=f"{prefix}_grid"
+    )
+    return complete_reciprocals(edited.to_numpy(dtype=float))
+
+def enter_criteria_matrix(
+    criteria_names: list,
+    prefix: str,
+    entry_mode: str = ENTRY_MODES[0],
+    uploaded: Optional[dict] = None
+) -> Optional[np.ndarray]:
+    """
+    Get a pairwise comparison matrix in the chosen entry mode.
+    
+    Grid and uploaded matrices are validated with `validate_matrices`; an
+    invalid matrix is shown with the failing cells highlighted.
+    
+    Args:
+        criteria_names (list): List of criterion names
+        prefix (str): Prefix for Streamlit widget keys, and the key of the
+            uploaded matrix
+        entry_mode (str): One of `ENTRY_MODES`
+        uploaded (dict, optional): Matrices from `parse_matrix_file`
+        
+    Returns:
+        Optional[np.ndarray]: Pairwise comparison matrix, None while it is invalid
+    """
+    if entry_mode == ENTRY_MODES[0]:
+        return create_criteria_matrix(criteria_names, prefix)
+    
+    n = len(criteria_names)
+    matrix = (uploaded or {}).get(prefix) if entry_mode == ENTRY_MODES[2] else None
+    if matrix is not None and matrix.shape != (n, n):
+        st.warning(f"Uploaded matrix '{prefix}' is {matrix.shape[0]}x{matrix.shape[1]}, "
+                   f"but there are {n} criteria.")
+        matrix = None
+    if matrix is None:
+        if entry_mode == ENTRY_MODES[2]:
+            st.info(f"No uploaded matrix '{prefix}'; enter it here instead.")
+        matrix = edit_criteria_matrix(criteria_names, prefix)
+    
+    errors = validate_matrices(matrix)
+    invalid = np.logical_or.reduce(list(errors.values()))
+    if invalid.any():
+        problems = ", ".join(f"{int(mask.sum())} {VALIDATION_MESSAGES[check]}"
+                             for check, mask in errors.items() if mask.any())
+        st.error(f"Invalid judgments: {problems}. Fix the highlighted cells.")
+        st.dataframe(
+            pd.DataFrame(matrix, index=criteria_names, columns=criteria_names)
+            .style.apply(lambda _: np.where(invalid, INVALID_CELL_STYLE, ''), axis=None)
+        )
+        return None
+    return matrix
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_SIZE, show_spinner=False)
+def analyse_matrix(
+    matrix_hash: str,
+    criteria_names: tuple,
+    method: str,
+    _matrix: np.ndarray
+):
+    """
+    Normalize a matrix, check its consistency and build its display tables.
+    
+    Cached on `matrix_hash`, the criteria names and the method; `_matrix`
+    itself is not hashed by Streamlit.
+    
+    Args:
+        matrix_hash (str): `matrix_content_hash` of the matrix
+        criteria_names (tuple): Criterion names labelling the tables
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        _matrix (np.ndarray): Pairwise comparison matrix
+        
+    Returns:
+        Tuple[pd.DataFrame, pd.Series, float, float, float]:
+            - Normalized matrix table
+            - Weights table
+            - λmax, CI and CR
+    """
+    normalized_matrix, weights = normalize_matrix(_matrix, method)
+    lambda_max, CI, CR = consistency_check(_matrix, weights)
+    criteria_names = list(criteria_names)
+    normalized_table = pd.DataFrame(
+        normalized_matrix,
+        columns=criteria_names,
+        index=criteria_names
+    )
+    return normalized_table, pd.Series(weights, index=criteria_names), lambda_max, CI, CR
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_SIZE, show_spinner=False)
+def repair_matrix(matrix_hash: str, method: str, _matrix: np.ndarray) -> dict:
+    """
+    Suggest judgment changes for an inconsistent matrix, cached like `analyse_matrix`.
+    
+    Args:
+        matrix_hash (str): `matrix_content_hash` of the matrix
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        _matrix (np.ndarray): Pairwise comparison matrix
+        
+    Returns:
+        dict: Result of `ahp_repair.suggest_repair`
+    """
+    return suggest_repair(_matrix, method=method)
+
+def format_judgment(value: float) -> str:
+    """Show a judgment as Saaty writes it, e.g. '3' or '1/3'"""
+    if value >= 1:
+        return f"{value:g}"
+    return f"1/{1 / value:g}"
+
+def display_repair_suggestions(matrix: np.ndarray, criteria_names: list, method: str):
+    """
+    List the judgment changes that would make a matrix consistent.
+    
+    Args:
+        matrix (np.ndarray): Inconsistent pairwise comparison matrix
+        criteria_names (list): List of criterion names
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+    """
+    repair = repair_matrix(matrix_content_hash(matrix), method, matrix)
+    if not repair['edits']:
+        return
+    
+    st.write("Suggested changes to reach CR < 0.1:" if repair['is_consistent']
+             else "Closest the suggested changes get to CR < 0.1:")
+    st.table(pd.DataFrame([
+        {
+            'Comparison': f"{criteria_names[edit['row']]} vs {criteria_names[edit['column']]}",
+            'Current': format_judgment(edit['old']),
+            'Suggested': format_judgment(edit['new']),
+            'CR after change': round(edit['CR'], 4),
+        }
+        for edit in repair['edits']
+    ]))
+
 def display_matrix_analysis(
     matrix: np.ndarray,
     criteria_names: list,
-    section_name: str
+    section_name: str,
+    method: str = 'approximate'
 ):
     """
     Display the normalized matrix, weights, and consistency analysis.
@@ -63,21 +309,21 @@ def display_matrix_analysis(
         matrix (np.ndarray): Pairwise comparison matrix
         criteria_names (list): List of criterion names
         section_name (str): Name of the section for display purposes
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
     """
-    normalized_matrix, weights = normalize_matrix(matrix)
+    normalized_table, weights_table, lambda_max, CI, CR = analyse_matrix(
+        matrix_content_hash(matrix),
+        tuple(criteria_names),
+        method,
+        matrix
+    )
     
     st.subheader(f"Normalized {section_name} Matrix")
-    st.dataframe(pd.DataFrame(
-        normalized_matrix,
-        columns=criteria_names,
-        index=criteria_names
-    ))
+    st.dataframe(normalized_table)
     
     st.subheader(f"{section_name} Weights")
-    st.write(pd.Series(weights, index=criteria_names))
+    st.write(weights_table)
     
-    # Perform consistency check
-    lambda_max, CI, CR = consistency_check(matrix, weights)
     st.subheader("Consistency Check")
     st.write(f"λ_max: {lambda_max:.4f}, CI: {CI:.4f}, CR: {CR:.4f}")
     
@@ -85,8 +331,79 @@ def display_matrix_analysis(
         st.success("The pairwise comparisons are consistent!")
     else:
         st.warning("The pairwise comparisons are inconsistent. Please review your inputs.")
+        display_repair_suggestions(matrix, criteria_names, method)
+    
+    return weights_table.to_numpy()
+
+def define_sub_criteria(
+    criterion: str,
+    key: str,
+    method: str,
+    entry_mode: str = ENTRY_MODES[0],
+    uploaded: Optional[dict] = None
+) -> Optional[Tuple[list, list, list]]:
+    """
+    Collect the sub-criteria of a criterion, recursing into any that are split further.
+    
+    Args:
+        criterion (str): Name of the criterion being split
+        key (str): Path of the criterion, unique across the tree, for widget keys
+        method (str): Weight derivation method, one of `WEIGHT_METHODS`
+        entry_mode (str): How pairwise comparisons are entered, one of `ENTRY_MODES`
+        uploaded (dict, optional): Matrices from `parse_matrix_file`
+        
+    Returns:
+        Optional[Tuple[list, list, list]]: None if a matrix in the subtree is
+        invalid, otherwise
+            - Leaf criteria below `criterion`
+            - Weight of every leaf, relative to `criterion`
+            - Score of every leaf
+    """
+    sub_criteria = st.text_input(
+        f"Enter sub-criteria for {criterion} (comma-separated):",
+        key=f"sub_{key}"
+    ).split(",")
+    
+    sub_matrix = enter_criteria_matrix(sub_criteria, f"sub_{key}", entry_mode, uploaded)
+    if sub_matrix is None:
+        return None
+    sub_weights = display_matrix_analysis(
+        sub_matrix,
+        sub_criteria,
+        f"Sub-Criteria for {criterion}",
+        method
+    )
+    
+    leaves = []
+    leaf_weights = []
+    scores = []
+    complete = True
+    for sub, weight in zip(sub_criteria, sub_weights):
+        sub_key = f"{key}_{sub}"
+        if st.checkbox(f"Define sub-criteria for {sub}", key=f"define_{sub_key}"):
+            subtree = define_sub_criteria(sub, sub_key, method, entry_mode, uploaded)
+            # Keep rendering the other sub-criteria, but report the subtree as invalid
+            if subtree is None:
+                complete = False
+                continue
+            sub_leaves, sub_leaf_weights, sub_scores = subtree
+            leaves.extend(sub_leaves)
+            leaf_weights.extend(weight * leaf_weight for leaf_weight in sub_leaf_weights)
+            scores.extend(sub_scores)
+        else:
+            score = st.number_input(
+                f"Enter the score for {sub} (1 to 5):",
+                min_value=1.0,
+                max_value=5.0,
+                value=3.0,
+                step=0.1,
+                key=f"score_{sub_key}"
+            )
+            leaves.append(sub)
+            leaf_weights.append(weight)
+            scores.append(score)
     
-    return weights
+    return (leaves, leaf_weights, scores) if complete else None
 
 def display_final_scores(Z: float, H: float):
     """
@@ -117,6 +434,29 @@ def main():
         - **U4** = Relationship
         """)
 
+    method = st.selectbox(
+        "Weight derivation method:",
+        WEIGHT_METHODS,
+        help="'approximate' averages the normalized columns; "
+             "'geometric_mean' and 'llsm' (logarithmic least squares) use row geometric means; "
+             "'eigenvector' uses Saaty's principal eigenvector."
+    )
+    
+    entry_mode = st.radio("Pairwise comparison entry:", ENTRY_MODES, horizontal=True)
+    uploaded = {}
+    if entry_mode == ENTRY_MODES[2]:
+        matrix_file = st.file_uploader(
+            "Pairwise comparison matrices",
+            type=['csv', 'json'],
+            help='JSON: {"main": [[1, 3], [0.333, 1]], "sub_U1": [...]}. '
+                 "CSV: columns matrix,row,column,value with 0-based indices."
+        )
+        if matrix_file is not None:
+            try:
+                uploaded = parse_matrix_file(matrix_file.getvalue(), matrix_file.name)
+            except ValueError as e:
+                st.error(f"Could not read {matrix_file.name}: {e}")
+
     # Step 1: Main Criteria Input
     main_criteria = st.text_input(
         "Enter main criteria (comma-separated):",
@@ -125,53 +465,41 @@ def main():
     
     if len(main_criteria) > 1:
         st.subheader("Pairwise Comparison for Main Criteria")
-        main_matrix = create_criteria_matrix(main_criteria, "main")
+        main_matrix = enter_criteria_matrix(main_criteria, "main", entry_mode, uploaded)
+        if main_matrix is None:
+            return
         main_weights = display_matrix_analysis(
             main_matrix,
             main_criteria,
-            "Main Criteria"
+            "Main Criteria",
+            method
         )
         
-        # Step 2: Sub-Criteria and Score Calculation
-        total_weighted_scores = 0
-        total_weights = 0
+        # Step 2: Sub-Criteria (to any depth) and Score Calculation. Local
+        # weights are multiplied down each path into one global weight per leaf
+        leaves = []
+        leaf_weights = []
+        scores = []
+        complete = True
         
-        for criterion in main_criteria:
+        for criterion, main_weight in zip(main_criteria, main_weights):
             if st.checkbox(f"Define sub-criteria for {criterion}"):
-                sub_criteria = st.text_input(
-                    f"Enter sub-criteria for {criterion} (comma-separated):",
-                    key=f"sub_{criterion}"
-                ).split(",")
-                
-                sub_matrix = create_criteria_matrix(sub_criteria, f"sub_{criterion}")
-                sub_weights = display_matrix_analysis(
-                    sub_matrix,
-                    sub_criteria,
-                    f"Sub-Criteria for {criterion}"
-                )
-                
-                # Collect scores for sub-criteria
-                scores = []
-                for sub in sub_criteria:
-                    score = st.number_input(
-                        f"Enter the score for {sub} (1 to 5):",
-                        min_value=1.0,
-                        max_value=5.0,
-                        value=3.0,
-                        step=0.1,
-                        key=f"score_{criterion}_{sub}"
-                    )
-                    scores.append(score)
-                
-                # Calculate scores for this criterion
-                criterion_score = calculate_final_score(
-                    sub_criteria,
-                    sub_weights,
-                    scores
-                )
-                main_weight = main_weights[main_criteria.index(criterion)]
-                total_weighted_scores += criterion_score * main_weight
-                total_weights += sum(sub_weights) * main_weight * 5
+                subtree = define_sub_criteria(criterion, criterion, method, entry_mode, uploaded)
+                if subtree is None:
+                    complete = False
+                    continue
+                criterion_leaves, criterion_leaf_weights, criterion_scores = subtree
+                leaves.extend(criterion_leaves)
+                leaf_weights.extend(main_weight * weight for weight in criterion_leaf_weights)
+                scores.extend(criterion_scores)
+        
+        # No score or decision while any matrix is invalid
+        if not complete:
+            st.warning("Correct the invalid matrices above to calculate the final score.")
+            return
+        
+        total_weighted_scores = calculate_final_score(leaves, leaf_weights, scores)
+        total_weights = sum(leaf_weights) * 5
         
         # Display final scores if we have any weights
         if total_weights > 0:
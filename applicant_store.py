@@ -0,0 +1,210 @@
+"""
+Compact columnar storage for applicant portfolios
+
+Scoring one applicant normally takes a dict with 17 string keys, which costs
+several hundred bytes per record. `ApplicantStore` keeps a whole portfolio in
+one structured NumPy array instead. It holds either one int8 answer code per
+question of a `Questionnaire` (10 bytes per farmer for the app_frontend
+form) or one float32 score per sub-criterion. A 10M-farmer portfolio of
+answer codes therefore takes about 100 MB.
+
+Single applicants are read through `ApplicantRecord`, a slotted view that
+behaves like the usual score dict. `AHPCalculator` accepts records and whole
+stores directly.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from questionnaire import Questionnaire
+
+# Applicants converted to float64 at a time when scoring a store
+SCORE_CHUNK = 1 << 20
+
+
+def _recfunctions():
+    # numpy.lib.recfunctions imports numpy.ma, so it is only loaded once a store is used
+    from numpy.lib import recfunctions
+    return recfunctions
+
+
+class ApplicantStore:
+    """
+    Portfolio of applicants stored column-wise in a structured array.
+
+    Attributes:
+        data (np.ndarray): Structured array with one field per question
+            (int8 answer codes) or per criterion (float32 scores)
+        questionnaire (Optional[Questionnaire]): Questionnaire the answer
+            codes refer to; None for a store of scores
+        criteria (Tuple[str, ...]): Sub-criteria the applicants are scored on
+    """
+
+    def __init__(self, data: np.ndarray, questionnaire: Optional[Questionnaire] = None):
+        self.data = data
+        self.questionnaire = questionnaire
+        self.criteria = questionnaire.criteria if questionnaire is not None else data.dtype.names
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, questionnaire: Questionnaire) -> "ApplicantStore":
+        """
+        Build a store from (N x Q) option codes in question order.
+
+        Args:
+            codes (np.ndarray): Option code of every applicant for every question
+            questionnaire (Questionnaire): Questionnaire the codes refer to
+
+        Returns:
+            ApplicantStore: Store of int8 answer codes
+        """
+        codes = np.asarray(codes)
+        if codes.ndim != 2 or codes.shape[1] != len(questionnaire.questions):
+            raise ValueError(f"Expected an (N x {len(questionnaire.questions)}) code array, "
+                             f"got shape {codes.shape}")
+        if ((codes < 0) | (codes >= questionnaire.n_options)).any():
+            raise ValueError("Answer code out of range")
+        dtype = np.dtype([(qid, np.int8) for qid in questionnaire.question_ids])
+        data = _recfunctions().unstructured_to_structured(codes.astype(np.int8), dtype)
+        return cls(data, questionnaire)
+
+    @classmethod
+    def from_answers(
+        cls,
+        answers: Dict[str, Sequence[str]],
+        questionnaire: Questionnaire
+    ) -> "ApplicantStore":
+        """Build a store from answer label columns keyed by question id"""
+        return cls.from_codes(questionnaire.encode_labels(answers), questionnaire)
+
+    @classmethod
+    def from_scores(cls, scores: np.ndarray, criteria: Sequence[str]) -> "ApplicantStore":
+        """
+        Build a store from (N x k) sub-criterion scores.
+
+        Args:
+            scores (np.ndarray): Score of every applicant for every criterion
+            criteria (Sequence[str]): Criterion name of each column
+
+        Returns:
+            ApplicantStore: Store of float32 scores
+        """
+        scores = np.asarray(scores)
+        if scores.ndim != 2 or scores.shape[1] != len(criteria):
+            raise ValueError(f"Expected an (N x {len(criteria)}) score array, got shape {scores.shape}")
+        dtype = np.dtype([(criterion, np.float32) for criterion in criteria])
+        return cls(_recfunctions().unstructured_to_structured(scores.astype(np.float32), dtype))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key):
+        """An `ApplicantRecord` for an integer index, a sub-store for a slice or mask"""
+        if isinstance(key, (int, np.integer)):
+            if not -len(self.data) <= key < len(self.data):
+                raise IndexError("Applicant index out of range")
+            return ApplicantRecord(self, int(key) % len(self.data))
+        return ApplicantStore(self.data[key], self.questionnaire)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the applicant data"""
+        return self.data.nbytes
+
+    def codes(self) -> np.ndarray:
+        """(N x Q) view of the answer codes of a store built from answers"""
+        if self.questionnaire is None:
+            raise ValueError("Store holds scores, not answer codes")
+        return _recfunctions().structured_to_unstructured(self.data)
+
+    def score_matrix(self) -> np.ndarray:
+        """(N x k) sub-criterion scores, in `criteria` order"""
+        if self.questionnaire is not None:
+            return self.questionnaire.scores(self.codes())
+        return _recfunctions().structured_to_unstructured(self.data, dtype=np.float64)
+
+    def score_chunks(self, chunk_size: int = SCORE_CHUNK) -> Iterator[np.ndarray]:
+        """Yield `score_matrix` for consecutive chunks of at most `chunk_size` applicants"""
+        for start in range(0, len(self.data), chunk_size):
+            yield self[start:start + chunk_size].score_matrix()
+
+    def weighted_sum(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Weighted score of every applicant without expanding the whole store.
+
+        Answer-coded stores add up the precomputed points of each selected
+        option; score stores are multiplied out chunk by chunk.
+
+        Args:
+            weights (np.ndarray): (k,) weight per criterion, in `criteria` order
+
+        Returns:
+            np.ndarray: (N,) weighted scores
+        """
+        if self.questionnaire is not None:
+            total = np.zeros(len(self.data))
+            for question_id, points in zip(self.questionnaire.question_ids,
+                                           self.questionnaire.option_points(weights)):
+                total += points[self.data[question_id]]
+            return total
+
+        total = np.empty(len(self.data))
+        for start in range(0, len(self.data), SCORE_CHUNK):
+            chunk = self.data[start:start + SCORE_CHUNK]
+            total[start:start + len(chunk)] = _recfunctions().structured_to_unstructured(chunk) @ weights
+        return total
+
+
+class ApplicantRecord(Mapping):
+    """
+    Read-only view of one applicant in an `ApplicantStore`.
+
+    Behaves like the score dict taken by `AHPCalculator.check_eligibility`,
+    mapping each criterion to the applicant's score.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: ApplicantStore, index: int):
+        self._store = store
+        self._index = index
+
+    def keys(self):
+        return self._store.criteria
+
+    def values(self) -> np.ndarray:
+        """Scores in `keys()` order"""
+        store = self._store
+        if store.questionnaire is not None:
+            return store.questionnaire.scores(self.codes)
+        return np.array(store.data[self._index].tolist(), dtype=np.float64)
+
+    def __getitem__(self, criterion: str) -> float:
+        try:
+            position = self._store.criteria.index(criterion)
+        except ValueError:
+            raise KeyError(criterion) from None
+        return float(self.values()[position])
+
+    def __iter__(self):
+        return iter(self._store.criteria)
+
+    def __len__(self) -> int:
+        return len(self._store.criteria)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """(Q,) answer codes of the applicant"""
+        if self._store.questionnaire is None:
+            raise ValueError("Store holds scores, not answer codes")
+        return np.array(self._store.data[self._index].tolist(), dtype=np.int8)
+
+    @property
+    def answers(self) -> Dict[str, str]:
+        """Selected option label per question id"""
+        questions = self._store.questionnaire.questions
+        return {q.id: q.options[code] for q, code in zip(questions, self.codes.tolist())}
+
+    def __repr__(self) -> str:
+        return f"ApplicantRecord({self._index}, {dict(zip(self.keys(), self.values().tolist()))})"
@@ -0,0 +1,274 @@
+"""
+Benchmark suite for ahp_core and AHPCalculator
+
+Times the core AHP operations on synthetic data, fully offline:
+- normalize_matrix, consistency_check and calculate_final_score for matrix
+  sizes 3-50, plus their batched forms
+- Every weight derivation method in `WEIGHT_METHODS`, single and batched,
+  with the deviation of its weights from the principal eigenvector
+- AHPCalculator construction, from scratch and from a saved artifact
+- Single-applicant scoring (calculate_score, check_eligibility) against the
+  batch path (score_batch) for 1 to 10M applicants, from a score array and
+  from an answer-coded ApplicantStore
+
+Results are written as JSON together with machine information, and the
+compare mode flags regressions between two result files.
+
+Usage:
+    python benchmarks/bench_ahp.py run --output results.json
+    python benchmarks/bench_ahp.py run --quick --output results.json
+    python benchmarks/bench_ahp.py compare baseline.json results.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ahp_calculation import AHPCalculator  # noqa: E402
+from ahp_core import (  # noqa: E402
+    SAATY_SCALE,
+    WEIGHT_FUNCTIONS,
+    calculate_final_score,
+    consistency_check,
+    consistency_check_batch,
+    normalize_matrix,
+    normalize_matrix_batch
+)
+from applicant_store import ApplicantStore  # noqa: E402
+from questionnaire import FRONTEND_QUESTIONNAIRE  # noqa: E402
+
+MATRIX_SIZES = [3, 5, 7, 10, 15, 20, 30, 50]
+BATCH_SIZES = [1, 100, 10_000, 1_000_000, 10_000_000]
+MATRIX_BATCH = 1000
+
+# Minimum wall-clock time per repeat; loops are added until it is reached
+MIN_REPEAT_SECONDS = 0.2
+
+
+def random_reciprocal_matrices(n_matrices: int, n: int, seed: int = 0) -> np.ndarray:
+    """(n_matrices, n, n) random reciprocal matrices with judgments on Saaty's scale"""
+    rng = np.random.default_rng(seed)
+    upper = np.triu_indices(n, 1)
+    values = SAATY_SCALE[rng.integers(len(SAATY_SCALE), size=(n_matrices, len(upper[0])))]
+    matrices = np.ones((n_matrices, n, n))
+    matrices[:, upper[0], upper[1]] = values
+    matrices[:, upper[1], upper[0]] = 1 / values
+    return matrices
+
+
+def measure(func: Callable[[], Any], repeats: int = 5, min_seconds: float = MIN_REPEAT_SECONDS) -> Dict[str, float]:
+    """
+    Time a callable like `timeit`, calibrating the loop count first.
+
+    Returns:
+        Dict[str, float]: Best and median seconds per call, and loops per repeat
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or loops >= 1 << 20:
+            break
+        loops *= 10 if elapsed < min_seconds / 10 else 2
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+    return {'best': min(timings), 'median': float(np.median(timings)), 'loops': loops}
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+
+def bench_core(sizes: List[int], repeats: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for n in sizes:
+        matrices = random_reciprocal_matrices(MATRIX_BATCH, n)
+        matrix = matrices[0]
+        _, weights = normalize_matrix(matrix)
+        _, batch_weights = normalize_matrix_batch(matrices)
+        scores = np.arange(n) % 5 + 1.0
+        criteria = [f"C{i}" for i in range(n)]
+
+        cases = {
+            f"normalize_matrix[n={n}]": lambda: normalize_matrix(matrix),
+            f"normalize_matrix_eigenvector[n={n}]": lambda: normalize_matrix(matrix, 'eigenvector'),
+            f"consistency_check[n={n}]": lambda: consistency_check(matrix, weights),
+            f"calculate_final_score[n={n}]": lambda: calculate_final_score(criteria, weights, scores),
+            f"normalize_matrix_batch[n={n},B={MATRIX_BATCH}]": lambda: normalize_matrix_batch(matrices),
+            f"consistency_check_batch[n={n},B={MATRIX_BATCH}]":
+                lambda: consistency_check_batch(matrices, batch_weights),
+        }
+        for name, func in cases.items():
+            results[name] = {'group': 'core', 'n': n, **measure(func, repeats)}
+    return results
+
+
+def bench_weights(sizes: List[int], repeats: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Time every weight method and measure how far its weights are from the
+    principal eigenvector, as the largest absolute weight difference per
+    matrix averaged (mean_deviation) and maximised (max_deviation) over
+    `MATRIX_BATCH` random matrices.
+    """
+    results = {}
+    for n in sizes:
+        matrices = random_reciprocal_matrices(MATRIX_BATCH, n)
+        matrix = matrices[0]
+        reference = WEIGHT_FUNCTIONS['eigenvector'](matrices)
+        for method, weight_function in WEIGHT_FUNCTIONS.items():
+            deviation = np.abs(weight_function(matrices) - reference).max(axis=1)
+            accuracy = {'mean_deviation': float(deviation.mean()), 'max_deviation': float(deviation.max())}
+            results[f"weights_{method}[n={n}]"] = {
+                'group': 'weights', 'n': n, 'method': method,
+                **measure(lambda: weight_function(matrix), repeats), **accuracy
+            }
+            results[f"weights_{method}_batch[n={n},B={MATRIX_BATCH}]"] = {
+                'group': 'weights', 'n': n, 'method': method,
+                **measure(lambda: weight_function(matrices), repeats), **accuracy
+            }
+    return results
+
+
+def bench_calculator(batch_sizes: List[int], repeats: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, 'model.npz')
+        AHPCalculator(artifact_path=artifact_path)
+        results['AHPCalculator()'] = {'group': 'construction', **measure(AHPCalculator, repeats)}
+        results['AHPCalculator(artifact_path)'] = {
+            'group': 'construction',
+            **measure(lambda: AHPCalculator(artifact_path=artifact_path), repeats)
+        }
+
+    calculator = AHPCalculator()
+    criteria = list(calculator.weights)
+    rng = np.random.default_rng(0)
+    applicant = dict(zip(criteria, rng.integers(0, 6, len(criteria)).tolist()))
+    results['calculate_score[1]'] = {
+        'group': 'single', 'n': 1, **measure(lambda: calculator.calculate_score(applicant), repeats)
+    }
+    results['check_eligibility[1]'] = {
+        'group': 'single', 'n': 1, **measure(lambda: calculator.check_eligibility(applicant), repeats)
+    }
+
+    for n_applicants in batch_sizes:
+        portfolio = rng.integers(0, 6, (n_applicants, len(criteria))).astype(float)
+        # Large batches get fewer repeats so the suite stays quick
+        batch_repeats = repeats if n_applicants < 1_000_000 else 2
+        results[f"score_batch[{n_applicants}]"] = {
+            'group': 'batch', 'n': n_applicants,
+            **measure(lambda: calculator.score_batch(portfolio, criteria), batch_repeats, 0)
+        }
+        del portfolio
+
+        questionnaire = FRONTEND_QUESTIONNAIRE
+        codes = rng.integers(0, questionnaire.n_options, (n_applicants, len(questionnaire.questions)))
+        store = ApplicantStore.from_codes(codes, questionnaire)
+        del codes
+        results[f"score_batch_store[{n_applicants}]"] = {
+            'group': 'batch', 'n': n_applicants,
+            **measure(lambda: calculator.score_batch(store), batch_repeats, 0)
+        }
+        del store
+    return results
+
+
+def run(args) -> int:
+    sizes = [3, 7, 15] if args.quick else MATRIX_SIZES
+    batch_sizes = [1, 100, 10_000] if args.quick else [n for n in BATCH_SIZES if n <= args.max_batch]
+    results = {}
+    results.update(bench_core(sizes, args.repeats))
+    results.update(bench_weights(sizes, args.repeats))
+    results.update(bench_calculator(batch_sizes, args.repeats))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'machine': machine_info(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        deviation = f"  max deviation {result['max_deviation']:.2e}" if 'max_deviation' in result else ''
+        print(f"{name:<48} {result['best'] * 1e6:>14.2f} us{deviation}")
+    print(f"Saved {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    if baseline['machine'] != candidate['machine']:
+        print("warning: results come from different machines; comparisons may be misleading")
+
+    regressions = 0
+    print(f"{'benchmark':<48} {'baseline us':>12} {'candidate us':>13} {'change':>8}")
+    for name, result in candidate['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['best']
+        after = result['best']
+        change = after / before - 1
+        flag = ''
+        if change > args.tolerance:
+            flag = '  REGRESSION'
+            regressions += 1
+        elif change < -args.tolerance:
+            flag = '  faster'
+        print(f"{name:<48} {before * 1e6:>12.2f} {after * 1e6:>13.2f} {change:>+8.1%}{flag}")
+
+    print(f"{regressions} regression(s) beyond {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ahp_core and AHPCalculator.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the benchmarks and save the results")
+    run_parser.add_argument('--output', default='bench_results.json', help="JSON file to write")
+    run_parser.add_argument('--repeats', type=int, default=5, help="timed repeats per benchmark")
+    run_parser.add_argument('--max-batch', type=int, default=max(BATCH_SIZES),
+                            help="largest applicant batch to score")
+    run_parser.add_argument('--quick', action='store_true', help="small sizes only, for smoke runs")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help="flag regressions between two result files")
+    compare_parser.add_argument('baseline', help="results to compare against")
+    compare_parser.add_argument('candidate', help="new results")
+    compare_parser.add_argument('--tolerance', type=float, default=0.10,
+                                help="relative slowdown treated as a regression (default 0.10)")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Cold-start benchmark for headless scoring
+
+Runs a fresh interpreter per sample and reports the median wall-clock time to
+score one applicant through `ahp_score.py`, next to the interpreter and NumPy
+baselines and the full `AHPCalculator` route. With --importtime the slowest
+imports of `ahp_score` (from `python -X importtime`) are listed as well.
+
+Usage:
+    python benchmarks/cold_start.py --runs 15 --importtime
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ahp_model import DEFAULT_ARTIFACT_PATH  # noqa: E402
+from ahp_score import load_model  # noqa: E402
+
+CALCULATOR_SNIPPET = ("import json, sys; from ahp_calculation import AHPCalculator; "
+                      "print(AHPCalculator(artifact_path=sys.argv[2]).check_eligibility(json.loads(sys.argv[1])))")
+
+
+def median_wall_time(command, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True, cwd=ROOT)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def slowest_imports(command, top: int = 10):
+    """(cumulative microseconds, module) of the slowest imports of a command"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', *command[1:]], check=True,
+                            capture_output=True, text=True, cwd=ROOT).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, module = line.split('|')
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of headless scoring.")
+    parser.add_argument("--runs", type=int, default=15, help="fresh interpreters per command")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports of ahp_score")
+    args = parser.parse_args()
+
+    # Build or refresh the artifact, so every timed run only loads it
+    model, _ = load_model(DEFAULT_ARTIFACT_PATH)
+    scores = json.dumps(dict.fromkeys(model.criteria, 3))
+
+    commands = {
+        'python (empty)': [sys.executable, '-c', 'pass'],
+        'import numpy': [sys.executable, '-c', 'import numpy'],
+        'ahp_score.py': [sys.executable, 'ahp_score.py', '--scores', scores],
+        'AHPCalculator': [sys.executable, '-c', CALCULATOR_SNIPPET, scores, DEFAULT_ARTIFACT_PATH],
+    }
+    print(f"median of {args.runs} runs")
+    for name, command in commands.items():
+        print(f"{name:<16} {median_wall_time(command, args.runs) * 1000:>8.1f} ms")
+
+    if args.importtime:
+        print("\nslowest imports of ahp_score.py (cumulative)")
+        for cumulative, module in slowest_imports(commands['ahp_score.py']):
+            print(f"{cumulative / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Scaling benchmark for parallel portfolio scoring
+
+Generates a synthetic questionnaire file and scores it with
+`score_portfolio.score_file` for an increasing number of worker processes,
+reporting throughput, speed-up and parallel efficiency per worker count.
+
+Usage:
+    python benchmarks/parallel_scaling.py --rows 2000000 --max-workers 8
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ahp_calculation import AHPCalculator  # noqa: E402
+from questionnaire import FRONTEND_QUESTIONNAIRE  # noqa: E402
+from score_portfolio import DEFAULT_CHUNK_SIZE, score_file  # noqa: E402
+
+
+def write_synthetic_portfolio(path: str, n_rows: int, seed: int = 0):
+    """Write `n_rows` farmers with uniformly random answers to a CSV file"""
+    rng = np.random.default_rng(seed)
+    questions = FRONTEND_QUESTIONNAIRE.question_ids
+    options = [np.array(q.options, dtype=object) for q in FRONTEND_QUESTIONNAIRE.questions]
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['farmer_id', *questions])
+        for start in range(0, n_rows, DEFAULT_CHUNK_SIZE):
+            size = min(DEFAULT_CHUNK_SIZE, n_rows - start)
+            columns = [range(start, start + size)]
+            columns += [labels[rng.integers(len(labels), size=size)] for labels in options]
+            writer.writerows(zip(*columns))
+
+
+def worker_counts(max_workers: int):
+    """1, 2, 4, ... up to and including `max_workers`"""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if max_workers > 1:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure parallel portfolio scoring throughput.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="synthetic farmers to score")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(),
+                        help="largest worker count to measure (default: CPU cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per task")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'farmers.csv')
+        output_path = os.path.join(tmp, 'scored.csv')
+        artifact_path = os.path.join(tmp, 'model.npz')
+        write_synthetic_portfolio(input_path, args.rows)
+        AHPCalculator(artifact_path=artifact_path)
+
+        print(f"{args.rows} rows, {os.cpu_count()} CPU cores")
+        print(f"{'workers':>8} {'seconds':>9} {'rows/s':>12} {'speed-up':>9} {'efficiency':>11}")
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            rows, elapsed = score_file(input_path, output_path, args.chunk_size, 'farmer_id',
+                                       artifact_path, workers)
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {rows / elapsed:>12.0f} "
+                  f"{speedup:>8.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Load test for the micro-batching HTTP scoring service
+
+Starts a `scoring_service.ScoringService` on a free local port and drives it
+with concurrent keep-alive `ScoringClient` connections sending single-applicant
+eligibility checks. Reports throughput, client-observed p50/p99 latency and
+the mean micro-batch size for each batch size setting; a batch size of 1
+disables batching for comparison.
+
+Usage:
+    python benchmarks/service_load.py --clients 64 --requests 20000 --batch-sizes 1 64 256
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ahp_calculation import AHPCalculator  # noqa: E402
+from scoring_service import ScoringClient, ScoringService  # noqa: E402
+
+
+async def run_load(calculator: AHPCalculator, n_clients: int, n_requests: int,
+                   max_batch_size: int, max_wait: float, seed: int = 0):
+    service = ScoringService(calculator, max_batch_size=max_batch_size, max_wait=max_wait)
+    port = await service.start('127.0.0.1', 0)
+    rng = np.random.default_rng(seed)
+    criteria = calculator.model.criteria
+    applicants = [dict(zip(criteria, row)) for row in rng.integers(0, 6, (256, len(criteria))).tolist()]
+    latencies = []
+
+    async def client_loop(index: int):
+        async with ScoringClient('127.0.0.1', port) as client:
+            for i in range(index, n_requests, n_clients):
+                started = perf_counter()
+                await client.check_eligibility(applicants[i % len(applicants)])
+                latencies.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(client_loop(i) for i in range(n_clients)))
+    elapsed = perf_counter() - started
+    stats = service.stats()
+    await service.stop()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return len(latencies) / elapsed, p50, p99, stats['mean_batch_size']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scoring service latency under load.")
+    parser.add_argument("--clients", type=int, default=64, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=20_000, help="requests per setting")
+    parser.add_argument("--batch-sizes", type=int, nargs='+', default=[1, 16, 64, 256],
+                        help="max_batch_size settings to compare")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="micro-batch wait in milliseconds")
+    args = parser.parse_args()
+
+    calculator = AHPCalculator()
+    print(f"{args.clients} clients, {args.requests} requests, {os.cpu_count()} CPU cores")
+    print(f"{'batch':>6} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+    for max_batch_size in args.batch_sizes:
+        throughput, p50, p99, mean_batch = asyncio.run(run_load(
+            calculator, args.clients, args.requests, max_batch_size, args.max_wait_ms / 1000))
+        print(f"{max_batch_size:>6} {throughput:>10.0f} {p50:>8.2f} {p99:>8.2f} {mean_batch:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
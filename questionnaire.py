@@ -0,0 +1,353 @@
+"""
+Declarative schema for the farmer questionnaires
+
+Every radio question shown by `app_frontend.py` and `app_front22.py` is
+defined once here: its prompt, its options, the sub-criteria it fills and the
+score vector each option assigns to them. A `Questionnaire` compiles those
+definitions into integer-indexed NumPy lookup tables, so answers are encoded
+by option code with fancy indexing instead of comparing option strings. The
+Streamlit forms render from the schema and batch tools encode raw answer
+columns with it, so both score an answer the same way.
+"""
+
+import hashlib
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+
+class Question(NamedTuple):
+    """One radio question and the scores of its options"""
+    id: str
+    section: str
+    prompt: str
+    options: Tuple[str, ...]
+    criteria: Tuple[str, ...]
+    # One score vector per option, aligned with `criteria`
+    scores: Tuple[Tuple[int, ...], ...]
+    default: int = 0
+
+
+class Questionnaire:
+    """
+    Questions compiled into lookup tables.
+
+    Attributes:
+        questions (Tuple[Question, ...]): Questions in display order
+        question_ids (Tuple[str, ...]): Id of each question
+        criteria (Tuple[str, ...]): Sub-criteria filled in, in scoring column order
+        n_options (np.ndarray): (Q,) number of options per question
+    """
+
+    def __init__(self, questions: Sequence[Question], criteria: Sequence[str]):
+        self.questions = tuple(questions)
+        self.question_ids = tuple(q.id for q in self.questions)
+        self.criteria = tuple(criteria)
+        self.n_options = np.array([len(q.options) for q in self.questions])
+
+        criterion_index = {c: i for i, c in enumerate(self.criteria)}
+        self._option_index = []
+        self._columns = []
+        self._tables = []
+        for question in self.questions:
+            table = np.array(question.scores, dtype=float)
+            if table.shape != (len(question.options), len(question.criteria)):
+                raise ValueError(
+                    f"Question '{question.id}' needs one score per criterion for every option"
+                )
+            self._option_index.append({label: i for i, label in enumerate(question.options)})
+            self._columns.append(np.array([criterion_index[c] for c in question.criteria]))
+            table.flags.writeable = False
+            self._tables.append(table)
+
+    def content_hash(self) -> str:
+        """Hex SHA-256 digest of the questions and criteria, identifying the schema"""
+        return hashlib.sha256(repr((self.questions, self.criteria)).encode()).hexdigest()
+
+    def encode_answers(self, answers: Dict[str, str]) -> np.ndarray:
+        """
+        Turn one applicant's answer labels into option codes.
+
+        Args:
+            answers (Dict[str, str]): Selected option label keyed by question id
+
+        Returns:
+            np.ndarray: (Q,) option codes in question order
+
+        Raises:
+            ValueError: If a question is missing or an answer is not one of its options
+        """
+        try:
+            return np.array([option_index[answers[question.id]] for question, option_index
+                             in zip(self.questions, self._option_index)], dtype=np.int8)
+        except KeyError as e:
+            raise ValueError(f"Missing or unknown answer {e}") from None
+
+    def encode_labels(self, answers: Dict[str, Sequence[str]]) -> np.ndarray:
+        """
+        Turn answer labels into option codes.
+
+        Args:
+            answers (Dict[str, Sequence[str]]): Selected option label per row,
+                keyed by question id
+
+        Returns:
+            np.ndarray: (N x Q) int8 option codes in question order
+
+        Raises:
+            ValueError: If a question is missing or an answer is not one of its options
+        """
+        n_rows = None
+        columns = []
+        for question, option_index in zip(self.questions, self._option_index):
+            if question.id not in answers:
+                raise ValueError(f"Missing answer column '{question.id}'")
+            labels = answers[question.id]
+            n_rows = len(labels) if n_rows is None else n_rows
+            try:
+                columns.append(np.fromiter(map(option_index.__getitem__, labels),
+                                           dtype=np.int8, count=n_rows))
+            except KeyError as e:
+                raise ValueError(f"Unknown answer {e} for question '{question.id}'") from None
+        return np.column_stack(columns) if columns else np.zeros((0, 0), dtype=np.int8)
+
+    def check_codes(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Validate option codes before they are used as indices.
+
+        Args:
+            codes (np.ndarray): (N x Q) or (Q,) option codes in question order
+
+        Returns:
+            np.ndarray: The codes as an integer array
+
+        Raises:
+            ValueError: If a row does not hold one code per question or a code
+                is not an option of its question
+        """
+        codes = np.asarray(codes)
+        if codes.ndim not in (1, 2) or codes.shape[-1] != len(self.questions):
+            raise ValueError(f"Expected {len(self.questions)} answer codes per row, got shape {codes.shape}")
+        if codes.dtype.kind not in 'iu':
+            raise ValueError("Answer codes must be integers")
+        if ((codes < 0) | (codes >= self.n_options)).any():
+            raise ValueError("Answer code out of range")
+        return codes
+
+    def scores(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Look up the sub-criterion scores of option codes.
+
+        Args:
+            codes (np.ndarray): (N x Q) or (Q,) option codes in question order
+
+        Returns:
+            np.ndarray: (N x k) or (k,) scores in `criteria` order
+        """
+        codes = self.check_codes(codes)
+        single = codes.ndim == 1
+        codes = np.atleast_2d(codes)
+
+        scores = np.zeros((len(codes), len(self.criteria)))
+        for q, (columns, table) in enumerate(zip(self._columns, self._tables)):
+            scores[:, columns] = table[codes[:, q]]
+        return scores[0] if single else scores
+
+    def option_points(self, weights: np.ndarray) -> List[np.ndarray]:
+        """
+        Weighted score contributed by every option of every question.
+
+        Because each question fills its own sub-criteria, an applicant's
+        weighted score is the sum of the points of their selected options.
+
+        Args:
+            weights (np.ndarray): (k,) weight per criterion, in `criteria` order
+
+        Returns:
+            List[np.ndarray]: (n_options,) points per question, in question order
+        """
+        weights = np.asarray(weights, dtype=float)
+        return [table @ weights[columns] for columns, table in zip(self._columns, self._tables)]
+
+    def score_dict(self, answers: Dict[str, str]) -> Dict[str, float]:
+        """
+        Score one applicant's answer labels for `AHPCalculator.check_eligibility`.
+
+        Args:
+            answers (Dict[str, str]): Selected option label keyed by question id
+
+        Returns:
+            Dict[str, float]: Score per sub-criterion, in `criteria` order
+        """
+        return dict(zip(self.criteria, self.scores(self.encode_answers(answers)).tolist()))
+
+
+# Sub-criteria filled in by the app_frontend.py questionnaire, in scoring column order
+FRONTEND_CRITERIA = [
+    'U1A1', 'U1A2', 'U1A3', 'U1A4', 'U1A5', 'U1A6', 'U1A7',
+    'U2B1', 'U2B2', 'U2B3',
+    'U3C1', 'U3C2', 'U3C3', 'U3C4',
+    'U4D1', 'U4D2', 'U4D3'
+]
+
+FRONTEND_QUESTIONS = [
+    Question(
+        'u1_q1', "Family Background (U1)", "What is your age range?",
+        ("Below 20 years old", "20-25 years old", "25-35 years old",
+         "35-50 years old", "Above 60 years old"),
+        ('U1A1',), ((1,), (2,), (4,), (3,), (1,)),
+        default=3
+    ),
+    Question(
+        'u1_q2', "Family Background (U1)",
+        "How many individuals in your household are engaged in labor or work-related activities?",
+        ("0-1", "2", "3", "4"),
+        ('U1A2',), ((1,), (2,), (3,), (4,))
+    ),
+    Question(
+        'u1_q3', "Family Background (U1)", "What is your level of identity proof?",
+        ("No formal identity (e.g., unregistered land)",
+         "Partial identity proof (e.g., land in dispute)",
+         "Fully verified identity (Clear ownership or official recognition)"),
+        ('U1A3',), ((1,), (2,), (3,))
+    ),
+    Question(
+        'u1_q4', "Family Background (U1)", "What is your marital status?",
+        ("Single, unstable family support",
+         "Married, no children, moderate family support",
+         "Married with children (Stable household)"),
+        ('U1A4',), ((1,), (2,), (3,))
+    ),
+    Question(
+        'u1_q5', "Family Background (U1)", "What is your lifestyle?",
+        ("High-expense lifestyle (Luxury purchases or debt)",
+         "Moderate expenses (Basic needs with occasional discretionary spending)",
+         "Simple lifestyle (Savings-oriented, minimal discretionary spending)"),
+        ('U1A5',), ((1,), (2,), (3,))
+    ),
+    Question(
+        'u1_q6', "Family Background (U1)", "What is the health condition of your family members?",
+        ("Poor health (Chronic illness in key members)",
+         "Average health (Occasional medical expenses)",
+         "Excellent health (Minimal medical risks)"),
+        ('U1A6',), ((1,), (2,), (3,))
+    ),
+    Question(
+        'u1_q7', "Family Background (U1)", "What is your level of skills and training?",
+        ("No skills (Untrained, low productivity)",
+         "Semi-skilled (Basic training or informal experience)",
+         "Skilled (Certified training or proven track record)"),
+        ('U1A7',), ((1,), (2,), (3,))
+    ),
+    Question(
+        'u2_q1', "Willingness to Repay (U2)", "Loan Repayment History",
+        ("I have never defaulted on a loan repayment.",
+         "I have defaulted on a loan, but it was resolved.",
+         "I have defaulted on a loan, and the issue remains unresolved."),
+        ('U2B1', 'U2B2', 'U2B3'),
+        ((4, 0, 0), (2, 2, 0), (1, 0, 1))
+    ),
+    Question(
+        'u3_q1', "Ability to Repay (U3)", "Income Level",
+        ("My family's average monthly income per household member is below the poverty line.",
+         "My family's average monthly income per household member is enough to meet basic needs.",
+         "My family's average monthly income per household member is enough to meet basic needs and save occasionally.",
+         "My family's average monthly income per household member is well above the basic needs with regular savings."),
+        ('U3C1', 'U3C2', 'U3C3', 'U3C4'),
+        ((1, 0, 0, 0), (0, 2, 0, 0), (0, 0, 3, 0), (0, 0, 0, 4))
+    ),
+    Question(
+        'u4_q1', "Relationship with the Cooperative (U4)", "Cooperative Membership and Participation",
+        ("I am not a member of any professional association.",
+         "I am a member but rarely participate in activities.",
+         "I am a member and participate occasionally in activities.",
+         "I am an active member and regularly participate in activities."),
+        ('U4D1', 'U4D2', 'U4D3'),
+        # The model has no fourth U4 sub-criterion, so the last option scores nothing
+        ((1, 0, 0), (0, 2, 0), (0, 0, 3), (0, 0, 0))
+    ),
+]
+
+FRONTEND_QUESTIONNAIRE = Questionnaire(FRONTEND_QUESTIONS, FRONTEND_CRITERIA)
+
+# Sub-criteria filled in by the app_front22.py questionnaire
+FRONT22_CRITERIA = [
+    'U1A1', 'U1A2', 'U1A3', 'U1A4', 'U1A5', 'U1A6', 'U1A7',
+    'U2B1', 'U2B2', 'U2B3', 'U2B4',
+    'U3C1', 'U3C2', 'U3C3', 'U3C4', 'U3C5', 'U3C6', 'U3C7',
+    'U4D1', 'U4D2', 'U4D3'
+]
+
+FRONT22_QUESTIONS = [
+    Question(
+        'u1_q1', "Family Background", "What is your age range?",
+        ("Below 20 years old", "20-25 years old", "25-35 years old",
+         "35-50 years old", "Above 60 years old"),
+        ('U1A1',), ((1,), (2,), (4,), (3,), (1,)),
+        default=3
+    ),
+    Question(
+        'u1_q2', "Family Background",
+        "How many individuals in your household are engaged in labor or work-related activities?",
+        ("0-1", "2", "3", "4"),
+        ('U1A2',), ((1,), (3,), (4,), (5,))
+    ),
+    Question(
+        'u1_q3', "Family Background", "What is the status of your property verification?",
+        ("No formal documentation (e.g., unregistered land)",
+         "Partial documentation (e.g., land ownership in dispute)",
+         "Fully verified documentation (e.g., clear ownership or official recognition)"),
+        ('U1A3',), ((1,), (3,), (5,))
+    ),
+    Question(
+        'u1_q4', "Family Background", "What is your current marital and family support status?",
+        ("Single", "Married", "Married with children"),
+        ('U1A4',), ((1,), (3,), (5,))
+    ),
+    Question(
+        'u1_q5', "Family Background", "Which best describes your approach to personal finances?",
+        ("Flexible spending (Frequent discretionary purchases or managing financial commitments)",
+         "Balanced spending (Covers essentials with occasional discretionary expenses)",
+         "Savings-focused (Prioritizes savings with minimal discretionary spending)"),
+        ('U1A5',), ((1,), (3,), (5,))
+    ),
+    Question(
+        'u1_q6', "Family Background", "How family members are facing health issues?",
+        ("1", "2", "3 and above"),
+        ('U1A6',), ((5,), (3,), (1,))
+    ),
+    Question(
+        'u1_q7', "Family Background", "What's your years of experience as a farmer?",
+        ("0-5 years", "5-10 years", "10 years above"),
+        ('U1A7',), ((1,), (3,), (5,))
+    ),
+    Question(
+        'u2_q1', "Willingess to Repay", "What best describes your loan repayment history?",
+        ("Consistent repayment (Never defaulted on a loan)",
+         "Previous default, but resolved (Loan default occurred but was settled)",
+         "Outstanding default (Loan default occurred and is yet to be resolved)"),
+        ('U2B1', 'U2B2', 'U2B3', 'U2B4'),
+        ((5,) * 4, (3,) * 4, (1,) * 4)
+    ),
+    Question(
+        'u3_q1', "Ability to Repay", "How would you describe your household’s financial capacity?",
+        ("Limited income (Covers some basic needs)",
+         "Stable income (Covers basic needs)",
+         "Moderate financial flexibility (Covers basic needs with occasional savings)",
+         "Comfortable financial position (Exceeds basic needs with regular savings)"),
+        ('U3C1', 'U3C2', 'U3C3', 'U3C4', 'U3C5', 'U3C6', 'U3C7'),
+        ((1,) * 7, (3,) * 7, (4,) * 7, (5,) * 7)
+    ),
+    Question(
+        'u4_q1', "Relationship with the Cooperative",
+        "What best describes your involvement in a professional or cooperative association?",
+        ("Not a member of any professional or cooperative association",
+         "Member with limited participation (Rarely involved in activities)",
+         "Moderately engaged member (Occasionally participates in activities)",
+         "Active member (Regularly participates in activities)"),
+        ('U4D1', 'U4D2', 'U4D3'),
+        ((1,) * 3, (3,) * 3, (4,) * 3, (5,) * 3)
+    ),
+]
+
+FRONT22_QUESTIONNAIRE = Questionnaire(FRONT22_QUESTIONS, FRONT22_CRITERIA)
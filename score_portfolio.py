@@ -0,0 +1,438 @@
+"""
+Headless portfolio scoring for the AHP credit scoring system
+
+Scores a file of farmers with `AHPCalculator` without the Streamlit interface.
+The input is read in fixed-size chunks and every chunk flows through a
+generator pipeline (read -> encode -> score -> write), so memory use stays
+flat however large the file is.
+
+Each input row either holds the questionnaire answers, in columns named after
+the question ids of `questionnaire.FRONTEND_QUESTIONNAIRE` ('u1_q1' ... 'u4_q1'), or the
+sub-criterion scores themselves in columns 'U1A1' ... 'U4D3'. CSV and Parquet
+files are supported; Parquet requires pyarrow.
+
+With `--workers N` the file is split into byte ranges (CSV) or row groups
+(Parquet) that a process pool parses and scores in parallel. Each worker
+loads the compiled model from the artifact once, and results are written in
+input order. Parallel CSV mode requires that no field contains a newline.
+
+Usage:
+    python score_portfolio.py farmers.csv scored.csv --chunk-size 100000
+    python score_portfolio.py farmers.csv scored.csv --workers 8
+"""
+
+import argparse
+import collections
+import csv
+import io
+import itertools
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ahp_calculation import AHPCalculator, ELIGIBILITY_THRESHOLD
+from ahp_model import DEFAULT_ARTIFACT_PATH, ScoringModel, load_artifact
+from questionnaire import FRONTEND_CRITERIA, FRONTEND_QUESTIONNAIRE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# A chunk of input rows, stored column-wise
+Chunk = Dict[str, Sequence]
+
+# Rows sampled from the head of a CSV file to estimate its bytes per row
+_ROW_SIZE_SAMPLE = 1000
+
+# Scoring model loaded once by each worker process
+_worker_model: Optional[ScoringModel] = None
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Reading or writing Parquet files requires pyarrow") from e
+    return pyarrow
+
+
+def read_header(path: str) -> List[str]:
+    """
+    Column names of a CSV or Parquet file, without reading its rows.
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        List[str]: Column names in file order; empty for an empty CSV file
+    """
+    if _is_parquet(path):
+        pyarrow = _import_pyarrow()
+        return list(pyarrow.parquet.ParquetFile(path).schema_arrow.names)
+
+    with open(path, newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    Read a CSV or Parquet file in chunks of at most `chunk_size` rows.
+
+    Args:
+        path (str): Input file
+        chunk_size (int): Maximum number of rows per chunk
+
+    Yields:
+        Chunk: Column name -> column values for the next chunk of rows
+    """
+    if _is_parquet(path):
+        pyarrow = _import_pyarrow()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield {name: column.to_numpy(zero_copy_only=False)
+                   for name, column in zip(batch.schema.names, batch.columns)}
+        return
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                return
+            yield dict(zip(header, zip(*rows)))
+
+
+def encode_chunk(chunk: Chunk) -> np.ndarray:
+    """
+    Turn a chunk of input rows into sub-criterion scores.
+
+    Args:
+        chunk (Chunk): Columns of either sub-criterion scores or questionnaire answers
+
+    Returns:
+        np.ndarray: (N x 17) scores in `FRONTEND_CRITERIA` order
+
+    Raises:
+        ValueError: If a column is missing or an answer is not a known option
+    """
+    if all(criterion in chunk for criterion in FRONTEND_CRITERIA):
+        return np.column_stack([np.asarray(chunk[c], dtype=float) for c in FRONTEND_CRITERIA])
+
+    codes = FRONTEND_QUESTIONNAIRE.encode_labels(chunk)
+    return FRONTEND_QUESTIONNAIRE.scores(codes)
+
+
+def score_chunks(
+    chunks: Iterator[Chunk],
+    calculator: AHPCalculator
+) -> Iterator[Tuple[Chunk, np.ndarray, np.ndarray]]:
+    """
+    Score every chunk with one vectorized call.
+
+    Args:
+        chunks (Iterator[Chunk]): Input chunks from `read_chunks`
+        calculator (AHPCalculator): Calculator with consistent matrices
+
+    Yields:
+        Tuple[Chunk, np.ndarray, np.ndarray]:
+            - The input chunk
+            - (N,) percentage scores
+            - (N,) eligibility flags
+    """
+    for chunk in chunks:
+        final_scores = calculator.score_batch(encode_chunk(chunk), FRONTEND_CRITERIA)
+        if final_scores is None:
+            raise RuntimeError("Score calculation failed")
+        yield chunk, final_scores, final_scores >= ELIGIBILITY_THRESHOLD
+
+
+def write_results(
+    results: Iterator[Tuple[Chunk, np.ndarray, np.ndarray]],
+    path: str,
+    model_version: str,
+    id_column: Optional[str] = None
+) -> int:
+    """
+    Write scored chunks to a CSV or Parquet file as they arrive.
+
+    Args:
+        results (Iterator): Scored chunks from `score_chunks`
+        path (str): Output file
+        model_version (str): Model version recorded on every row
+        id_column (str, optional): Input column copied to the output to
+            identify each farmer
+
+    Returns:
+        int: Number of rows written
+    """
+    total_rows = 0
+    started = time.perf_counter()
+
+    if _is_parquet(path):
+        pyarrow = _import_pyarrow()
+        writer = None
+        try:
+            for chunk, final_scores, is_eligible in results:
+                columns = {} if id_column is None else {id_column: pyarrow.array(chunk[id_column])}
+                columns['score'] = pyarrow.array(final_scores)
+                columns['eligible'] = pyarrow.array(is_eligible)
+                columns['model_version'] = pyarrow.array([model_version] * len(final_scores))
+                table = pyarrow.table(columns)
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                total_rows += len(final_scores)
+                _log_progress(total_rows, started)
+            if writer is None:
+                # No input rows: still write the output columns
+                fields = [] if id_column is None else [(id_column, pyarrow.string())]
+                fields += [('score', pyarrow.float64()), ('eligible', pyarrow.bool_()),
+                           ('model_version', pyarrow.string())]
+                writer = pyarrow.parquet.ParquetWriter(path, pyarrow.schema(fields))
+        finally:
+            if writer is not None:
+                writer.close()
+        return total_rows
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        header = ['score', 'eligible', 'model_version']
+        writer.writerow(header if id_column is None else [id_column] + header)
+        for chunk, final_scores, is_eligible in results:
+            columns = [np.char.mod('%.4f', final_scores), is_eligible.tolist(),
+                       itertools.repeat(model_version)]
+            if id_column is not None:
+                columns.insert(0, chunk[id_column])
+            writer.writerows(zip(*columns))
+            total_rows += len(final_scores)
+            _log_progress(total_rows, started)
+    return total_rows
+
+
+def _log_progress(total_rows: int, started: float):
+    elapsed = time.perf_counter() - started
+    logger.debug("%d rows scored (%.0f rows/s)", total_rows, total_rows / elapsed if elapsed else 0)
+
+
+def split_input(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[tuple]:
+    """
+    Split an input file into independently readable parts of about `chunk_size` rows.
+
+    Args:
+        path (str): CSV or Parquet input file
+        chunk_size (int): Target number of rows per part
+
+    Returns:
+        List[tuple]: ('parquet', path, row_group) per row group, or
+        ('csv', path, header, start_offset, end_offset) per byte range, in
+        file order
+    """
+    if _is_parquet(path):
+        # A row group is decoded as a whole, so it is never split across parts
+        pyarrow = _import_pyarrow()
+        num_row_groups = pyarrow.parquet.ParquetFile(path).metadata.num_row_groups
+        return [('parquet', path, row_group) for row_group in range(num_row_groups)]
+
+    with open(path, 'rb') as f:
+        header = next(csv.reader([f.readline().decode()]), None)
+        if header is None:
+            return []
+        data_start = f.tell()
+        sample = list(itertools.islice(f, _ROW_SIZE_SAMPLE))
+        size = os.fstat(f.fileno()).st_size
+        if not sample:
+            return []
+        part_bytes = max(1, sum(map(len, sample)) * chunk_size // len(sample))
+
+        boundaries = [data_start]
+        for offset in range(data_start + part_bytes, size, part_bytes):
+            if offset <= boundaries[-1]:
+                continue
+            # Move each boundary forward to the start of the next row
+            f.seek(offset - 1)
+            f.readline()
+            if f.tell() >= size:
+                break
+            boundaries.append(f.tell())
+        boundaries.append(size)
+    return [('csv', path, header, start, end) for start, end in zip(boundaries, boundaries[1:])]
+
+
+def read_part(part: tuple, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    Read one part returned by `split_input`.
+
+    Args:
+        part (tuple): Part description from `split_input`
+        chunk_size (int): Maximum number of rows per chunk of a Parquet row
+            group; a CSV part is read as one chunk
+
+    Yields:
+        Chunk: Column name -> column values for the next rows of that part
+    """
+    if part[0] == 'parquet':
+        _, path, row_group = part
+        pyarrow = _import_pyarrow()
+        batches = pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size, row_groups=[row_group])
+        for batch in batches:
+            yield {name: column.to_numpy(zero_copy_only=False)
+                   for name, column in zip(batch.schema.names, batch.columns)}
+        return
+
+    _, path, header, start, end = part
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).decode()
+    rows = list(csv.reader(io.StringIO(data)))
+    yield dict(zip(header, zip(*rows))) if rows else {name: () for name in header}
+
+
+def _init_worker(artifact_path: str, expected_hash: str):
+    """Load the scoring model once per worker process"""
+    global _worker_model
+    artifact = load_artifact(artifact_path, expected_hash)
+    if artifact is None or artifact['model'] is None:
+        raise RuntimeError(f"No consistent model with hash {expected_hash} in {artifact_path}")
+    _worker_model = artifact['model']
+
+
+def _score_part(
+    part: tuple,
+    chunk_size: int,
+    id_column: Optional[str]
+) -> List[Tuple[Chunk, np.ndarray, np.ndarray]]:
+    """Read and score one part in a worker process, one result per chunk"""
+    results = []
+    for chunk in read_part(part, chunk_size):
+        final_scores = _worker_model.score_batch(encode_chunk(chunk), FRONTEND_CRITERIA)
+        ids = {} if id_column is None else {id_column: chunk[id_column]}
+        results.append((ids, final_scores, final_scores >= ELIGIBILITY_THRESHOLD))
+    return results
+
+
+def score_parts_parallel(
+    parts: Sequence[tuple],
+    calculator: AHPCalculator,
+    artifact_path: str,
+    workers: int,
+    id_column: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[Chunk, np.ndarray, np.ndarray]]:
+    """
+    Score input parts on a process pool, yielding results in input order.
+
+    At most two parts per worker are in flight, so memory stays bounded
+    while the writer consumes results.
+
+    Args:
+        parts (Sequence[tuple]): Parts from `split_input`
+        calculator (AHPCalculator): Calculator whose artifact the workers load
+        artifact_path (str): Artifact file holding the calculator's model
+        workers (int): Number of worker processes
+        id_column (str, optional): Input column returned with the scores
+        chunk_size (int): Rows scored at a time within a Parquet row group
+
+    Yields:
+        Tuple[Chunk, np.ndarray, np.ndarray]:
+            - The id column of the chunk, if requested
+            - (N,) percentage scores
+            - (N,) eligibility flags
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(artifact_path, calculator.content_hash)) as executor:
+        pending = collections.deque()
+        for part in parts:
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_score_part, part, chunk_size, id_column))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    id_column: Optional[str] = None,
+    artifact_path: str = DEFAULT_ARTIFACT_PATH,
+    workers: int = 1
+) -> Tuple[int, float]:
+    """
+    Score a portfolio file and write the results.
+
+    Args:
+        input_path (str): CSV or Parquet file of farmers
+        output_path (str): CSV or Parquet file to write
+        chunk_size (int): Rows read and scored at a time
+        id_column (str, optional): Input column identifying each farmer
+        artifact_path (str): Model artifact to load the calculator from
+        workers (int): Worker processes; 1 scores in this process
+
+    Returns:
+        Tuple[int, float]:
+            - Number of rows scored
+            - Elapsed wall-clock seconds
+
+    Raises:
+        ValueError: If `id_column` is not a column of the input file
+    """
+    started = time.perf_counter()
+    if id_column is not None and id_column not in read_header(input_path):
+        raise ValueError(f"Id column {id_column!r} not found in {input_path}")
+    calculator = AHPCalculator(artifact_path=artifact_path)
+    if calculator.weights is None:
+        raise RuntimeError("Cannot calculate score: Inconsistent matrices: "
+                           + "; ".join(calculator.get_consistency_summary()))
+
+    if workers > 1:
+        results = score_parts_parallel(split_input(input_path, chunk_size), calculator,
+                                       artifact_path, workers, id_column, chunk_size)
+    else:
+        results = score_chunks(read_chunks(input_path, chunk_size), calculator)
+    total_rows = write_results(results, output_path, calculator.model_version, id_column)
+    return total_rows, time.perf_counter() - started
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Score a farmer portfolio file with the AHP model.")
+    parser.add_argument("input", help="CSV or Parquet file of answers or sub-criterion scores")
+    parser.add_argument("output", help="CSV or Parquet file to write scores to")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows read and scored at a time (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--id-column", help="input column copied to the output to identify each farmer")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH, help="model artifact file")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 uses every CPU core (default 1)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log progress after every chunk")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(message)s", stream=sys.stderr)
+    try:
+        total_rows, elapsed = score_file(args.input, args.output, args.chunk_size,
+                                         args.id_column, args.artifact,
+                                         args.workers or os.cpu_count())
+    except (OSError, ValueError, RuntimeError) as e:
+        logger.error("%s", e)
+        return 1
+
+    logger.info("Scored %d rows in %.2f s (%.0f rows/s)",
+                total_rows, elapsed, total_rows / elapsed if elapsed else 0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
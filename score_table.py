@@ -0,0 +1,223 @@
+"""
+Exhaustive score table over a questionnaire's finite answer space
+
+The questionnaire in `app_frontend.py` has only 5 x 4 x 3^5 x 3 x 4 x 4 =
+233,280 answer combinations. `build_score_table` scores every one of them once
+per model version and stores the percentage scores (float32) and eligibility
+flags (one bit each) as memory-mappable `.npy` files. Each combination lives
+at its mixed-radix index, with the last question varying fastest, so online
+scoring is a single index computation and a table read.
+
+Because the table covers every profile, score distributions and eligibility
+rates, overall or for any set of fixed answers, are reductions over
+(a reshaped view of) the table.
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ahp_calculation import ELIGIBILITY_THRESHOLD, AHPCalculator
+from ahp_model import DEFAULT_ARTIFACT_PATH
+from questionnaire import FRONTEND_QUESTIONNAIRE, Questionnaire
+
+# Score tables live next to the model artifact unless told otherwise
+DEFAULT_TABLE_DIR = os.path.dirname(DEFAULT_ARTIFACT_PATH)
+
+
+class ScoreTable:
+    """
+    Precomputed score and eligibility of every answer combination.
+
+    Attributes:
+        questionnaire (Questionnaire): Questionnaire the table enumerates
+        radices (np.ndarray): (Q,) number of options per question
+        strides (np.ndarray): (Q,) mixed-radix place value of each question
+        scores (np.ndarray): Percentage score per combination, float32
+        threshold (float): Eligibility cutoff the flags were computed with
+    """
+
+    def __init__(
+        self,
+        questionnaire: Questionnaire,
+        scores: np.ndarray,
+        eligible_bits: np.ndarray,
+        threshold: float
+    ):
+        self.questionnaire = questionnaire
+        self.radices = questionnaire.n_options
+        self.strides = np.concatenate([np.cumprod(self.radices[:0:-1])[::-1], [1]]).astype(np.int64)
+        self.scores = scores
+        self._eligible_bits = eligible_bits
+        self.threshold = threshold
+        if len(scores) != int(np.prod(self.radices)):
+            raise ValueError("Score table does not match the questionnaire's answer space")
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def index(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Compute the mixed-radix table index of option codes.
+
+        Args:
+            codes (np.ndarray): (Q,) or (N x Q) option codes in question order
+
+        Returns:
+            np.ndarray: Table index per applicant
+
+        Raises:
+            ValueError: If a code is not an option of its question
+        """
+        return self.questionnaire.check_codes(codes).astype(np.int64) @ self.strides
+
+    def score(self, codes: np.ndarray) -> np.ndarray:
+        """Percentage score for (Q,) or (N x Q) option codes"""
+        return self.scores[self.index(codes)]
+
+    def eligible(self, codes: np.ndarray) -> np.ndarray:
+        """Eligibility flag for (Q,) or (N x Q) option codes"""
+        index = self.index(codes)
+        return ((self._eligible_bits[index >> 3] >> (7 - (index & 7))) & 1).astype(bool)
+
+    def check_answers(self, answers: Dict[str, str]) -> Tuple[float, bool]:
+        """
+        Look up one applicant by answer labels.
+
+        Args:
+            answers (Dict[str, str]): Selected option label keyed by question id
+
+        Returns:
+            Tuple[float, bool]:
+                - Percentage score
+                - Whether the applicant is eligible
+        """
+        codes = self.questionnaire.encode_answers(answers)
+        return float(self.score(codes)), bool(self.eligible(codes))
+
+    def _select(self, values: np.ndarray, fixed: Optional[Dict[str, str]]) -> np.ndarray:
+        """Restrict a per-combination array to the profiles matching `fixed` answers"""
+        if not fixed:
+            return values
+        selection = []
+        for question in self.questionnaire.questions:
+            label = fixed.get(question.id)
+            if label is None:
+                selection.append(slice(None))
+            elif label in question.options:
+                selection.append(question.options.index(label))
+            else:
+                raise ValueError(f"Unknown answer '{label}' for question '{question.id}'")
+        return values.reshape(tuple(self.radices))[tuple(selection)]
+
+    def eligibility_rate(self, fixed: Optional[Dict[str, str]] = None) -> float:
+        """
+        Share of answer combinations that are eligible.
+
+        Args:
+            fixed (Dict[str, str], optional): Answers held fixed, keyed by
+                question id; every other question ranges over all its options
+
+        Returns:
+            float: Eligible fraction of the matching profiles
+        """
+        eligible = np.unpackbits(self._eligible_bits, count=len(self.scores))
+        return float(self._select(eligible, fixed).mean())
+
+    def score_distribution(
+        self,
+        bins: int = 20,
+        fixed: Optional[Dict[str, str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of scores over the matching profiles.
+
+        Args:
+            bins (int): Number of equal-width bins between 0 and 100
+            fixed (Dict[str, str], optional): Answers held fixed, keyed by question id
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                - Profile count per bin
+                - Bin edges
+        """
+        return np.histogram(self._select(self.scores, fixed), bins=bins, range=(0, 100))
+
+
+def table_key(calculator: AHPCalculator, questionnaire: Questionnaire, threshold: float) -> str:
+    """Short digest identifying a table by model, questionnaire and threshold"""
+    digest = hashlib.sha256(calculator.content_hash.encode())
+    digest.update(questionnaire.content_hash().encode())
+    digest.update(repr(float(threshold)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _table_paths(directory: str, key: str) -> Tuple[str, str]:
+    prefix = os.path.join(directory, f"score_table_{key}")
+    return f"{prefix}.scores.npy", f"{prefix}.eligible.npy"
+
+
+def build_score_table(
+    calculator: AHPCalculator,
+    questionnaire: Questionnaire = FRONTEND_QUESTIONNAIRE,
+    threshold: float = ELIGIBILITY_THRESHOLD
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every answer combination of a questionnaire.
+
+    Args:
+        calculator (AHPCalculator): Calculator with consistent matrices
+        questionnaire (Questionnaire): Questionnaire to enumerate
+        threshold (float): Eligibility cutoff in percent
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - float32 score per combination, in mixed-radix order
+            - Eligibility flags packed eight to a byte
+    """
+    if calculator.model is None:
+        raise ValueError("Cannot build score table: Inconsistent matrices")
+    codes = np.indices(tuple(questionnaire.n_options), dtype=np.int8)
+    codes = codes.reshape(len(questionnaire.questions), -1).T
+    scores = calculator.model.score_batch(questionnaire.scores(codes), questionnaire.criteria)
+    return scores.astype(np.float32), np.packbits(scores >= threshold)
+
+
+def load_score_table(
+    calculator: AHPCalculator,
+    questionnaire: Questionnaire = FRONTEND_QUESTIONNAIRE,
+    threshold: float = ELIGIBILITY_THRESHOLD,
+    directory: str = DEFAULT_TABLE_DIR
+) -> ScoreTable:
+    """
+    Memory-map the score table for a model, building it on first use.
+
+    Tables are keyed by the calculator's content hash, the questionnaire and
+    the threshold, so each model version is enumerated exactly once.
+
+    Args:
+        calculator (AHPCalculator): Calculator with consistent matrices
+        questionnaire (Questionnaire): Questionnaire to enumerate
+        threshold (float): Eligibility cutoff in percent
+        directory (str): Directory holding the table files
+
+    Returns:
+        ScoreTable: Read-only, memory-mapped table
+    """
+    scores_path, eligible_path = _table_paths(directory, table_key(calculator, questionnaire, threshold))
+    if not (os.path.exists(scores_path) and os.path.exists(eligible_path)):
+        scores, eligible_bits = build_score_table(calculator, questionnaire, threshold)
+        for path, array in ((eligible_path, eligible_bits), (scores_path, scores)):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+
+    return ScoreTable(
+        questionnaire,
+        np.load(scores_path, mmap_mode='r'),
+        np.load(eligible_path, mmap_mode='r'),
+        threshold
+    )
@@ -0,0 +1,199 @@
+"""
+Threshold analytics over a scored portfolio
+
+Credit committees ask how many farmers qualify at 65, 70 or 75%, and how
+that splits by cooperative or region. `ScoredPortfolio` scores a portfolio
+once and keeps the scores sorted, both overall and within each group (one
+contiguous, sorted segment per group, located by `offsets`). Eligibility
+counts at any threshold, the percentile of a score and top-k lists are then
+binary searches or slices of the sorted arrays, O(log N) or O(k), and a
+threshold sweep is one vectorized search over all thresholds at once.
+
+Usage:
+    portfolio = ScoredPortfolio.from_applicants(calculator, store, groups=cooperatives)
+    portfolio.count_eligible(70)
+    portfolio.count_eligible_by_group(70)
+    portfolio.threshold_sweep(np.arange(50, 91))
+"""
+
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ahp_model import ELIGIBILITY_THRESHOLD
+
+# Group of applicants whose group label is None or NaN
+MISSING_GROUP = '<missing>'
+
+
+def _factorize(groups: Sequence[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted group labels and the index of each applicant's label among them"""
+    groups = np.asarray(groups)
+    if groups.dtype.kind == 'f':
+        missing = np.isnan(groups)
+    elif groups.dtype == object:
+        missing = np.array([g is None or (isinstance(g, float) and np.isnan(g)) for g in groups.tolist()],
+                           dtype=bool).reshape(groups.shape)
+    else:
+        return np.unique(groups, return_inverse=True)
+    if not missing.any():
+        return np.unique(groups, return_inverse=True)
+
+    # Missing labels get a group of their own, after all the others
+    labels, present_codes = np.unique(groups[~missing], return_inverse=True)
+    labels = np.append(labels.astype(object), np.array([MISSING_GROUP], dtype=object))
+    codes = np.full(groups.shape, len(labels) - 1, dtype=np.intp)
+    codes[~missing] = present_codes
+    return labels, codes
+
+
+class ScoredPortfolio:
+    """
+    Sorted index of portfolio scores.
+
+    Attributes:
+        scores (np.ndarray): (N,) percentage score per applicant, in input order
+        order (np.ndarray): (N,) applicant indices by ascending score
+        sorted_scores (np.ndarray): (N,) scores in ascending order
+        groups (np.ndarray): (G,) group labels, sorted; None and NaN labels
+            are gathered in a last `MISSING_GROUP` group
+        offsets (np.ndarray): (G + 1,) start of each group's segment in
+            `group_order` and `group_sorted_scores`
+        group_order (np.ndarray): (N,) applicant indices by group, then score
+        group_sorted_scores (np.ndarray): (N,) scores by group, then score
+    """
+
+    def __init__(self, scores: np.ndarray, groups: Optional[Sequence[Hashable]] = None):
+        self.scores = np.asarray(scores, dtype=float)
+        if self.scores.ndim != 1:
+            raise ValueError(f"Expected (N,) scores, got shape {self.scores.shape}")
+        if not len(self.scores):
+            raise ValueError("Cannot index an empty portfolio")
+        if np.isnan(self.scores).any():
+            raise ValueError("Scores must not be NaN")
+        self.order = np.argsort(self.scores, kind='stable')
+        self.sorted_scores = self.scores[self.order]
+
+        if groups is None:
+            groups = np.zeros(len(self.scores), dtype=int)
+        self.groups, group_codes = _factorize(groups)
+        if len(group_codes) != len(self.scores):
+            raise ValueError(f"Expected {len(self.scores)} group labels, got {len(group_codes)}")
+        self.group_order = np.lexsort((self.scores, group_codes))
+        self.group_sorted_scores = self.scores[self.group_order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(group_codes, minlength=len(self.groups)))])
+        self._group_index = {group: g for g, group in enumerate(self.groups.tolist())}
+
+    @classmethod
+    def from_applicants(
+        cls,
+        calculator,
+        applicants,
+        groups: Optional[Sequence[Hashable]] = None,
+        criteria: Optional[Sequence[str]] = None
+    ) -> "ScoredPortfolio":
+        """
+        Score a portfolio with `AHPCalculator.score_batch` and index it.
+
+        Args:
+            calculator (AHPCalculator): Calculator to score with
+            applicants: Anything `score_batch` accepts: an (N x k) array, a
+                DataFrame or an `ApplicantStore`
+            groups (Sequence[Hashable], optional): (N,) group label per applicant
+            criteria (Sequence[str], optional): Criterion of each array column
+
+        Raises:
+            ValueError: If the portfolio is empty or cannot be scored
+        """
+        scores = calculator.score_batch(applicants, criteria)
+        if scores is None:
+            raise ValueError("Portfolio could not be scored; see the calculator log")
+        return cls(scores, groups)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def _group_slice(self, group: Hashable) -> slice:
+        """Segment of one group in `group_order` and `group_sorted_scores`"""
+        try:
+            g = self._group_index[group]
+        except KeyError:
+            raise KeyError(f"Unknown group {group!r}") from None
+        return slice(self.offsets[g], self.offsets[g + 1])
+
+    def _segment(self, group: Optional[Hashable]) -> np.ndarray:
+        """Sorted scores of one group, or of the whole portfolio"""
+        if group is None:
+            return self.sorted_scores
+        return self.group_sorted_scores[self._group_slice(group)]
+
+    def count_eligible(self, threshold: float = ELIGIBILITY_THRESHOLD, group: Optional[Hashable] = None) -> int:
+        """Number of applicants scoring at least `threshold`, overall or in one group"""
+        segment = self._segment(group)
+        return int(len(segment) - np.searchsorted(segment, threshold, side='left'))
+
+    def count_eligible_by_group(self, threshold: float = ELIGIBILITY_THRESHOLD) -> Dict[Hashable, int]:
+        """Number of applicants scoring at least `threshold` in every group"""
+        return {group: self.count_eligible(threshold, group) for group in self.groups.tolist()}
+
+    def eligibility_rate(self, threshold: float = ELIGIBILITY_THRESHOLD, group: Optional[Hashable] = None) -> float:
+        """Share of applicants scoring at least `threshold`, overall or in one group"""
+        size = len(self._segment(group))
+        return self.count_eligible(threshold, group) / size if size else 0.0
+
+    def percentile(self, score: float, group: Optional[Hashable] = None) -> float:
+        """Percentage of applicants, overall or in one group, scoring at most `score`"""
+        segment = self._segment(group)
+        return 100 * float(np.searchsorted(segment, score, side='right')) / len(segment) if len(segment) else 0.0
+
+    def applicant_percentile(self, index: int) -> float:
+        """Portfolio percentile of applicant `index`, ties counted as scoring at most theirs"""
+        return self.percentile(self.scores[index])
+
+    def top_k(self, k: int, group: Optional[Hashable] = None) -> np.ndarray:
+        """
+        Indices of the `k` highest-scoring applicants, best first.
+
+        Args:
+            k (int): Number of applicants
+            group (Hashable, optional): Only rank applicants of this group
+
+        Returns:
+            np.ndarray: (min(k, size),) applicant indices into `scores`
+        """
+        order = self.order if group is None else self.group_order[self._group_slice(group)]
+        return order[::-1][:max(k, 0)]
+
+    def threshold_sweep(self, thresholds: Sequence[float], by_group: bool = False) -> Dict[str, Any]:
+        """
+        Eligibility counts and rates over a grid of thresholds.
+
+        All thresholds are searched at once in the sorted scores, so a sweep
+        costs O(T log N) per segment without touching the scores again.
+
+        Args:
+            thresholds (Sequence[float]): (T,) thresholds in percent
+            by_group (bool): Also return counts per group
+
+        Returns:
+            Dict[str, Any]:
+                - thresholds: (T,) thresholds
+                - eligible: (T,) eligible applicants at each threshold
+                - rate: (T,) eligible share at each threshold
+                - by_group: (G, T) eligible applicants per group, in `groups`
+                  order (only with by_group)
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        eligible = len(self.sorted_scores) - np.searchsorted(self.sorted_scores, thresholds, side='left')
+        sweep = {
+            'thresholds': thresholds,
+            'eligible': eligible,
+            'rate': eligible / len(self.sorted_scores) if len(self.sorted_scores) else np.zeros(len(thresholds)),
+        }
+        if by_group:
+            counts = np.empty((len(self.groups), len(thresholds)), dtype=np.intp)
+            for g in range(len(self.groups)):
+                segment = self.group_sorted_scores[self.offsets[g]:self.offsets[g + 1]]
+                counts[g] = len(segment) - np.searchsorted(segment, thresholds, side='left')
+            sweep['by_group'] = counts
+        return sweep
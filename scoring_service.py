@@ -0,0 +1,484 @@
+"""
+Asyncio HTTP scoring service for the AHP credit scoring system
+
+Exposes `AHPCalculator.check_eligibility` to loan-origination systems over
+plain HTTP/1.1 with JSON bodies, using only the standard library. One model
+is loaded per process. Single-applicant requests that arrive within
+`max_wait` seconds of each other are grouped by a `MicroBatcher` into one
+vectorized `check_eligibility_batch` call of at most `max_batch_size` rows.
+
+Endpoints:
+    POST /v1/eligibility          {"scores": {"U1A1": 3, ...}}
+    POST /v1/eligibility/answers  {"answers": {"u1_q1": "...", ...}}
+    POST /v1/eligibility/batch    {"criteria": ["U1A1", ...], "scores": [[3, ...], ...]}
+    GET  /healthz                 model version
+    GET  /stats                   request count, p50/p99 latency, mean batch size
+    GET  /metrics                 `ahp_metrics` in Prometheus text format
+
+`ScoringClient` is a small keep-alive client for tests and load generation.
+
+Usage:
+    python scoring_service.py --port 8000 --max-batch-size 256 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from collections import deque
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import ahp_metrics
+from ahp_calculation import AHPCalculator
+from ahp_model import DEFAULT_ARTIFACT_PATH
+from questionnaire import FRONTEND_QUESTIONNAIRE, Questionnaire
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT = 0.002
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 16 << 20
+
+# Requests kept for the latency percentiles reported by /stats
+LATENCY_WINDOW = 100_000
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class MicroBatcher:
+    """
+    Groups concurrently submitted rows into one scoring call per column layout.
+
+    The first queued row opens a batch, which is scored once it holds
+    `max_batch_size` rows or `max_wait` seconds have passed, whichever is
+    first. Rows are submitted with the criteria their columns hold, and the
+    rows of each distinct layout in a batch are scored together.
+
+    Attributes:
+        max_batch_size (int): Most rows scored per call
+        max_wait (float): Seconds a batch waits for more rows
+        batch_sizes (deque): Sizes of the most recent batches
+    """
+
+    def __init__(self, score_rows, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT):
+        """
+        Args:
+            score_rows (Callable): Maps an (N x k) array and its k criteria
+                to (N,) scores and (N,) eligibility flags
+            max_batch_size (int): Most rows scored per call
+            max_wait (float): Seconds a batch waits for more rows
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_rows = score_rows
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, row: np.ndarray, criteria: Tuple[str, ...]) -> Tuple[float, bool]:
+        """Queue one row of `criteria` scores and wait for its score and eligibility"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((criteria, row, future))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        items = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch_size:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        return items
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            self.batch_sizes.append(len(items))
+            layouts: Dict[Tuple[str, ...], Tuple[list, list]] = {}
+            for criteria, row, future in items:
+                rows, futures = layouts.setdefault(criteria, ([], []))
+                rows.append(row)
+                futures.append(future)
+            for criteria, (rows, futures) in layouts.items():
+                self._score(np.vstack(rows), criteria, futures)
+
+    def _score(self, rows: np.ndarray, criteria: Tuple[str, ...], futures: List[asyncio.Future]):
+        try:
+            scores, eligible = self.score_rows(rows, criteria)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, score, is_eligible in zip(futures, scores.tolist(), eligible.tolist()):
+            if not future.done():
+                future.set_result((score, is_eligible))
+
+
+class ScoringService:
+    """
+    HTTP front end for one `AHPCalculator`.
+
+    Attributes:
+        calculator (AHPCalculator): Calculator with consistent matrices
+        questionnaire (Questionnaire): Questionnaire for the answers endpoint
+        batcher (MicroBatcher): Groups single-applicant requests
+        latencies (deque): Handling time in seconds of recent scoring requests
+    """
+
+    def __init__(
+        self,
+        calculator: AHPCalculator,
+        questionnaire: Questionnaire = FRONTEND_QUESTIONNAIRE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        if calculator.model is None:
+            raise RuntimeError("Cannot calculate score: Inconsistent matrices: "
+                               + "; ".join(calculator.get_consistency_summary()))
+        self.calculator = calculator
+        self.criteria = calculator.model.criteria
+        self.questionnaire = questionnaire
+        self._answer_criteria = tuple(questionnaire.criteria)
+        missing = set(self._answer_criteria) - set(self.criteria)
+        if missing:
+            raise ValueError(f"Questionnaire criteria not in the model: {sorted(missing)}")
+
+        self.batcher = MicroBatcher(self._score_rows, max_batch_size, max_wait)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ('POST', '/v1/eligibility'): self._eligibility,
+            ('POST', '/v1/eligibility/answers'): self._eligibility_answers,
+            ('POST', '/v1/eligibility/batch'): self._eligibility_batch,
+            ('GET', '/healthz'): self._health,
+            ('GET', '/stats'): self._stats,
+            ('GET', '/metrics'): self._metrics,
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """Start listening; returns the bound port (useful with port 0)"""
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    def _score_rows(self, rows: np.ndarray, criteria: Optional[Sequence[str]] = None):
+        """(N,) scores and eligibility flags of rows in `criteria` (default model) order"""
+        result = self.calculator.check_eligibility_batch(rows, list(self.criteria if criteria is None else criteria))
+        if result['score'] is None:
+            raise RuntimeError(result['message'])
+        return result['score'], result['eligible']
+
+    def _decision(self, score: float, eligible: bool) -> Dict[str, Any]:
+        return {
+            'score': score,
+            'eligible': eligible,
+            'message': 'Eligible for loan' if eligible else 'Not eligible for loan',
+            'model_version': self.calculator.model_version,
+        }
+
+    async def _eligibility(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        scores = payload.get('scores')
+        if not isinstance(scores, dict):
+            raise ValueError("Expected a 'scores' object keyed by criterion")
+        unknown = scores.keys() - set(self.criteria)
+        if unknown or not scores:
+            raise ValueError(f"Unknown criteria {sorted(unknown)}" if unknown else "No scores given")
+        # Scored on the criteria given, like `calculate_score`, in model order
+        criteria = tuple(c for c in self.criteria if c in scores)
+        row = np.array([scores[c] for c in criteria], dtype=float)
+        # Checked here, as one bad row would fail its whole micro-batch
+        if not np.isfinite(row).all():
+            raise ValueError("Scores must be finite numbers")
+        return self._decision(*await self.batcher.submit(row, criteria))
+
+    async def _eligibility_answers(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        answers = payload.get('answers')
+        if not isinstance(answers, dict):
+            raise ValueError("Expected an 'answers' object keyed by question id")
+        row = self.questionnaire.scores(self.questionnaire.encode_answers(answers))
+        return self._decision(*await self.batcher.submit(row, self._answer_criteria))
+
+    async def _eligibility_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        criteria = payload.get('criteria', self.criteria)
+        if not isinstance(criteria, (list, tuple)) or not criteria:
+            raise ValueError("Expected 'criteria' as a non-empty list of criterion names")
+        scores = np.asarray(payload.get('scores'), dtype=float)
+        if scores.ndim != 2:
+            raise ValueError("Expected 'scores' as a list of rows")
+        if not np.isfinite(scores).all():
+            raise ValueError("Scores must be finite numbers")
+        try:
+            final_scores, eligible = self._score_rows(scores, criteria)
+        except RuntimeError as e:
+            raise ValueError(str(e)) from None
+        return {
+            'score': final_scores.tolist(),
+            'eligible': eligible.tolist(),
+            'model_version': self.calculator.model_version,
+        }
+
+    async def _health(self, payload) -> Dict[str, Any]:
+        return {'status': 'ok', 'model_version': self.calculator.model_version}
+
+    async def _stats(self, payload) -> Dict[str, Any]:
+        return self.stats()
+
+    async def _metrics(self, payload) -> str:
+        return ahp_metrics.render()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request count, latency percentiles in milliseconds and mean batch size"""
+        latencies = np.array(self.latencies)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000 if len(latencies) else (None, None)
+        batch_sizes = self.batcher.batch_sizes
+        return {
+            'requests': len(latencies),
+            'p50_ms': None if p50 is None else float(p50),
+            'p99_ms': None if p99 is None else float(p99),
+            'mean_batch_size': float(np.mean(batch_sizes)) if batch_sizes else None,
+        }
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return 405, {'error': f"Method {method} not allowed for {path}"}
+            return 404, {'error': f"Unknown path {path}"}
+        try:
+            payload = json.loads(body) if body else {}
+            return 200, await handler(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e)}
+        except Exception:
+            logger.exception("Failed to handle %s %s", method, path)
+            return 500, {'error': 'Internal error'}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    self._respond(writer, 400, {'error': 'Malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self._respond(writer, 400, {'error': 'Invalid Content-Length'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, {'error': 'Request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                started = perf_counter()
+                status, payload = await self._dispatch(method, target.split('?')[0], body)
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if method == 'POST':
+                    self.latencies.append(perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), ahp_metrics.CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(payload).encode(), 'application/json'
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+
+class ScoringClient:
+    """
+    Minimal keep-alive HTTP client for a `ScoringService`.
+
+    Usage:
+        async with ScoringClient(port=8000) as client:
+            decision = await client.check_eligibility({'U1A1': 3, ...})
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def __aenter__(self) -> "ScoringClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, Any]:
+        """
+        Send one request over the open connection.
+
+        Returns:
+            Tuple[int, Any]:
+                - HTTP status
+                - Decoded JSON body, or the text body for /metrics
+        """
+        if self._writer is None:
+            await self.connect()
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                           .encode('latin-1') + body)
+        await self._writer.drain()
+
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        data = await self._reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        if headers.get('content-type') == 'application/json':
+            return status, json.loads(data)
+        return status, data.decode()
+
+    async def check_eligibility(self, scores: Dict[str, float]) -> Dict[str, Any]:
+        return await self._post('/v1/eligibility', {'scores': scores})
+
+    async def check_answers(self, answers: Dict[str, str]) -> Dict[str, Any]:
+        return await self._post('/v1/eligibility/answers', {'answers': answers})
+
+    async def check_eligibility_batch(self, scores, criteria: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        payload = {'scores': np.asarray(scores, dtype=float).tolist()}
+        if criteria is not None:
+            payload['criteria'] = list(criteria)
+        return await self._post('/v1/eligibility/batch', payload)
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        status, result = await self.request('POST', path, payload)
+        if status != 200:
+            raise ValueError(f"HTTP {status}: {result.get('error')}")
+        return result
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    artifact_path: str = DEFAULT_ARTIFACT_PATH,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_wait: float = DEFAULT_MAX_WAIT
+):
+    """Load the model once and serve until cancelled"""
+    service = ScoringService(AHPCalculator(artifact_path=artifact_path), max_batch_size=max_batch_size,
+                             max_wait=max_wait)
+    bound_port = await service.start(host, port)
+    logger.info("Serving model %s on http://%s:%d", service.calculator.model_version, host, bound_port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+        logger.info("Stopped: %s", service.stats())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Serve AHP eligibility checks over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH, help="model artifact file")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help=f"most requests scored per call (default {DEFAULT_MAX_BATCH_SIZE})")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help=f"milliseconds a batch waits for more requests (default {DEFAULT_MAX_WAIT * 1000:g})")
+    parser.add_argument("--metrics", action="store_true", help="collect ahp_metrics for /metrics")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    if args.metrics:
+        ahp_metrics.enable()
+    try:
+        asyncio.run(serve(args.host, args.port, args.artifact, args.max_batch_size, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError, RuntimeError) as e:
+        logger.error("%s", e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
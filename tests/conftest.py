@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ahp_metrics  # noqa: E402
+from ahp_calculation import AHPCalculator  # noqa: E402
+
+# Reciprocal U4 judgments that contradict each other (CR well above 0.1)
+INCONSISTENT_U4 = [[1, 9, 1/9], [1/9, 1, 9], [9, 1/9, 1]]
+
+
+@pytest.fixture(scope='session')
+def calculator():
+    return AHPCalculator()
+
+
+@pytest.fixture(scope='session')
+def inconsistent_calculator():
+    return AHPCalculator(matrices={'U4': INCONSISTENT_U4})
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def metrics():
+    was_enabled = ahp_metrics.is_enabled()
+    ahp_metrics.reset()
+    ahp_metrics.enable()
+    yield ahp_metrics
+    if not was_enabled:
+        ahp_metrics.disable()
+    ahp_metrics.reset()
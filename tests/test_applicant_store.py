@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from applicant_store import ApplicantStore
+from questionnaire import FRONTEND_QUESTIONNAIRE
+
+N_APPLICANTS = 40
+
+
+@pytest.fixture
+def codes(rng):
+    return rng.integers(0, FRONTEND_QUESTIONNAIRE.n_options, size=(N_APPLICANTS, len(FRONTEND_QUESTIONNAIRE.questions)))
+
+
+@pytest.fixture
+def store(codes):
+    return ApplicantStore.from_codes(codes, FRONTEND_QUESTIONNAIRE)
+
+
+def test_answer_store_is_one_byte_per_question(store, codes):
+    assert store.nbytes == codes.size
+    np.testing.assert_array_equal(store.codes(), codes)
+
+
+def test_answer_store_scores_like_the_score_matrix(store, calculator):
+    expected = calculator.score_batch(store.score_matrix(), list(store.criteria))
+    np.testing.assert_allclose(calculator.score_batch(store), expected)
+
+
+def test_score_store_matches_arrays(calculator, rng):
+    criteria = list(calculator.weights)
+    scores = rng.integers(1, 6, size=(N_APPLICANTS, len(criteria))).astype(float)
+    store = ApplicantStore.from_scores(scores, criteria)
+    np.testing.assert_array_equal(store.score_matrix(), scores)
+    np.testing.assert_allclose(calculator.score_batch(store), calculator.score_batch(scores, criteria))
+
+
+def test_records_behave_like_score_dicts(store, calculator):
+    record = store[3]
+    scores = dict(zip(store.criteria, store.score_matrix()[3]))
+    assert dict(record) == scores
+    assert calculator.check_eligibility(record)['score'] == pytest.approx(
+        calculator.check_eligibility(scores)['score'])
+    assert FRONTEND_QUESTIONNAIRE.score_dict(record.answers) == scores
+    assert store[-1].codes.tolist() == store.codes()[-1].tolist()
+    with pytest.raises(IndexError):
+        store[N_APPLICANTS]
+    with pytest.raises(KeyError):
+        record['X1']
+
+
+def test_slices_and_chunks(store):
+    assert len(store[5:15]) == 10
+    chunks = list(store.score_chunks(chunk_size=16))
+    assert [len(chunk) for chunk in chunks] == [16, 16, 8]
+    np.testing.assert_array_equal(np.concatenate(chunks), store.score_matrix())
+
+
+@pytest.mark.parametrize('bad', [np.full((2, 10), 9), np.zeros((2, 3))])
+def test_invalid_codes_are_rejected(bad):
+    with pytest.raises(ValueError):
+        ApplicantStore.from_codes(bad, FRONTEND_QUESTIONNAIRE)
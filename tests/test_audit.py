@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pytest
+
+import ahp_audit
+import ahp_metrics
+from ahp_audit import AuditSink, read_segments
+from ahp_calculation import AHPCalculator
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = AuditSink(str(tmp_path), flush_interval=60)
+    yield sink
+    sink.close()
+
+
+def failing_once(sink, call):
+    """Make the `call`-th write of a sink fail with a full disk"""
+    write, calls = sink._write, []
+
+    def _write(lines):
+        calls.append(len(lines))
+        if len(calls) == call:
+            raise OSError(28, 'No space left on device')
+        write(lines)
+    sink._write = _write
+
+
+def test_calculator_decisions_are_recorded(sink, tmp_path, calculator):
+    audited = AHPCalculator(audit_sink=sink)
+    single = audited.check_eligibility({'U1A1': 5, 'U4D3': 4})
+    batch = audited.check_eligibility_batch(np.array([[1, 2], [5, 5]]), ['U2B1', 'U3C2'])
+    sink.flush()
+
+    rows = list(read_segments(str(tmp_path)))
+    assert [row['inputs'] for row in rows] == [{'U1A1': 5, 'U4D3': 4}, {'U2B1': 1, 'U3C2': 2},
+                                               {'U2B1': 5, 'U3C2': 5}]
+    assert rows[0]['score'] == pytest.approx(single['score'])
+    assert [row['eligible'] for row in rows[1:]] == batch['eligible'].tolist()
+    assert {row['model'] for row in rows} == {calculator.content_hash}
+    assert {row['threshold'] for row in rows} == {70}
+
+
+def test_inputs_are_copied(sink, tmp_path):
+    inputs = {'a': 1}
+    batch = np.array([[1.0], [2.0]])
+    sink.record(inputs, 50.0, False, 70, 'hash')
+    scores, eligible = np.array([10.0, 20.0]), np.zeros(2, dtype=bool)
+    sink.record_batch(['a'], batch, scores, eligible, 70, 'hash')
+    inputs['a'] = 2
+    batch[:] = 0
+    scores[:] = 99
+    eligible[:] = True
+    sink.flush()
+    rows = list(read_segments(str(tmp_path)))
+    assert [row['inputs']['a'] for row in rows] == [1, 1.0, 2.0]
+    assert [row['score'] for row in rows[1:]] == [10.0, 20.0]
+    assert not any(row['eligible'] for row in rows)
+
+
+def test_segments_rotate_and_restart(tmp_path):
+    with AuditSink(str(tmp_path), flush_interval=60, max_segment_bytes=200) as sink:
+        for i in range(10):
+            sink.record({'a': i}, None, False, 70, 'hash')
+            sink.flush()
+    with AuditSink(str(tmp_path), flush_interval=60) as sink:
+        sink.record({'a': 10}, float('nan'), False, 70, 'hash')
+
+    segments = sorted(os.listdir(tmp_path))
+    assert len(segments) > 2
+    rows = list(read_segments(str(tmp_path)))
+    assert [row['inputs']['a'] for row in rows] == list(range(11))
+    assert rows[0]['score'] is None
+
+
+def test_closed_sink_rejects_records(tmp_path):
+    sink = AuditSink(str(tmp_path))
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.record({'a': 1}, 50.0, False, 70, 'hash')
+
+
+def test_failed_write_keeps_decisions_queued(sink, tmp_path, monkeypatch):
+    monkeypatch.setattr(ahp_audit, 'WRITE_BATCH', 3)
+    failing_once(sink, 2)
+    sink.record({'a': 1}, 50.0, False, 70, 'hash')
+    sink.record_batch(['a'], np.arange(5)[:, np.newaxis], np.arange(5.0), np.zeros(5, dtype=bool), 70, 'hash')
+    sink.record({'a': 7}, 90.0, True, 70, 'hash')
+
+    with pytest.raises(OSError):
+        sink.flush()
+    # The first write (3 lines) went through; the other 4 decisions wait
+    assert sink.pending == 4
+
+    sink.flush()
+    assert sink.pending == 0
+    assert [row['inputs']['a'] for row in read_segments(str(tmp_path))] == [1, 0, 1, 2, 3, 4, 7]
+
+
+def test_close_writes_decisions_after_failed_flush(sink, tmp_path):
+    failing_once(sink, 1)
+    sink.record({'a': 1}, 50.0, False, 70, 'hash')
+    with pytest.raises(OSError):
+        sink.flush()
+    sink.close()
+    assert [row['inputs']['a'] for row in read_segments(str(tmp_path))] == [1]
+
+
+def test_unserialisable_inputs_are_written(sink, tmp_path):
+    sink.record({'a': object()}, 50.0, False, 70, 'hash')
+    sink.flush()
+    rows = list(read_segments(str(tmp_path)))
+    assert len(rows) == 1 and isinstance(rows[0]['inputs']['a'], str)
+
+
+def test_full_queue_drops_new_decisions(tmp_path, metrics):
+    with AuditSink(str(tmp_path), flush_interval=60, max_pending=3, overflow='drop') as sink:
+        queued = [sink.record({'a': i}, 50.0, False, 70, 'hash') for i in range(5)]
+        assert not sink.record_batch(['a'], np.ones((2, 1)), np.ones(2), np.zeros(2, dtype=bool), 70, 'hash')
+        assert queued == [True, True, True, False, False]
+        assert sink.pending == 3 and sink.dropped == 4
+        assert ahp_metrics.AUDIT_DROPPED.value() == 4
+        sink.flush()
+        assert sink.record({'a': 5}, 50.0, False, 70, 'hash')
+    assert [row['inputs']['a'] for row in read_segments(str(tmp_path))] == [0, 1, 2, 5]
+
+
+def test_full_queue_blocks_until_written(tmp_path):
+    with AuditSink(str(tmp_path), flush_interval=60, max_pending=2) as sink:
+        for i in range(5):
+            sink.record({'a': i}, 50.0, False, 70, 'hash')
+            assert sink.pending <= 2
+        # A batch larger than the queue waits for it to empty
+        sink.record_batch(['a'], np.arange(5, 9)[:, np.newaxis], np.ones(4), np.zeros(4, dtype=bool), 70, 'hash')
+        assert sink.dropped == 0
+    assert [row['inputs']['a'] for row in read_segments(str(tmp_path))] == list(range(9))
+
+
+def test_invalid_queue_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        AuditSink(str(tmp_path), overflow='discard')
+    with pytest.raises(ValueError):
+        AuditSink(str(tmp_path), max_pending=0)
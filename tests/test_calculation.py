@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ahp_calculation import AHPCalculator
+from conftest import INCONSISTENT_U4
+
+
+def test_batch_matches_single_checks(calculator, rng):
+    criteria = list(calculator.weights)
+    scores = rng.uniform(1, 5, size=(50, len(criteria)))
+    batch = calculator.check_eligibility_batch(scores, criteria)
+    for row, score, eligible in zip(scores, batch['score'], batch['eligible']):
+        single = calculator.check_eligibility(dict(zip(criteria, row)))
+        assert single['score'] == pytest.approx(score)
+        assert single['eligible'] == eligible
+
+
+def test_batch_matches_single_checks_on_a_subset(calculator):
+    criteria = ['U4D1', 'U1A2', 'U3C4']
+    scores = np.array([[5, 1, 3], [2, 2, 2]], dtype=float)
+    batch = calculator.check_eligibility_batch(scores, criteria)
+    for row, score in zip(scores, batch['score']):
+        assert calculator.check_eligibility(dict(zip(criteria, row)))['score'] == pytest.approx(score)
+
+
+def test_batch_accepts_data_frames(calculator, rng):
+    criteria = list(calculator.weights)
+    scores = rng.uniform(1, 5, size=(5, len(criteria)))
+    frame = pd.DataFrame(scores[:, ::-1], columns=criteria[::-1])
+    np.testing.assert_allclose(calculator.score_batch(frame), calculator.score_batch(scores, criteria))
+
+
+def test_failed_checks_are_not_eligible(inconsistent_calculator):
+    single = inconsistent_calculator.check_eligibility({'U1A1': 3})
+    batch = inconsistent_calculator.check_eligibility_batch(np.ones((2, 1)), ['U1A1'])
+    assert single['score'] is None and single['eligible'] is False
+    assert batch['score'] is None and batch['eligible'] is False
+
+
+def test_unknown_criteria_fail_batch_check(calculator):
+    result = calculator.check_eligibility_batch(np.ones((2, 1)), ['X1'])
+    assert result['score'] is None and result['eligible'] is False
+    assert result['message'] == 'Score calculation failed'
+
+
+@pytest.mark.parametrize('matrices', [
+    {'U9': np.eye(3)},
+    {'U4': np.ones((2, 3))},
+    {'U4': [[1, 2, 4], [0.5, 1, 3], [0.25, 1/3, 0]]},
+    {'U4': [[1, 20, 4], [1/20, 1, 3], [0.25, 1/3, 1]]},
+])
+def test_invalid_matrices_are_rejected(matrices):
+    with pytest.raises(ValueError):
+        AHPCalculator(matrices=matrices)
+
+
+def test_replacement_matrix_is_used():
+    calculator = AHPCalculator(matrices={'U4': INCONSISTENT_U4})
+    np.testing.assert_allclose(calculator.U4_matrix, INCONSISTENT_U4)
+    assert not calculator.consistency_results['U4']['is_consistent']
+
+
+@pytest.mark.parametrize('value', [None, np.nan, np.inf])
+def test_non_finite_scores_fail(calculator, value):
+    single = calculator.check_eligibility({'U1A1': 3, 'U2B1': value})
+    batch = calculator.check_eligibility_batch(np.array([[3, 3], [3, value]], dtype=float), ['U1A1', 'U2B1'])
+    assert single['score'] is None and single['eligible'] is False
+    assert single['message'] == 'Score calculation failed'
+    assert batch['score'] is None and batch['eligible'] is False
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from ahp_calculation import AHPCalculator
+from ahp_core import (
+    WEIGHT_METHODS,
+    complete_reciprocals,
+    consistency_check,
+    consistency_check_batch,
+    derive_weights,
+    eigenvector_weights,
+    geometric_mean_weights,
+    llsm_weights,
+    normalize_matrix,
+    normalize_matrix_batch,
+    validate_matrices,
+)
+
+
+def random_reciprocal(rng, n, size):
+    """(size, n, n) reciprocal matrices with judgments between 1/9 and 9"""
+    matrices = np.ones((size, n, n))
+    rows, cols = np.triu_indices(n, 1)
+    values = rng.choice(np.r_[1 / np.arange(2, 10), np.arange(1, 10)], size=(size, len(rows)))
+    matrices[:, rows, cols] = values
+    matrices[:, cols, rows] = 1 / values
+    return matrices
+
+
+@pytest.mark.parametrize('n', [2, 3, 7, 12])
+def test_batch_matches_single_matrices(rng, n):
+    matrices = random_reciprocal(rng, n, 20)
+    normalized, weights = normalize_matrix_batch(matrices)
+    lambda_max, CI, CR = consistency_check_batch(matrices, weights)
+    for i, matrix in enumerate(matrices):
+        expected_normalized, expected_weights = normalize_matrix(matrix)
+        np.testing.assert_allclose(normalized[i], expected_normalized)
+        np.testing.assert_allclose(weights[i], expected_weights)
+        np.testing.assert_allclose((lambda_max[i], CI[i], CR[i]),
+                                   consistency_check(matrix, expected_weights), atol=1e-12)
+
+
+def test_consistent_matrix_has_zero_ratio():
+    weights = np.array([0.5, 0.3, 0.2])
+    matrix = weights[:, np.newaxis] / weights
+    lambda_max, CI, CR = consistency_check_batch(matrix[np.newaxis], weights[np.newaxis])
+    assert lambda_max[0] == pytest.approx(3)
+    assert CR[0] == pytest.approx(0, abs=1e-12)
+
+
+@pytest.mark.parametrize('n', [3, 7, 12])
+def test_eigenvector_weights_match_numpy(rng, n):
+    matrices = random_reciprocal(rng, n, 10)
+    weights, iterations = eigenvector_weights(matrices)
+    for matrix, w in zip(matrices, weights):
+        values, vectors = np.linalg.eig(matrix)
+        principal = np.abs(vectors[:, np.argmax(values.real)].real)
+        np.testing.assert_allclose(w, principal / principal.sum(), atol=1e-8)
+    single, _ = eigenvector_weights(matrices[0])
+    np.testing.assert_allclose(single, weights[0], atol=1e-10)
+    assert (iterations >= 1).all()
+
+
+def test_eigenvector_method_gives_exact_lambda_max(rng):
+    matrices = random_reciprocal(rng, 5, 10)
+    _, weights = normalize_matrix_batch(matrices, method='eigenvector')
+    lambda_max, _, _ = consistency_check_batch(matrices, weights)
+    np.testing.assert_allclose(lambda_max, np.linalg.eigvals(matrices).real.max(axis=1), rtol=1e-8)
+
+
+def test_unknown_weight_method_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_matrix_batch(np.ones((1, 3, 3)), method='median')
+    with pytest.raises(ValueError):
+        AHPCalculator(method='median')
+
+
+def test_calculator_uses_eigenvector_weights(calculator):
+    eigen = AHPCalculator(method='eigenvector')
+    expected, _ = eigenvector_weights(eigen.U1_matrix)
+    np.testing.assert_allclose([eigen.weights[f'U1A{i}'] for i in range(1, 8)], expected, atol=1e-8)
+    assert eigen.content_hash != calculator.content_hash
+
+
+def test_llsm_equals_geometric_mean_on_complete_matrices(rng):
+    matrices = random_reciprocal(rng, 6, 10)
+    np.testing.assert_allclose(llsm_weights(matrices), geometric_mean_weights(matrices), atol=1e-12)
+
+
+@pytest.mark.parametrize('method', WEIGHT_METHODS)
+def test_weight_methods_batch_matches_single(rng, method):
+    matrices = random_reciprocal(rng, 5, 8)
+    weights = derive_weights(matrices, method)
+    _, batch_weights = normalize_matrix_batch(matrices, method=method)
+    np.testing.assert_allclose(batch_weights, weights, atol=1e-8)
+    for matrix, expected in zip(matrices, weights):
+        np.testing.assert_allclose(derive_weights(matrix, method), expected, atol=1e-8)
+        np.testing.assert_allclose(normalize_matrix(matrix, method)[1], expected, atol=1e-8)
+    np.testing.assert_allclose(weights.sum(axis=1), 1)
+
+
+def test_llsm_handles_missing_judgments():
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    matrix = weights[:, np.newaxis] / weights
+    matrix[0, 3] = matrix[3, 0] = matrix[1, 2] = np.nan
+    np.testing.assert_allclose(llsm_weights(matrix), weights)
+
+
+@pytest.mark.parametrize('method', ['geometric_mean', 'llsm'])
+def test_calculator_uses_registered_weight_methods(method):
+    calculator = AHPCalculator(method=method)
+    expected = derive_weights(calculator.U2_matrix, method)
+    np.testing.assert_allclose([calculator.weights[f'U2B{i}'] for i in range(1, 5)], expected)
+
+
+def test_complete_reciprocals_fills_missing_judgments(rng):
+    matrix = random_reciprocal(rng, 4, 1)[0]
+    entered = np.triu(matrix, 1)
+    entered[entered == 0] = np.nan
+    entered[0, 3] = np.nan
+    completed = complete_reciprocals(entered)
+    expected = matrix.copy()
+    expected[0, 3] = expected[3, 0] = np.nan
+    np.testing.assert_allclose(completed, expected)
+
+
+def test_validate_matrices_marks_invalid_cells(rng):
+    matrices = random_reciprocal(rng, 4, 3)
+    assert not any(mask.any() for mask in validate_matrices(matrices).values())
+
+    matrices[0, 0, 1] = np.nan
+    matrices[1, 1, 2] = -2
+    matrices[1, 3, 3] = 2
+    matrices[2, 0, 2] = 12
+    masks = validate_matrices(matrices)
+    assert list(zip(*np.nonzero(masks['missing']))) == [(0, 0, 1)]
+    assert list(zip(*np.nonzero(masks['not_positive']))) == [(1, 1, 2)]
+    assert list(zip(*np.nonzero(masks['diagonal']))) == [(1, 3, 3)]
+    assert list(zip(*np.nonzero(masks['out_of_scale']))) == [(2, 0, 2)]
+    assert set(zip(*np.nonzero(masks['not_reciprocal']))) == {(1, 1, 2), (1, 2, 1), (1, 3, 3),
+                                                               (2, 0, 2), (2, 2, 0)}
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from ahp_calculation import AHPCalculator
+from ahp_core import consistency_check, normalize_matrix
+from ahp_group import aggregate_group, aggregate_judgments, build_group_calculator
+from conftest import INCONSISTENT_U4
+
+U4 = np.array([[1, 2, 4], [1/2, 1, 3], [1/4, 1/3, 1]])
+OTHER_U4 = np.array([[1, 3, 5], [1/3, 1, 2], [1/5, 1/2, 1]])
+
+
+def test_consensus_is_the_geometric_mean():
+    consensus = aggregate_judgments(np.stack([U4, OTHER_U4]))
+    np.testing.assert_allclose(consensus, np.sqrt(U4 * OTHER_U4))
+    np.testing.assert_allclose(consensus * consensus.T, 1)
+
+
+def test_weighted_consensus():
+    consensus = aggregate_judgments(np.stack([U4, OTHER_U4]), np.array([3.0, 1.0]))
+    np.testing.assert_allclose(consensus, U4 ** 0.75 * OTHER_U4 ** 0.25)
+    np.testing.assert_allclose(aggregate_judgments(np.stack([U4, OTHER_U4]), np.array([1.0, 0.0])), U4)
+
+
+@pytest.mark.parametrize('weights', [np.array([1.0]), np.array([-1.0, 2.0]), np.zeros(2)])
+def test_invalid_expert_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        aggregate_judgments(np.stack([U4, OTHER_U4]), weights)
+
+
+def test_expert_consistency_matches_single_checks():
+    matrices = np.stack([U4, OTHER_U4, np.array(INCONSISTENT_U4)])
+    result = aggregate_group(matrices)
+    for matrix, CR in zip(matrices, result['expert_CR']):
+        assert CR == pytest.approx(consistency_check(matrix, normalize_matrix(matrix)[1])[2])
+    assert result['expert_is_consistent'].tolist() == [True, True, False]
+    assert result['CR'] == pytest.approx(consistency_check(result['consensus'], result['weights'])[2])
+
+
+def test_consistency_weighting_drops_inconsistent_experts():
+    result = aggregate_group(np.stack([U4, OTHER_U4, np.array(INCONSISTENT_U4)]), 'consistency')
+    assert result['expert_weights'][2] == 0
+    assert result['expert_weights'].sum() == pytest.approx(1)
+    assert result['is_consistent']
+
+
+def test_group_calculator_scores_the_consensus():
+    calculator = build_group_calculator({'U4': np.stack([U4, OTHER_U4])})
+    expected = AHPCalculator(matrices={'U4': np.sqrt(U4 * OTHER_U4)})
+    assert calculator.weights == pytest.approx(expected.weights)
+    assert calculator.group_results['U4']['expert_CR'].shape == (2,)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from ahp_core import normalize_matrix
+from ahp_hierarchy import Criterion, Hierarchy
+from conftest import INCONSISTENT_U4
+
+PAIR = [[1, 3], [1/3, 1]]
+
+
+def three_level_tree():
+    income = Criterion('Income', (Criterion('Salary'), Criterion('Farm sales')), matrix=PAIR)
+    assets = Criterion('Assets', (Criterion('Land'), Criterion('Livestock')), weights=(0.5, 0.5))
+    repay = Criterion('Repay', (income, assets), matrix=[[1, 2], [1/2, 1]])
+    return Criterion('Credit score', (repay, Criterion('History')), weights=(0.8, 0.2))
+
+
+def test_global_weights_multiply_down_each_path():
+    hierarchy = Hierarchy(three_level_tree())
+    assert hierarchy.depth == 3
+    assert hierarchy.leaves == ('Salary', 'Farm sales', 'Land', 'Livestock', 'History')
+    expected = [0.8 * 2/3 * 0.75, 0.8 * 2/3 * 0.25, 0.8 / 3 * 0.5, 0.8 / 3 * 0.5, 0.2]
+    np.testing.assert_allclose(hierarchy.global_weights, expected)
+    assert hierarchy.score(dict.fromkeys(hierarchy.leaves, 5)) == pytest.approx(100)
+
+
+def test_calculator_tree_matches_calculator(calculator):
+    hierarchy = Hierarchy.from_calculator(calculator)
+    assert hierarchy.depth == 2
+    np.testing.assert_allclose(hierarchy.global_weights, calculator.model.global_weights)
+    scores = dict.fromkeys(hierarchy.leaves, 3)
+    scores['U1A1'] = 5
+    assert hierarchy.score(scores) == pytest.approx(calculator.model.score(scores))
+
+
+def test_local_weights_match_single_matrix_normalization():
+    matrix = np.array([[1, 2, 4], [1/2, 1, 2], [1/4, 1/2, 1]])
+    root = Criterion('Root', tuple(Criterion(name) for name in 'ABC'), matrix=matrix)
+    hierarchy = Hierarchy(root, method='eigenvector')
+    np.testing.assert_allclose(hierarchy.local_weights['Root'], normalize_matrix(matrix, 'eigenvector')[1])
+    assert hierarchy.consistency_results['Root']['CR'] == pytest.approx(0, abs=1e-9)
+
+
+def test_inconsistent_matrices_leave_no_model():
+    root = Criterion('Root', tuple(Criterion(name) for name in 'ABC'), matrix=INCONSISTENT_U4)
+    hierarchy = Hierarchy(root)
+    assert not hierarchy.is_consistent
+    assert hierarchy.model is None
+    with pytest.raises(RuntimeError):
+        hierarchy.score(dict.fromkeys('ABC', 1))
+
+
+@pytest.mark.parametrize('root', [
+    Criterion('Root', (Criterion('A'), Criterion('A')), matrix=PAIR),
+    Criterion('Root', (Criterion('A', matrix=[[1]]), Criterion('B')), matrix=PAIR),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=[[1, 2, 3], [1/2, 1, 2], [1/3, 1/2, 1]]),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=[[1, 3], [3, 1]]),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=[[1, 20], [1/20, 1]]),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=[[2, 3], [1/3, 1/2]]),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=[[1, np.inf], [0, 1]]),
+    Criterion('Root', (Criterion('A'), Criterion('B')), matrix=PAIR, weights=(0.5, 0.5)),
+    Criterion('Root', (Criterion('A'), Criterion('B')), weights=(1.0,)),
+    Criterion('Root', (Criterion('A'), Criterion('B'))),
+])
+def test_invalid_trees_are_rejected(root):
+    with pytest.raises(ValueError):
+        Hierarchy(root)
+
+
+def test_from_dict_builds_nested_criteria():
+    root = Criterion.from_dict({'name': 'Root', 'weights': [0.6, 0.4],
+                                'children': [{'name': 'A'}, {'name': 'B'}]})
+    assert root == Criterion('Root', (Criterion('A'), Criterion('B')), weights=(0.6, 0.4))
@@ -0,0 +1,50 @@
+import urllib.request
+
+import numpy as np
+
+import ahp_metrics
+from ahp_calculation import AHPCalculator
+from conftest import INCONSISTENT_U4
+
+
+def test_disabled_metrics_record_nothing(calculator):
+    ahp_metrics.disable()
+    ahp_metrics.reset()
+    calculator.check_eligibility({'U1A1': 3})
+    assert ahp_metrics.STAGE_CALLS.value('check_eligibility') == 0
+
+
+def test_stages_are_counted(metrics, calculator):
+    calculator.check_eligibility({'U1A1': 3})
+    calculator.check_eligibility({'X1': 3})
+    calculator.check_eligibility_batch(np.ones((7, 1)), ['U1A1'])
+
+    assert metrics.STAGE_CALLS.value('check_eligibility') == 2
+    assert metrics.STAGE_FAILURES.value('check_eligibility') == 1
+    assert metrics.STAGE_LATENCY.count('check_eligibility') == 2
+    assert metrics.STAGE_CALLS.value('check_eligibility_batch') == 1
+    assert metrics.APPLICANTS_SCORED.value() == 7
+
+
+def test_inconsistent_matrices_are_counted(metrics):
+    AHPCalculator(matrices={'U4': INCONSISTENT_U4})
+    assert metrics.INCONSISTENT_MATRICES.value('U4') == 1
+    assert metrics.STAGE_FAILURES.value('weight_derivation') == 1
+
+
+def test_exports(metrics, calculator, tmp_path):
+    calculator.check_eligibility({'U1A1': 3})
+    text = metrics.render()
+    assert 'ahp_stage_calls_total{stage="check_eligibility"} 1' in text
+    assert 'ahp_stage_latency_seconds_bucket{stage="check_eligibility",le="+Inf"} 1' in text
+
+    path = tmp_path / 'ahp.prom'
+    metrics.write_textfile(str(path))
+    assert path.read_text() == text
+
+    server = metrics.serve(port=0)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/metrics') as response:
+            assert response.read().decode() == text
+    finally:
+        server.shutdown()
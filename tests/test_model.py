@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+import ahp_model
+from ahp_calculation import AHPCalculator
+from ahp_model import MAX_SUB_SCORE, ScoringModel, load_artifact
+from conftest import INCONSISTENT_U4
+
+
+def test_model_holds_global_weights(calculator):
+    model = calculator.model
+    expected = [calculator.weights[c] * calculator.main_weights[c[:2]] for c in model.criteria]
+    np.testing.assert_allclose(model.global_weights, expected)
+    assert model.max_possible_score == pytest.approx(MAX_SUB_SCORE * sum(expected))
+
+
+def test_model_is_immutable(calculator):
+    model = calculator.model
+    with pytest.raises(AttributeError):
+        model.criteria = ()
+    with pytest.raises(ValueError):
+        model.global_weights[0] = 1.0
+
+
+def test_score_matches_score_batch(calculator, rng):
+    model = calculator.model
+    scores = rng.uniform(1, 5, size=(10, len(model)))
+    batch = model.score_batch(scores)
+    for row, expected in zip(scores, batch):
+        assert model.score(dict(zip(model.criteria, row))) == pytest.approx(expected)
+
+
+def test_top_scores_are_full_marks(calculator):
+    model = calculator.model
+    assert model.score(dict.fromkeys(model.criteria, MAX_SUB_SCORE)) == pytest.approx(100)
+    assert model.score({'U2B1': MAX_SUB_SCORE, 'U4D3': MAX_SUB_SCORE}) == pytest.approx(100)
+
+
+def test_columns_are_cached(calculator):
+    first = calculator.model.columns(['U1A1', 'U4D3'])
+    assert calculator.model.columns(['U1A1', 'U4D3']) is first
+
+
+def test_column_cache_keeps_recent_layouts(monkeypatch):
+    monkeypatch.setattr(ahp_model, 'COLUMN_CACHE_SIZE', 2)
+    model = ScoringModel(['A', 'B', 'C'], [0.5, 0.3, 0.2])
+    first = model.columns(['A'])
+    model.columns(['B'])
+    assert model.columns(['A']) is first
+    model.columns(['C'])
+    assert model.columns(['A']) is first
+    assert model.columns(['B']) is not None
+    assert len(model._columns) == 2
+
+
+def test_unknown_criteria_are_rejected(calculator):
+    with pytest.raises(KeyError):
+        calculator.model.columns(['X1'])
+
+
+def test_empty_and_weightless_layouts_are_rejected():
+    model = ScoringModel(['A', 'B'], [1.0, 0.0])
+    with pytest.raises(ValueError):
+        model.columns([])
+    with pytest.raises(ValueError):
+        model.columns(['B'])
+    with pytest.raises(ValueError):
+        model.score({})
+
+
+@pytest.mark.parametrize('value', [None, float('nan'), float('inf')])
+def test_non_finite_scores_are_rejected(calculator, value):
+    with pytest.raises(ValueError):
+        calculator.model.score({'U1A1': 3, 'U2B1': value})
+    with pytest.raises(ValueError):
+        calculator.model.score_batch([[3, 3], [3, value]], ['U1A1', 'U2B1'])
+
+
+def test_score_batch_checks_shape(calculator):
+    with pytest.raises(ValueError):
+        calculator.model.score_batch(np.ones((2, 3)))
+    with pytest.raises(ValueError):
+        ScoringModel(['A', 'B'], [1.0])
+
+
+def test_artifact_round_trip(tmp_path, calculator):
+    path = str(tmp_path / 'model.npz')
+    AHPCalculator(artifact_path=path)
+    artifact = load_artifact(path, calculator.content_hash)
+    assert artifact is not None
+    assert artifact['weights'] == pytest.approx(calculator.weights)
+    np.testing.assert_array_equal(artifact['model'].global_weights, calculator.model.global_weights)
+
+    loaded = AHPCalculator(artifact_path=path)
+    assert loaded.model_version == calculator.model_version
+    for category, result in calculator.consistency_results.items():
+        assert loaded.consistency_results[category]['CR'] == pytest.approx(result['CR'])
+
+
+def test_stale_artifact_is_ignored(tmp_path, calculator):
+    path = str(tmp_path / 'model.npz')
+    AHPCalculator(matrices={'U4': [[1, 3, 5], [1/3, 1, 2], [1/5, 1/2, 1]]}, artifact_path=path)
+    assert load_artifact(path, calculator.content_hash) is None
+
+    # Rebuilding with the default matrices replaces the stale artifact
+    rebuilt = AHPCalculator(artifact_path=path)
+    assert load_artifact(path, calculator.content_hash)['content_hash'] == rebuilt.content_hash
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda raw: raw[:len(raw) // 2],
+    lambda raw: b'PK\x03\x04' + raw[4:64],
+    lambda raw: b'not an artifact',
+])
+def test_corrupt_artifact_is_rebuilt(tmp_path, calculator, corrupt):
+    path = tmp_path / 'model.npz'
+    AHPCalculator(artifact_path=str(path))
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    assert load_artifact(str(path), calculator.content_hash) is None
+    rebuilt = AHPCalculator(artifact_path=str(path))
+    assert rebuilt.model is not None
+    assert load_artifact(str(path), calculator.content_hash) is not None
+
+
+def test_artifact_missing_members_is_ignored(tmp_path):
+    path = str(tmp_path / 'model.npz')
+    np.savez(path, version=np.array(1))
+    assert load_artifact(path) is None
+    plain = str(tmp_path / 'plain.npy')
+    np.save(plain, np.ones(3))
+    assert load_artifact(plain) is None
+
+
+def test_unwritable_artifact_path_is_not_fatal(tmp_path, calculator, caplog):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('')
+    unwritable = AHPCalculator(artifact_path=str(blocker / 'model.npz'))
+    assert unwritable.model is not None
+    assert unwritable.content_hash == calculator.content_hash
+    assert 'Could not save AHP model' in caplog.text
+
+
+def test_inconsistent_matrices_are_stored_without_a_model(tmp_path, inconsistent_calculator):
+    path = str(tmp_path / 'model.npz')
+    AHPCalculator(matrices={'U4': INCONSISTENT_U4}, artifact_path=path)
+    artifact = load_artifact(path, inconsistent_calculator.content_hash)
+    assert artifact['model'] is None and artifact['weights'] is None
+    assert not artifact['consistency_results']['U4']['is_consistent']
+    np.testing.assert_allclose(artifact['matrices']['U4'], INCONSISTENT_U4)
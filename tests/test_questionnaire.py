@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from questionnaire import FRONT22_QUESTIONNAIRE, FRONTEND_QUESTIONNAIRE, Question, Questionnaire
+
+QUESTIONNAIRES = [FRONTEND_QUESTIONNAIRE, FRONT22_QUESTIONNAIRE]
+
+
+def expected_scores(questionnaire, codes):
+    """Scores of option codes, looked up question by question"""
+    scores = np.zeros((len(codes), len(questionnaire.criteria)))
+    for row, row_codes in zip(scores, codes):
+        for question, code in zip(questionnaire.questions, row_codes):
+            for criterion, score in zip(question.criteria, question.scores[code]):
+                row[questionnaire.criteria.index(criterion)] = score
+    return scores
+
+
+@pytest.mark.parametrize('questionnaire', QUESTIONNAIRES)
+def test_labels_are_encoded_and_scored(questionnaire, rng):
+    codes = rng.integers(0, questionnaire.n_options, size=(25, len(questionnaire.questions)))
+    answers = {q.id: [q.options[c] for c in codes[:, i]] for i, q in enumerate(questionnaire.questions)}
+    encoded = questionnaire.encode_labels(answers)
+    np.testing.assert_array_equal(encoded, codes)
+    np.testing.assert_array_equal(questionnaire.scores(encoded), expected_scores(questionnaire, codes))
+
+
+@pytest.mark.parametrize('questionnaire', QUESTIONNAIRES)
+def test_every_criterion_is_filled(questionnaire):
+    filled = {c for q in questionnaire.questions for c in q.criteria}
+    assert filled == set(questionnaire.criteria)
+
+
+def test_score_dict_matches_the_form():
+    answers = {q.id: q.options[q.default] for q in FRONTEND_QUESTIONNAIRE.questions}
+    answers['u1_q2'] = "3"
+    scores = FRONTEND_QUESTIONNAIRE.score_dict(answers)
+    assert list(scores) == list(FRONTEND_QUESTIONNAIRE.criteria)
+    assert scores['U1A2'] == 3
+
+
+def test_unknown_and_missing_answers_are_rejected():
+    answers = {q.id: [q.options[0]] for q in FRONTEND_QUESTIONNAIRE.questions}
+    with pytest.raises(ValueError, match='Unknown answer'):
+        FRONTEND_QUESTIONNAIRE.encode_labels({**answers, 'u1_q1': ['Not an option']})
+    del answers['u4_q1']
+    with pytest.raises(ValueError, match='u4_q1'):
+        FRONTEND_QUESTIONNAIRE.encode_labels(answers)
+
+
+def test_score_table_must_match_options():
+    question = Question('q', 'Section', 'Prompt?', ('a', 'b'), ('C1',), ((1,),))
+    with pytest.raises(ValueError):
+        Questionnaire([question], ['C1'])
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+import ahp_random_index
+from ahp_core import RANDOM_INDEX_SAMPLES, RANDOM_INDEX_SEED, consistency_check, random_index
+from ahp_random_index import random_index_table, simulated_random_index
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ahp_random_index, '_tables', {})
+    return str(tmp_path)
+
+
+def test_estimates_match_saaty_table(cache_dir):
+    table = random_index_table(range(1, 8), samples=4000, workers=1, cache_dir=cache_dir)
+    assert table[1] == table[2] == 0.0
+    # n = 3 comes out near 0.52 with judgments uniform on the scale, below Saaty's 0.58
+    for n, expected in ((4, 0.90), (5, 1.12), (7, 1.32)):
+        assert table[n] == pytest.approx(expected, abs=0.03)
+    assert list(table.values()) == sorted(table.values())
+
+
+def test_estimates_do_not_depend_on_grouping(cache_dir, tmp_path):
+    together = random_index_table([4, 6], samples=500, workers=2, cache_dir=cache_dir)
+    alone = simulated_random_index(6, samples=500, cache_dir=str(tmp_path / 'other'))
+    assert alone == together[6]
+    assert simulated_random_index(6, samples=500, seed=1, cache_dir=cache_dir) != together[6]
+
+
+def test_estimates_are_cached_on_disk(cache_dir, monkeypatch):
+    value = simulated_random_index(12, samples=200, cache_dir=cache_dir)
+    assert os.listdir(cache_dir)
+
+    def fail(*args):
+        raise AssertionError("simulated again")
+
+    monkeypatch.setattr(ahp_random_index, '_tables', {})
+    monkeypatch.setattr(ahp_random_index, '_simulate', fail)
+    assert simulated_random_index(12, samples=200, cache_dir=cache_dir) == value
+
+
+def test_table_extends_saaty_values(calculator):
+    assert [random_index(n) for n in range(1, 11)] == [0, 0, 0.58, 0.90, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49]
+    table = [random_index(n) for n in range(11, 51)]
+    assert table == sorted(table) and table[0] > 1.49
+    assert all(calculator.random_index(n) == random_index(n) for n in range(1, 51))
+    assert random_index(51) == random_index(200) == calculator.random_index(51) == table[-1]
+
+
+def test_matrices_beyond_the_table_are_checked():
+    n = 60
+    weights = np.linspace(1, 2, n)
+    weights /= weights.sum()
+    _, CI, CR = consistency_check(weights[:, None] / weights[None, :], weights)
+    assert CI == pytest.approx(0, abs=1e-12) and CR == pytest.approx(0, abs=1e-12)
+
+
+def test_table_matches_its_simulation(cache_dir):
+    assert simulated_random_index(11, samples=RANDOM_INDEX_SAMPLES, seed=RANDOM_INDEX_SEED,
+                                  cache_dir=cache_dir) == pytest.approx(random_index(11), abs=5e-4)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from ahp_calculation import AHPCalculator
+from ahp_repair import consistency_ratio, evaluate_edits, inconsistency_contributions, suggest_repair
+from conftest import INCONSISTENT_U4
+from test_core import random_reciprocal
+
+
+def edited(matrix, i, j, value):
+    matrix = matrix.copy()
+    matrix[i, j], matrix[j, i] = value, 1 / value
+    return matrix
+
+
+@pytest.mark.parametrize('method', ['approximate', 'eigenvector'])
+def test_incremental_ratios_match_full_recompute(rng, method):
+    matrix = random_reciprocal(rng, 6, 1)[0]
+    rows, cols, values, CR = evaluate_edits(matrix, method)
+    assert len(CR) > 0
+    expected = [consistency_ratio(edited(matrix, i, j, v), method) for i, j, v in zip(rows, cols, values)]
+    np.testing.assert_allclose(CR, expected, atol=1e-7)
+
+
+def test_frozen_judgments_are_not_edited(rng):
+    matrix = random_reciprocal(rng, 5, 1)[0]
+    frozen = np.zeros((5, 5), dtype=bool)
+    frozen[0, 1] = frozen[1, 0] = True
+    rows, cols, _, _ = evaluate_edits(matrix, frozen=frozen)
+    assert not ((rows == 0) & (cols == 1)).any()
+
+
+def test_contributions_vanish_for_consistent_matrices():
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    np.testing.assert_allclose(inconsistency_contributions(weights[:, np.newaxis] / weights), 0, atol=1e-12)
+    contributions = inconsistency_contributions(np.array(INCONSISTENT_U4))
+    np.testing.assert_allclose(contributions, contributions.T)
+
+
+@pytest.mark.parametrize('method', ['approximate', 'eigenvector'])
+def test_repair_reaches_the_threshold(method):
+    result = suggest_repair(INCONSISTENT_U4, method=method)
+    assert result['CR_before'] >= 0.1
+    assert result['is_consistent'] and result['CR'] < 0.1
+    assert result['CR'] == pytest.approx(consistency_ratio(result['matrix'], method))
+    np.testing.assert_allclose(result['matrix'] * result['matrix'].T, 1)
+    for edit in result['edits']:
+        assert edit['old'] == pytest.approx(INCONSISTENT_U4[edit['row']][edit['column']])
+
+
+def test_large_matrices_are_repaired(rng):
+    matrix = random_reciprocal(rng, 15, 1)[0]
+    result = suggest_repair(matrix)
+    assert result['CR_before'] >= 0.1
+    assert result['is_consistent']
+    assert len(result['edits']) < 15 * 14 // 2
+
+
+def test_calculator_repairs_give_consistent_weights(inconsistent_calculator):
+    repairs = inconsistent_calculator.suggest_repairs()
+    assert list(repairs) == ['U4']
+    repaired = AHPCalculator(matrices={'U4': repairs['U4']['matrix']})
+    assert repaired.weights is not None
+
+
+@pytest.mark.parametrize('method', ['geometric_mean', 'llsm'])
+def test_shortlisted_edits_use_the_weight_method(rng, method):
+    matrix = random_reciprocal(rng, 6, 1)[0]
+    rows, cols, values, CR = evaluate_edits(matrix, method)
+    expected = [consistency_ratio(edited(matrix, i, j, v), method) for i, j, v in zip(rows, cols, values)]
+    np.testing.assert_allclose(CR, expected, atol=1e-10)
+    result = suggest_repair(INCONSISTENT_U4, method=method)
+    assert result['is_consistent']
+    assert result['CR'] == pytest.approx(consistency_ratio(result['matrix'], method))
@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import ahp_score
+from ahp_calculation import AHPCalculator
+from ahp_model import default_content_hash
+from questionnaire import FRONTEND_QUESTIONNAIRE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    return str(tmp_path / 'model.npz')
+
+
+def test_import_is_light():
+    code = "import sys, ahp_score; print(sorted({'ahp_calculation', 'questionnaire'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert output.stdout.strip() == '[]'
+
+
+def test_load_model_builds_missing_artifact(artifact, calculator):
+    model, version = ahp_score.load_model(artifact)
+    assert os.path.exists(artifact)
+    assert version == calculator.model_version
+    np.testing.assert_array_equal(model.global_weights, calculator.model.global_weights)
+
+
+@pytest.mark.parametrize('method', ['approximate', 'eigenvector'])
+def test_default_content_hash_matches_calculator(method):
+    assert default_content_hash(method) == AHPCalculator(method=method).content_hash
+
+
+def test_load_model_rebuilds_foreign_artifact(artifact, calculator):
+    AHPCalculator(matrices={'U4': [[1, 2, 3], [1/2, 1, 2], [1/3, 1/2, 1]]}, artifact_path=artifact)
+    model, version = ahp_score.load_model(artifact)
+    assert version == calculator.model_version
+    np.testing.assert_array_equal(model.global_weights, calculator.model.global_weights)
+
+
+def test_decisions_match_calculator(artifact, calculator):
+    scores = {'U1A1': 5, 'U2B1': 4, 'U4D3': 2}
+    decision = ahp_score.check_eligibility(scores, artifact)
+    expected = calculator.check_eligibility(scores)
+    assert decision['score'] == pytest.approx(expected['score'])
+    assert decision['eligible'] == expected['eligible']
+    assert decision['model_version'] == calculator.model_version
+
+    answers = {q.id: q.options[0] for q in FRONTEND_QUESTIONNAIRE.questions}
+    assert ahp_score.check_answers(answers, artifact)['score'] == pytest.approx(
+        calculator.check_eligibility(FRONTEND_QUESTIONNAIRE.score_dict(answers))['score'])
+
+
+def test_cli_scores_json_lines(artifact, calculator, monkeypatch, capsys):
+    lines = [json.dumps({'scores': {'U1A1': 5}}), '', json.dumps({'scores': {'X1': 5}}),
+             json.dumps({'other': 1})]
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('\n'.join(lines) + '\n'))
+    status = ahp_score.main(['--artifact', artifact])
+
+    decisions = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 1
+    assert decisions[0]['score'] == pytest.approx(calculator.check_eligibility({'U1A1': 5})['score'])
+    assert 'error' in decisions[1] and 'error' in decisions[2]
+
+
+def test_cli_scores_one_applicant(artifact, capsys):
+    assert ahp_score.main(['--scores', '{"U1A1": 5, "U1A2": 5}', '--artifact', artifact]) == 0
+    decision = json.loads(capsys.readouterr().out)
+    assert decision['score'] == pytest.approx(100) and decision['eligible']
+
+
+def test_cli_reports_empty_scores(artifact, capsys):
+    assert ahp_score.main(['--scores', '{}', '--artifact', artifact]) == 1
+    assert 'error' in json.loads(capsys.readouterr().out)
+
+
+@pytest.mark.parametrize('line', ['5', '"U1A1"', '[1, 2]', '{"scores": [1, 2]}', '{"answers": "yes"}',
+                                  '{"scores": {"U1A1": "high"}}', '{"scores": {"U1A1": {}}}'])
+def test_cli_reports_malformed_requests(artifact, monkeypatch, capsys, line):
+    lines = [line, json.dumps({'scores': {'U1A1': 5}})]
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('\n'.join(lines) + '\n'))
+    assert ahp_score.main(['--artifact', artifact]) == 1
+
+    decisions = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(decisions) == 2
+    assert 'error' in decisions[0] and 'score' in decisions[1]
+
+
+def test_cli_rejects_non_object_scores(artifact, capsys):
+    assert ahp_score.main(['--scores', '[1, 2]', '--artifact', artifact]) == 1
+    assert json.loads(capsys.readouterr().out) == {'error': "Expected 'scores' to be a JSON object"}
+
+
+@pytest.mark.parametrize('scores', ['{"U1A1": null}', '{"U1A1": NaN}', '{"U1A1": Infinity}'])
+def test_cli_reports_non_finite_scores(artifact, capsys, scores):
+    assert ahp_score.main(['--scores', scores, '--artifact', artifact]) == 1
+    assert 'error' in json.loads(capsys.readouterr().out, parse_constant=pytest.fail)
@@ -0,0 +1,176 @@
+import csv
+
+import numpy as np
+import pytest
+
+import score_portfolio
+from questionnaire import FRONTEND_CRITERIA, FRONTEND_QUESTIONNAIRE
+from score_portfolio import read_part, score_file, split_input
+
+N_ROWS = 23
+
+
+@pytest.fixture(scope='module')
+def answers(tmp_path_factory):
+    """Random questionnaire answers and the sub-criterion scores they give"""
+    rng = np.random.default_rng(0)
+    path = tmp_path_factory.mktemp('input') / 'answers.csv'
+    rows, scores = [], np.zeros((N_ROWS, len(FRONTEND_CRITERIA)))
+    for i in range(N_ROWS):
+        row = {'farmer_id': f'F{i}'}
+        for question in FRONTEND_QUESTIONNAIRE.questions:
+            option = rng.integers(len(question.options))
+            row[question.id] = question.options[option]
+            for criterion, score in zip(question.criteria, question.scores[option]):
+                scores[i, FRONTEND_CRITERIA.index(criterion)] = score
+        rows.append(row)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path), scores
+
+
+def read_output(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_answers_are_scored_like_the_calculator(answers, calculator, tmp_path):
+    path, scores = answers
+    output = str(tmp_path / 'scored.csv')
+    total_rows, _ = score_file(path, output, chunk_size=5, id_column='farmer_id',
+                               artifact_path=str(tmp_path / 'model.npz'))
+
+    expected = calculator.check_eligibility_batch(scores, FRONTEND_CRITERIA)
+    rows = read_output(output)
+    assert total_rows == len(rows) == N_ROWS
+    assert [row['farmer_id'] for row in rows] == [f'F{i}' for i in range(N_ROWS)]
+    np.testing.assert_allclose([float(row['score']) for row in rows], expected['score'], atol=1e-4)
+    assert [row['eligible'] == 'True' for row in rows] == expected['eligible'].tolist()
+    assert {row['model_version'] for row in rows} == {calculator.model_version}
+
+
+def test_chunk_size_does_not_change_output(answers, tmp_path):
+    path, _ = answers
+    outputs = []
+    for chunk_size in (1, 7, 1000):
+        output = str(tmp_path / f'scored_{chunk_size}.csv')
+        score_file(path, output, chunk_size=chunk_size, artifact_path=str(tmp_path / 'model.npz'))
+        outputs.append(read_output(output))
+    assert outputs[0] == outputs[1] == outputs[2]
+
+
+def test_score_columns_are_read_directly(answers, calculator, tmp_path):
+    _, scores = answers
+    path = tmp_path / 'scores.csv'
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FRONTEND_CRITERIA)
+        writer.writerows(scores.tolist())
+    output = str(tmp_path / 'scored.csv')
+    score_file(str(path), output, artifact_path=str(tmp_path / 'model.npz'))
+
+    expected = calculator.score_batch(scores, FRONTEND_CRITERIA)
+    np.testing.assert_allclose([float(row['score']) for row in read_output(output)], expected, atol=1e-4)
+
+
+def test_cli_reports_unknown_answers(tmp_path, caplog):
+    path = tmp_path / 'answers.csv'
+    path.write_text('u1_q1\nNot an option\n')
+    status = score_portfolio.main([str(path), str(tmp_path / 'scored.csv'),
+                                   '--artifact', str(tmp_path / 'model.npz')])
+    assert status == 1
+    assert 'Not an option' in caplog.text
+
+
+def test_cli_reports_unknown_id_column(answers, tmp_path, caplog):
+    path, _ = answers
+    output = tmp_path / 'scored.csv'
+    status = score_portfolio.main([path, str(output), '--id-column', 'farmer',
+                                   '--artifact', str(tmp_path / 'model.npz')])
+    assert status == 1
+    assert "Id column 'farmer' not found" in caplog.text
+    assert not output.exists()
+
+
+def test_cli_reports_throughput(answers, tmp_path, caplog):
+    path, _ = answers
+    caplog.set_level('INFO')
+    status = score_portfolio.main([path, str(tmp_path / 'scored.csv'),
+                                   '--artifact', str(tmp_path / 'model.npz')])
+    assert status == 0
+    assert f'Scored {N_ROWS} rows' in caplog.text and 'rows/s' in caplog.text
+
+
+@pytest.mark.parametrize('chunk_size', [4, 1000])
+def test_parallel_matches_serial(answers, tmp_path, chunk_size):
+    path, _ = answers
+    artifact = str(tmp_path / 'model.npz')
+    serial, parallel = str(tmp_path / 'serial.csv'), str(tmp_path / 'parallel.csv')
+    score_file(path, serial, chunk_size=chunk_size, id_column='farmer_id', artifact_path=artifact)
+    total_rows, _ = score_file(path, parallel, chunk_size=chunk_size, id_column='farmer_id',
+                               artifact_path=artifact, workers=2)
+    assert total_rows == N_ROWS
+    assert read_output(parallel) == read_output(serial)
+
+
+def test_csv_parts_cover_every_row(answers):
+    path, _ = answers
+    parts = split_input(path, chunk_size=4)
+    chunks = [chunk for part in parts for chunk in read_part(part)]
+    assert len(parts) == len(chunks) > 1
+    assert [i for chunk in chunks for i in chunk['farmer_id']] == [f'F{i}' for i in range(N_ROWS)]
+
+
+def test_parquet_matches_csv(answers, tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    path, _ = answers
+    parquet_path = str(tmp_path / 'answers.parquet')
+    pyarrow.parquet.write_table(pyarrow.csv.read_csv(path), parquet_path, row_group_size=10)
+    artifact = str(tmp_path / 'model.npz')
+    csv_output = str(tmp_path / 'scored.csv')
+    score_file(path, csv_output, chunk_size=4, artifact_path=artifact)
+    expected = [float(row['score']) for row in read_output(csv_output)]
+
+    for workers in (1, 2):
+        output = str(tmp_path / f'scored_{workers}.parquet')
+        score_file(parquet_path, output, chunk_size=4, artifact_path=artifact, workers=workers)
+        scores = pyarrow.parquet.read_table(output).column('score').to_pylist()
+        np.testing.assert_allclose(scores, expected, atol=1e-4)
+
+
+def test_parquet_row_groups_are_read_in_chunks(answers, tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    path, _ = answers
+    parquet_path = str(tmp_path / 'answers.parquet')
+    pyarrow.parquet.write_table(pyarrow.csv.read_csv(path), parquet_path, row_group_size=10)
+    parts = split_input(parquet_path, chunk_size=4)
+    assert len(parts) == -(-N_ROWS // 10)
+    chunks = [chunk for part in parts for chunk in read_part(part, chunk_size=4)]
+    assert [len(chunk['farmer_id']) for chunk in chunks] == [4, 4, 2, 4, 4, 2, 3]
+    assert [i for chunk in chunks for i in chunk['farmer_id']] == [f'F{i}' for i in range(N_ROWS)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_empty_parquet_input_writes_empty_output(tmp_path, workers):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    path = str(tmp_path / 'answers.parquet')
+    schema = pyarrow.schema([('farmer_id', pyarrow.string())]
+                            + [(question.id, pyarrow.string()) for question in FRONTEND_QUESTIONNAIRE.questions])
+    pyarrow.parquet.write_table(schema.empty_table(), path)
+    output = str(tmp_path / 'scored.parquet')
+    total_rows, _ = score_file(path, output, id_column='farmer_id',
+                               artifact_path=str(tmp_path / 'model.npz'), workers=workers)
+
+    table = pyarrow.parquet.read_table(output)
+    assert total_rows == table.num_rows == 0
+    assert table.column_names == ['farmer_id', 'score', 'eligible', 'model_version']
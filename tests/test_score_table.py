@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+from questionnaire import FRONTEND_QUESTIONNAIRE
+from score_table import load_score_table
+
+N_QUESTIONS = len(FRONTEND_QUESTIONNAIRE.questions)
+
+INVALID_CODES = [
+    [-1] + [0] * (N_QUESTIONS - 1),
+    [0] * (N_QUESTIONS - 1) + [9],
+    [0] * 3,
+    [0.5] * N_QUESTIONS,
+]
+
+
+@pytest.fixture(scope='module')
+def table_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('tables'))
+
+
+@pytest.fixture(scope='module')
+def score_table(calculator, table_dir):
+    return load_score_table(calculator, directory=table_dir)
+
+
+@pytest.fixture
+def codes(rng):
+    return rng.integers(0, FRONTEND_QUESTIONNAIRE.n_options, size=(20, N_QUESTIONS))
+
+
+def test_table_covers_the_answer_space(score_table):
+    assert len(score_table) == np.prod(FRONTEND_QUESTIONNAIRE.n_options)
+
+
+def test_score_table_matches_model(score_table, calculator, codes):
+    expected = calculator.model.score_batch(FRONTEND_QUESTIONNAIRE.scores(codes), FRONTEND_QUESTIONNAIRE.criteria)
+    np.testing.assert_allclose(score_table.score(codes), expected, rtol=1e-6)
+    np.testing.assert_array_equal(score_table.eligible(codes), expected >= score_table.threshold)
+
+
+@pytest.mark.parametrize('bad', INVALID_CODES)
+def test_score_table_rejects_invalid_codes(score_table, bad):
+    with pytest.raises(ValueError):
+        score_table.score(np.array(bad))
+    with pytest.raises(ValueError):
+        score_table.eligible(np.array(bad))
+
+
+def test_check_answers_matches_calculator(score_table, calculator):
+    answers = {q.id: q.options[-1] for q in FRONTEND_QUESTIONNAIRE.questions}
+    score, eligible = score_table.check_answers(answers)
+    expected = calculator.check_eligibility(FRONTEND_QUESTIONNAIRE.score_dict(answers))
+    assert score == pytest.approx(expected['score'], rel=1e-6)
+    assert eligible == expected['eligible']
+
+
+def test_fixed_answers_select_matching_profiles(score_table):
+    question = FRONTEND_QUESTIONNAIRE.questions[0]
+    rates = [score_table.eligibility_rate({question.id: option}) for option in question.options]
+    assert np.mean(rates) == pytest.approx(score_table.eligibility_rate())
+    counts, _ = score_table.score_distribution(fixed={question.id: question.options[0]})
+    assert counts.sum() == len(score_table) // len(question.options)
+    with pytest.raises(ValueError):
+        score_table.eligibility_rate({question.id: 'Not an option'})
+
+
+def test_table_is_built_once(calculator, score_table, table_dir):
+    files = sorted(os.listdir(table_dir))
+    reloaded = load_score_table(calculator, directory=table_dir)
+    assert sorted(os.listdir(table_dir)) == files
+    np.testing.assert_array_equal(reloaded.scores, score_table.scores)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from scored_portfolio import MISSING_GROUP, ScoredPortfolio
+
+SCORES = [50, 80, 75, 60, 90]
+
+
+@pytest.fixture
+def portfolio_data(rng):
+    return rng.uniform(0, 100, 500).round(1), rng.integers(0, 4, 500)
+
+
+def test_counts_match_brute_force(portfolio_data):
+    scores, groups = portfolio_data
+    portfolio = ScoredPortfolio(scores, groups)
+    for threshold in (10, 50, 70.5, 100):
+        assert portfolio.count_eligible(threshold) == (scores >= threshold).sum()
+        assert portfolio.eligibility_rate(threshold) == pytest.approx((scores >= threshold).mean())
+        for group in range(4):
+            assert portfolio.count_eligible(threshold, group) == (scores[groups == group] >= threshold).sum()
+        assert sum(portfolio.count_eligible_by_group(threshold).values()) == portfolio.count_eligible(threshold)
+
+
+@pytest.mark.parametrize('groups', [
+    ['a', None, 'b', None, 'a'],
+    [1.0, np.nan, 2.0, np.nan, 1.0],
+])
+def test_missing_group_labels_form_one_group(groups):
+    portfolio = ScoredPortfolio(SCORES, groups)
+    assert portfolio.groups.tolist()[-1] == MISSING_GROUP
+    assert portfolio.count_eligible(70, MISSING_GROUP) == 1
+    assert sum(portfolio.count_eligible_by_group(70).values()) == portfolio.count_eligible(70)
+
+
+def test_threshold_sweep_matches_counts(portfolio_data):
+    scores, groups = portfolio_data
+    portfolio = ScoredPortfolio(scores, groups)
+    thresholds = np.arange(0, 101, 5)
+    sweep = portfolio.threshold_sweep(thresholds, by_group=True)
+    np.testing.assert_array_equal(sweep['eligible'], [portfolio.count_eligible(t) for t in thresholds])
+    np.testing.assert_array_equal(sweep['by_group'].sum(axis=0), sweep['eligible'])
+    np.testing.assert_array_equal(sweep['by_group'][2], [portfolio.count_eligible(t, 2) for t in thresholds])
+
+
+def test_percentiles_and_top_k(portfolio_data):
+    scores, groups = portfolio_data
+    portfolio = ScoredPortfolio(scores, groups)
+    assert portfolio.percentile(50) == pytest.approx(100 * (scores <= 50).mean())
+    assert portfolio.applicant_percentile(7) == pytest.approx(100 * (scores <= scores[7]).mean())
+    top = portfolio.top_k(10)
+    np.testing.assert_array_equal(scores[top], np.sort(scores)[::-1][:10])
+    top_group = portfolio.top_k(5, group=1)
+    assert (groups[top_group] == 1).all()
+    assert scores[top_group].min() >= np.sort(scores[groups == 1])[-5]
+
+
+def test_calculator_portfolio_matches_batch_scores(calculator, rng):
+    criteria = calculator.model.criteria
+    applicants = rng.integers(1, 6, size=(50, len(criteria))).astype(float)
+    portfolio = ScoredPortfolio.from_applicants(calculator, applicants, criteria=criteria)
+    np.testing.assert_allclose(portfolio.scores, calculator.model.score_batch(applicants, criteria))
+
+
+def test_invalid_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        ScoredPortfolio([])
+    with pytest.raises(ValueError):
+        ScoredPortfolio([50, np.nan])
+    with pytest.raises(ValueError):
+        ScoredPortfolio([50, 60], groups=['a'])
+    with pytest.raises(KeyError):
+        ScoredPortfolio([50, 60], groups=['a', 'b']).count_eligible(70, 'c')
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from questionnaire import FRONTEND_QUESTIONNAIRE
+from scoring_service import ScoringClient, ScoringService
+
+
+async def raw_request(port, request: bytes) -> bytes:
+    """Send raw bytes and return the status line of the response"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.split(b'\r\n', 1)[0]
+
+
+def serve(calculator, scenario, **kwargs):
+    """Run `scenario(port, service)` against a service on a free port"""
+    async def run():
+        service = ScoringService(calculator, **kwargs)
+        port = await service.start(port=0)
+        try:
+            return await scenario(port, service)
+        finally:
+            await service.stop()
+    return asyncio.run(run())
+
+
+def test_service_matches_calculator(calculator):
+    criteria = list(calculator.model.criteria)
+    answers = {q.id: q.options[-1] for q in FRONTEND_QUESTIONNAIRE.questions}
+
+    async def scenario(port, service):
+        async with ScoringClient(port=port) as client:
+            single = await client.check_eligibility(dict.fromkeys(criteria, 4))
+            by_answers = await client.check_answers(answers)
+            batch = await client.check_eligibility_batch([[4] * len(criteria), [1] * len(criteria)], criteria)
+            return single, by_answers, batch
+    single, by_answers, batch = serve(calculator, scenario)
+
+    expected = calculator.check_eligibility(dict.fromkeys(criteria, 4))
+    assert single['score'] == pytest.approx(expected['score'])
+    assert single['eligible'] == expected['eligible']
+    assert single['model_version'] == calculator.model_version
+    assert by_answers['score'] == pytest.approx(
+        calculator.check_eligibility(FRONTEND_QUESTIONNAIRE.score_dict(answers))['score'])
+    assert batch['score'][0] == pytest.approx(expected['score'])
+    assert batch['eligible'] == [expected['eligible'], False]
+
+
+def test_concurrent_requests_are_batched(calculator):
+    async def scenario(port, service):
+        clients = [ScoringClient(port=port) for _ in range(20)]
+        for client in clients:
+            await client.connect()
+        try:
+            results = await asyncio.gather(*(client.check_eligibility({'U1A1': 1 + i % 5})
+                                             for i, client in enumerate(clients)))
+        finally:
+            for client in clients:
+                await client.close()
+        return results, service.stats()
+    results, stats = serve(calculator, scenario, max_wait=0.05)
+
+    for i, result in enumerate(results):
+        assert result['score'] == pytest.approx(calculator.check_eligibility({'U1A1': 1 + i % 5})['score'])
+    assert stats['requests'] == 20
+    assert stats['mean_batch_size'] > 1
+
+
+@pytest.mark.parametrize('method, path, status', [
+    ('GET', '/healthz', 200),
+    ('GET', '/v1/eligibility', 405),
+    ('GET', '/nowhere', 404),
+])
+def test_routes(calculator, method, path, status):
+    async def scenario(port, service):
+        async with ScoringClient(port=port) as client:
+            return await client.request(method, path)
+    assert serve(calculator, scenario)[0] == status
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'scores': {}},
+    {'scores': {'X1': 3}},
+    {'scores': {'U1A1': None}},
+    {'scores': {'U1A1': float('nan')}},
+])
+def test_invalid_single_requests(calculator, payload):
+    async def scenario(port, service):
+        async with ScoringClient(port=port) as client:
+            return await client.request('POST', '/v1/eligibility', payload)
+    status, body = serve(calculator, scenario)
+    assert status == 400 and 'error' in body
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5', b'1e3'])
+def test_invalid_content_length(calculator, length):
+    request = (b'POST /v1/eligibility HTTP/1.1\r\nConnection: close\r\n'
+               b'Content-Length: ' + length + b'\r\n\r\n')
+    status_line = serve(calculator, lambda port, service: raw_request(port, request))
+    assert status_line.startswith(b'HTTP/1.1 400')
+
+
+@pytest.mark.parametrize('payload', [
+    {'criteria': [], 'scores': [[]]},
+    {'criteria': [], 'scores': [[3] * 17]},
+    {'criteria': 'U1A1', 'scores': [[3]]},
+    {'criteria': ['X1'], 'scores': [[3]]},
+    {'scores': [3, 4]},
+    {'criteria': ['U1A1'], 'scores': [[3], [None]]},
+    {'criteria': ['U1A1'], 'scores': [[float('inf')]]},
+])
+def test_invalid_batches(calculator, payload):
+    async def scenario(port, service):
+        async with ScoringClient(port=port) as client:
+            return await client.request('POST', '/v1/eligibility/batch', payload)
+    status, body = serve(calculator, scenario)
+    assert status == 400 and 'error' in body
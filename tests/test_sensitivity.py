@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import ahp_sensitivity
+from ahp_sensitivity import SAATY_SCALE, nearest_scale_index, perturb_matrix, run_sensitivity
+
+
+@pytest.fixture(scope='module')
+def portfolio(calculator):
+    return np.random.default_rng(1).uniform(2, 5, size=(30, len(calculator.model)))
+
+
+def test_nearest_scale_index():
+    values = np.array([1/9, 0.3, 1, 2.4, 12])
+    np.testing.assert_allclose(SAATY_SCALE[nearest_scale_index(values)], [1/9, 1/3, 1, 2, 9])
+
+
+def test_perturbed_matrices_stay_on_the_scale(calculator, rng):
+    samples = perturb_matrix(calculator.U1_matrix, 50, rng, max_step=2)
+    np.testing.assert_allclose(samples * samples.transpose(0, 2, 1), 1)
+    steps = nearest_scale_index(samples) - nearest_scale_index(calculator.U1_matrix)
+    assert np.abs(steps).max() <= 2
+    assert np.isin(samples, SAATY_SCALE).all()
+
+
+def test_results_are_reproducible(calculator, portfolio):
+    first = run_sensitivity(calculator, portfolio, n_samples=300, block_size=100, seed=7)
+    second = run_sensitivity(calculator, portfolio, n_samples=300, block_size=100, seed=7)
+    other = run_sensitivity(calculator, portfolio, n_samples=300, block_size=100, seed=8)
+    np.testing.assert_array_equal(first['flip_count'], second['flip_count'])
+    np.testing.assert_array_equal(first['weight_mean'], second['weight_mean'])
+    assert not np.array_equal(first['weight_mean'], other['weight_mean'])
+
+
+def test_workers_do_not_change_results(calculator, portfolio):
+    serial = run_sensitivity(calculator, portfolio, n_samples=300, block_size=100)
+    parallel = run_sensitivity(calculator, portfolio, n_samples=300, block_size=100, workers=2)
+    assert serial['n_accepted'] == parallel['n_accepted']
+    np.testing.assert_array_equal(serial['flip_count'], parallel['flip_count'])
+    np.testing.assert_allclose(serial['weight_mean'], parallel['weight_mean'])
+
+
+def test_decisions_and_rates(calculator, portfolio):
+    result = run_sensitivity(calculator, portfolio, n_samples=200, block_size=100)
+    np.testing.assert_allclose(result['base_score'], calculator.model.score_batch(portfolio))
+    assert 0 < result['n_accepted'] <= 200
+    assert ((result['flip_rate'] >= 0) & (result['flip_rate'] <= 1)).all()
+    assert result['weight_mean'].sum() == pytest.approx(1)
+
+
+def test_reports_requested_samples(calculator, portfolio):
+    result = run_sensitivity(calculator, portfolio, n_samples=150, block_size=100)
+    assert result['n_samples'] == 150
+    assert 0 < result['n_accepted'] <= 150
+
+
+def test_samples_do_not_depend_on_count(calculator, portfolio):
+    short = run_sensitivity(calculator, portfolio, n_samples=150, block_size=100)
+    long = run_sensitivity(calculator, portfolio, n_samples=200, block_size=100)
+    assert short['n_accepted'] <= long['n_accepted']
+    assert (short['flip_count'] <= long['flip_count']).all()
+
+
+def test_short_runs_draw_a_full_block(calculator, portfolio, monkeypatch):
+    drawn = []
+
+    def record(*args):
+        drawn.append(perturb_matrix(*args))
+        return drawn[-1]
+
+    monkeypatch.setattr(ahp_sensitivity, 'perturb_matrix', record)
+    for n_samples in (30, 60):
+        run_sensitivity(calculator, portfolio, n_samples=n_samples, block_size=100)
+    half = len(drawn) // 2
+    for short, long in zip(drawn[:half], drawn[half:]):
+        np.testing.assert_array_equal(short, long)
+
+
+@pytest.mark.parametrize('kwargs', [{'n_samples': 0}, {'block_size': 0}])
+def test_empty_runs_are_rejected(calculator, portfolio, kwargs):
+    with pytest.raises(ValueError):
+        run_sensitivity(calculator, portfolio, **kwargs)
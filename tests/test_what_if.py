@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from questionnaire import FRONTEND_QUESTIONNAIRE
+from test_score_table import INVALID_CODES
+from what_if import WhatIf
+
+QUESTIONS = FRONTEND_QUESTIONNAIRE.questions
+N_QUESTIONS = len(QUESTIONS)
+
+
+@pytest.fixture(scope='module')
+def what_if(calculator):
+    return WhatIf(calculator.model, threshold=20)
+
+
+@pytest.fixture
+def codes(rng):
+    return rng.integers(0, FRONTEND_QUESTIONNAIRE.n_options, size=(20, N_QUESTIONS))
+
+
+def test_base_scores_match_model(what_if, calculator, codes):
+    expected = calculator.model.score_batch(FRONTEND_QUESTIONNAIRE.scores(codes), FRONTEND_QUESTIONNAIRE.criteria)
+    np.testing.assert_allclose(what_if.base_scores(codes), expected)
+    assert what_if.base_scores(codes[0]) == pytest.approx(expected[0])
+
+
+def test_rescore_matches_base_scores(what_if, codes):
+    changes = {QUESTIONS[0].id: QUESTIONS[0].options[1], QUESTIONS[4].id: QUESTIONS[4].options[0]}
+    changed = codes.copy()
+    changed[:, 0], changed[:, 4] = 1, 0
+    np.testing.assert_allclose(what_if.rescore(codes, changes), what_if.base_scores(changed))
+    assert what_if.rescore(codes[0], changes, what_if.base_scores(codes[0])) == pytest.approx(
+        what_if.base_scores(changed[0]))
+
+
+def test_unknown_changes_are_rejected(what_if, codes):
+    with pytest.raises(ValueError):
+        what_if.rescore(codes, {'no_such_question': 'Yes'})
+    with pytest.raises(ValueError):
+        what_if.rescore(codes, {QUESTIONS[0].id: 'no such answer'})
+
+
+@pytest.mark.parametrize('bad', INVALID_CODES)
+def test_invalid_codes_are_rejected(what_if, bad):
+    with pytest.raises(ValueError):
+        what_if.base_scores(np.array(bad))
+    with pytest.raises(ValueError):
+        what_if.rescore(np.array(bad), {})
+
+
+def test_invalid_codes_in_batches_are_rejected(what_if, codes):
+    codes[3, 2] = -1
+    with pytest.raises(ValueError):
+        what_if.best_changes(codes)
+    with pytest.raises(ValueError):
+        what_if.single_change_scores(codes)
+
+
+def test_single_change_scores_match_rescoring(what_if, codes):
+    scores = what_if.single_change_scores(codes)
+    for q, question in enumerate(QUESTIONS):
+        for o, label in enumerate(question.options):
+            np.testing.assert_allclose(scores[:, q, o], what_if.rescore(codes, {question.id: label}))
+    assert np.isnan(scores[:, :, FRONTEND_QUESTIONNAIRE.n_options.max():]).all()
+
+
+def test_rank_changes_lists_eligible_changes(what_if, codes):
+    applicant = codes[0]
+    base = what_if.base_scores(applicant)
+    ranked = what_if.rank_changes(applicant)
+    assert [change['score'] for change in ranked] == sorted((c['score'] for c in ranked), reverse=True)
+    for change in ranked:
+        assert change['score'] >= what_if.threshold
+        assert change['score'] == pytest.approx(what_if.rescore(applicant, {change['question']: change['answer']}))
+        assert change['lift'] == pytest.approx(change['score'] - base)
+
+
+def test_rank_changes_only_raise_scores(what_if, codes):
+    for applicant in codes:
+        base = what_if.base_scores(applicant)
+        expected = set()
+        for q, question in enumerate(QUESTIONS):
+            for o, answer in enumerate(question.options):
+                score = what_if.rescore(applicant, {question.id: answer})
+                if o != applicant[q] and score > base and score >= what_if.threshold:
+                    expected.add((question.id, answer))
+        ranked = what_if.rank_changes(applicant)
+        assert {(change['question'], change['answer']) for change in ranked} == expected
+        assert all(change['lift'] > 0 for change in ranked)
+
+
+def test_best_changes_match_brute_force(what_if, codes):
+    result = what_if.best_changes(codes)
+    scores = what_if.single_change_scores(codes)
+    for i, applicant in enumerate(codes):
+        scores[i, np.arange(N_QUESTIONS), applicant] = np.nan
+    expected = np.nanmax(scores.reshape(len(codes), -1), axis=1)
+    np.testing.assert_allclose(result['score'], expected)
+    np.testing.assert_array_equal(result['eligible'], expected >= what_if.threshold)
+    assert (result['option'] != codes[np.arange(len(codes)), result['question']]).all()
+
+
+def test_best_changes_without_improvement(what_if):
+    best = np.nanargmax(what_if.points, axis=1)
+    worst = np.zeros(N_QUESTIONS, dtype=int)
+    result = what_if.best_changes(np.stack([best, worst]))
+
+    assert result['question'][0] == -1 and result['option'][0] == -1
+    assert result['score'][0] == pytest.approx(what_if.base_scores(best))
+    assert result['question'][1] >= 0
+    assert result['score'][1] > what_if.base_scores(worst)
@@ -0,0 +1,253 @@
+"""
+What-if rescoring of questionnaire answers
+
+Every question of a `Questionnaire` fills its own sub-criteria, so an
+applicant's percentage score is the sum of the points of their selected
+options (`Questionnaire.option_points`). Changing some answers therefore
+shifts the score by the difference in points between the old and the new
+options. `WhatIf.rescore` adds these deltas to a cached base score, at a cost
+of O(1) per changed question, instead of rerunning
+`AHPCalculator.check_eligibility` with its consistency summary.
+
+`WhatIf.single_change_scores` scores every possible single answer change for
+many applicants as one (N, Q, max_options) array. `rank_changes` and
+`best_changes` pick from it the changes that lift applicants over the
+eligibility threshold.
+
+Usage:
+    what_if = WhatIf(calculator.model)
+    codes = FRONTEND_QUESTIONNAIRE.encode_answers(answers)
+    base = what_if.base_scores(codes)
+    what_if.rescore(codes, {'u2_q1': "I have never defaulted on a loan repayment."}, base)
+    what_if.rank_changes(codes, base)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ahp_model import ELIGIBILITY_THRESHOLD, ScoringModel
+from questionnaire import FRONTEND_QUESTIONNAIRE, Questionnaire
+
+# Applicants per block in best_changes, bounding the (N, Q, max_options) array
+CHANGE_CHUNK = 1 << 16
+
+
+class WhatIf:
+    """
+    Answer-change scenarios scored by deltas of option points.
+
+    Attributes:
+        questionnaire (Questionnaire): Questionnaire the answer codes follow
+        threshold (float): Eligibility cutoff in percent
+        points (np.ndarray): (Q, max_options) percentage points of every
+            option, NaN past the last option of a question
+    """
+
+    def __init__(
+        self,
+        model: ScoringModel,
+        questionnaire: Questionnaire = FRONTEND_QUESTIONNAIRE,
+        threshold: float = ELIGIBILITY_THRESHOLD
+    ):
+        self.questionnaire = questionnaire
+        self.threshold = threshold
+
+        weights, scale = model.columns(questionnaire.criteria)
+        points = np.full((len(questionnaire.questions), int(questionnaire.n_options.max())), np.nan)
+        for q, option_points in enumerate(questionnaire.option_points(weights)):
+            points[q, :len(option_points)] = option_points * scale
+        points.flags.writeable = False
+        self.points = points
+
+        self._questions = np.arange(len(questionnaire.questions))
+        self._question_index = {question_id: q for q, question_id in enumerate(questionnaire.question_ids)}
+        self._option_index = [{label: i for i, label in enumerate(question.options)}
+                              for question in questionnaire.questions]
+
+    def _selected_points(self, codes: np.ndarray) -> np.ndarray:
+        """(..., Q) points of the selected options"""
+        return self.points[self._questions, self._check_codes(codes)]
+
+    def _check_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Option codes as indices, see `Questionnaire.check_codes`"""
+        return self.questionnaire.check_codes(codes).astype(np.intp, copy=False)
+
+    def base_scores(self, codes: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Percentage score of answer codes, as `AHPCalculator.check_eligibility` computes it.
+
+        Args:
+            codes (np.ndarray): (Q,) or (N x Q) option codes in question order
+
+        Returns:
+            Union[float, np.ndarray]: Score, or (N,) scores
+        """
+        scores = self._selected_points(codes).sum(axis=-1)
+        return float(scores) if scores.ndim == 0 else scores
+
+    def encode_changes(self, changes: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Turn answer changes into question indices and option codes.
+
+        Args:
+            changes (Dict[str, str]): New option label keyed by question id
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]:
+                - Index of each changed question
+                - New option code of each changed question
+
+        Raises:
+            ValueError: If a question or option label is unknown
+        """
+        try:
+            questions = np.array([self._question_index[question_id] for question_id in changes], dtype=np.intp)
+            options = np.array([self._option_index[q][label] for q, label in zip(questions, changes.values())],
+                               dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Unknown question or answer {e}") from None
+        return questions, options
+
+    def rescore(
+        self,
+        codes: np.ndarray,
+        changes: Dict[str, str],
+        base_scores: Optional[Union[float, np.ndarray]] = None
+    ) -> Union[float, np.ndarray]:
+        """
+        Score applicants as if they had given some other answers.
+
+        Args:
+            codes (np.ndarray): (Q,) or (N x Q) option codes in question order
+            changes (Dict[str, str]): New option label keyed by question id,
+                applied to every applicant
+            base_scores (Union[float, np.ndarray], optional): Cached
+                `base_scores(codes)`; computed when omitted
+
+        Returns:
+            Union[float, np.ndarray]: New score, or (N,) new scores
+
+        Raises:
+            ValueError: If a code, question or option label is invalid
+        """
+        codes = self._check_codes(codes)
+        if base_scores is None:
+            base_scores = self.base_scores(codes)
+        questions, options = self.encode_changes(changes)
+        delta = self.points[questions, options].sum() - self.points[questions, codes[..., questions]].sum(axis=-1)
+        scores = base_scores + delta
+        return float(scores) if np.ndim(scores) == 0 else scores
+
+    def single_change_scores(
+        self,
+        codes: np.ndarray,
+        base_scores: Optional[Union[float, np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Score every possible single answer change.
+
+        Args:
+            codes (np.ndarray): (Q,) or (N x Q) option codes in question order
+            base_scores (Union[float, np.ndarray], optional): Cached
+                `base_scores(codes)`; computed when omitted
+
+        Returns:
+            np.ndarray: (Q, max_options) or (N, Q, max_options) score after
+                changing question q to option o; the current answers keep the
+                base score and non-existent options are NaN
+        """
+        selected = self._selected_points(codes)
+        if base_scores is None:
+            base_scores = selected.sum(axis=-1)
+        base_scores = np.asarray(base_scores, dtype=float)
+        return base_scores[..., np.newaxis, np.newaxis] + (self.points - selected[..., np.newaxis])
+
+    def rank_changes(
+        self,
+        codes: np.ndarray,
+        base_score: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List the single answer changes that raise one applicant's score to
+        the threshold or above.
+
+        Args:
+            codes (np.ndarray): (Q,) option codes in question order
+            base_score (float, optional): Cached `base_scores(codes)`
+
+        Returns:
+            List[Dict[str, Any]]: question, answer, score and lift (score
+                minus base score, always positive) of every eligible change,
+                highest score first
+        """
+        codes = self._check_codes(codes)
+        if base_score is None:
+            base_score = self.base_scores(codes)
+        scores = self.single_change_scores(codes, base_score)
+        scores[self._questions, codes] = np.nan
+        with np.errstate(invalid='ignore'):
+            questions, options = np.nonzero((scores >= self.threshold) & (scores > base_score))
+        order = np.argsort(-scores[questions, options], kind='stable')
+
+        questions_list = self.questionnaire.questions
+        return [
+            {
+                'question': questions_list[q].id,
+                'answer': questions_list[q].options[o],
+                'score': float(scores[q, o]),
+                'lift': float(scores[q, o] - base_score),
+            }
+            for q, o in zip(questions[order].tolist(), options[order].tolist())
+        ]
+
+    def best_changes(
+        self,
+        codes: np.ndarray,
+        base_scores: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Find the single answer change that raises each applicant's score most.
+
+        Applicants whose score no single change raises get question and
+        option -1 and keep their base score.
+
+        Args:
+            codes (np.ndarray): (N x Q) option codes in question order
+            base_scores (np.ndarray, optional): Cached `base_scores(codes)`
+
+        Returns:
+            Dict[str, np.ndarray]:
+                - question: (N,) index of the question to change, or -1
+                - option: (N,) new option code, or -1
+                - score: (N,) score after the change
+                - eligible: (N,) whether the applicant is eligible after the change
+        """
+        codes = self._check_codes(codes)
+        if codes.ndim != 2:
+            raise ValueError(f"Expected (N x Q) answer codes, got shape {codes.shape}")
+        if base_scores is None:
+            base_scores = self.base_scores(codes)
+        base_scores = np.asarray(base_scores, dtype=float)
+        n_options = self.points.shape[1]
+        best = np.empty(len(codes), dtype=np.intp)
+        best_scores = np.empty(len(codes))
+        for start in range(0, len(codes), CHANGE_CHUNK):
+            chunk = codes[start:start + CHANGE_CHUNK]
+            rows = np.arange(len(chunk))[:, np.newaxis]
+            scores = self.single_change_scores(chunk, base_scores[start:start + CHANGE_CHUNK])
+            # Keeping an answer or picking a non-existent option is not a change
+            scores[rows, self._questions, chunk] = -np.inf
+            scores = np.nan_to_num(scores, nan=-np.inf).reshape(len(chunk), -1)
+            best[start:start + len(chunk)] = scores.argmax(axis=1)
+            best_scores[start:start + len(chunk)] = scores[rows[:, 0], best[start:start + len(chunk)]]
+
+        # No change that raises the score is no change at all
+        improved = best_scores > base_scores
+        best_scores = np.where(improved, best_scores, base_scores)
+        return {
+            'question': np.where(improved, best // n_options, -1),
+            'option': np.where(improved, best % n_options, -1),
+            'score': best_scores,
+            'eligible': best_scores >= self.threshold,
+        }